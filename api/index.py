@@ -1,17 +1,39 @@
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 import feedparser
 import re
 from typing import List, Optional, Dict, Any
 from fastapi.middleware.cors import CORSMiddleware
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
-import socket
 import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import httpx
 import os
+import asyncio
+import threading
+import hashlib
+import heapq
+import base64
+import uuid
+import functools
+import socket
+import struct
+import zlib
+import html
+import math
+from array import array
+from collections import deque, OrderedDict
+import sqlite3
+import tempfile
+import numpy as np
+from contextlib import asynccontextmanager, aclosing
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse
+from email.utils import parsedate_to_datetime
+import xml.etree.ElementTree as ET
 
 
 import google.generativeai as genai
@@ -19,13 +41,99 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "AIzaSyDOrCItR_V5KP0oD0jP1OMmT
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel('gemini-1.5-flash')
 
+# Embeddings for semantic search, cached in memory and on disk by content hash
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "models/text-embedding-004")
+EMBEDDING_CACHE_PATH = os.environ.get("EMBEDDING_CACHE_PATH", os.path.join(tempfile.gettempdir(), "news_embeddings.sqlite3"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.environ.get("EMBEDDING_CACHE_MEMORY_ITEMS", "20000"))
+EMBEDDING_CACHE_DISK_BYTES = int(os.environ.get("EMBEDDING_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))  # 256 MB
+
 # NewsAPI fallback
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY", "dd52e9d920b247e1b51fa8c08ca5b662")  # Get your free key from newsapi.org
 
-# Set default socket timeout for all connections
-socket.setdefaulttimeout(5.0)  # Reduce timeout from 15s to 5s
+# Async feed fetcher settings (one pooled client shared by every feed request)
+FEED_TIMEOUT = float(os.environ.get("FEED_TIMEOUT", "5.0"))
+FEED_MAX_CONNECTIONS = int(os.environ.get("FEED_MAX_CONNECTIONS", "64"))
+FEED_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("FEED_MAX_CONNECTIONS_PER_HOST", "6"))
+FEED_RETRY_BACKOFF = 0.5  # Base delay in seconds, doubled on every retry
+FEED_SHARE_WINDOW = float(os.environ.get("FEED_SHARE_WINDOW", "120"))  # Seconds a fetched feed is reused by every category listing it
+
+# Feed health tracking: circuit breaker and adaptive timeouts
+FEED_MIN_TIMEOUT = float(os.environ.get("FEED_MIN_TIMEOUT", "1.0"))
+FEED_HEALTH_WINDOW = 50  # Recent requests kept per feed for latency percentiles and error rate
+FEED_FAILURE_THRESHOLD = int(os.environ.get("FEED_FAILURE_THRESHOLD", "3"))  # Consecutive failures that open the circuit
+FEED_CIRCUIT_COOLDOWN = float(os.environ.get("FEED_CIRCUIT_COOLDOWN", "300"))  # Seconds before a half-open retry
+FEED_CIRCUIT_MAX_COOLDOWN = 3600.0
+FEED_USER_AGENT = "Mozilla/5.0 (compatible; NewsAggregator/1.0; +https://github.com/RJohnPaul/ignore)"
+FEED_HEDGING = os.environ.get("FEED_HEDGING", "1") == "1"  # Duplicate requests that outlive the feed's p90 latency
+FEED_HEDGE_PERCENTILE = 90
+FEED_HEDGE_MIN_DELAY = 0.05
+
+# Per-request latency budget (the Next.js proxy gives up after 60 seconds)
+NEWS_REQUEST_BUDGET = float(os.environ.get("NEWS_REQUEST_BUDGET", "8.0"))
+NEWS_MAX_REQUEST_BUDGET = 50.0
+NEWS_RANKING_RESERVE = float(os.environ.get("NEWS_RANKING_RESERVE", "1.0"))  # Seconds of the budget kept for ranking
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# Background ingestion settings
+INGESTION_ENABLED = os.environ.get("INGESTION_ENABLED", "1") == "1"
+INGESTION_INTERVAL = int(os.environ.get("INGESTION_INTERVAL", "600"))  # 10 minutes: default poll interval and maintenance period
+INGESTION_CONCURRENCY = int(os.environ.get("INGESTION_CONCURRENCY", "4"))  # Feed sets refreshed at once
 
-app = FastAPI(docs_url="/api/docs", openapi_url="/api/openapi.json")
+# Offline mode: no NewsAPI or Gemini calls, fake embeddings, and feeds from the mock server at
+# MOCK_FEED_URL (scripts/dev_server.py starts one and sets both)
+MOCK_FEEDS = os.environ.get("MOCK_FEEDS", "0") == "1"
+MOCK_FEED_URL = os.environ.get("MOCK_FEED_URL", "").rstrip("/")
+
+# One bounded pool for everything that would block the event loop: SDK calls, SQLite, feed
+# parsing and CPU-heavy indexing and ranking. Cache hits on the in-process backend never use it.
+BLOCKING_WORKERS = int(os.environ.get("BLOCKING_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="news-blocking")
+BLOCKING_STATS = {"submitted": 0, "running": 0, "peak": 0}
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable on the shared executor and await its result"""
+    BLOCKING_STATS["submitted"] += 1
+    BLOCKING_STATS["running"] += 1
+    BLOCKING_STATS["peak"] = max(BLOCKING_STATS["peak"], BLOCKING_STATS["running"])
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            BLOCKING_EXECUTOR, functools.partial(func, *args, **kwargs)
+        )
+    finally:
+        BLOCKING_STATS["running"] -= 1
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start the background ingestion loop and cache sweeper with the app"""
+    # Library code that uses the default executor shares the same bound
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(BLOCKING_EXECUTOR)
+    ingestion_task = None
+    if INGESTION_ENABLED:
+        ingestion_task = asyncio.create_task(ingestion_loop())
+    sweep_tasks = [asyncio.create_task(cache_sweep_loop(cache)) for cache in (NEWS_CACHE, SNAPSHOT_STORE)]
+    yield
+    if ingestion_task:
+        ingestion_task.cancel()
+    for task in sweep_tasks:
+        task.cancel()
+    await close_http_client()
+    # A closing loop shuts down its default executor; keep the shared pool usable by later loops in this process
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+
+app = FastAPI(docs_url="/api/docs", openapi_url="/api/openapi.json", lifespan=lifespan)
 
 # Enable CORS for frontend requests
 app.add_middleware(
@@ -37,19 +145,31 @@ app.add_middleware(
 )
 
 # Request models
+NEWS_MAX_PAGE_SIZE = int(os.environ.get("NEWS_MAX_PAGE_SIZE", "100"))
+NEWS_MAX_PAGE = 10000  # Keeps every offset within the cursor's 32-bit field
+
 class NewsRequest(BaseModel):
     query: str
     language: str
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1, le=NEWS_MAX_PAGE)
+    page_size: int = Field(10, ge=1, le=NEWS_MAX_PAGE_SIZE)
     preferred_sources: List[str] = []
     category: Optional[str] = None
+    cursor: Optional[str] = None  # next_cursor from a previous page; overrides the other fields
+    budget_ms: Optional[int] = None  # Latency budget; defaults to NEWS_REQUEST_BUDGET, capped at NEWS_MAX_REQUEST_BUDGET
+    from_date: Optional[str] = None  # ISO 8601 date or time; with to_date, answers from the article archive
+    to_date: Optional[str] = None  # A bare date includes the whole day
 
 # Response models
 class NewsSource(BaseModel):
     name: str
     url: Optional[str] = None
 
+class AlternateSource(BaseModel):
+    name: str
+    url: Optional[str] = None
+    link: str
+
 class NewsArticle(BaseModel):
     id: str
     title: str
@@ -59,6 +179,7 @@ class NewsArticle(BaseModel):
     link: str
     relevance: Optional[float] = None
     image_url: Optional[str] = None
+    alternate_sources: List[AlternateSource] = []
 
 class NewsResponse(BaseModel):
     articles: List[NewsArticle]
@@ -68,6 +189,11 @@ class NewsResponse(BaseModel):
     current_page: int
     available_sources: List[str] = []
     available_categories: List[str] = []
+    data_age: float = 0.0  # Seconds since the results were computed
+    stale: bool = False  # Served past cache expiry while a refresh runs
+    snapshot_id: Optional[str] = None  # Immutable ranked result set this page was read from
+    next_cursor: Optional[str] = None  # Opaque cursor for the next page of the same snapshot
+    partial: bool = False  # Some feeds or stages missed the latency budget; they keep filling the cache
 
 # RSS feeds configuration reorganized by category
 RSS_FEEDS = {
@@ -377,7 +503,7 @@ RSS_FEEDS = {
             "https://www.reddit.com/r/football/.rss?format=xml",
             "https://www.goal.com/feeds/en/news",
             "https://www.football365.com/feed",
-            "https://www.soccernews.com/feed"
+            "https://www.soccernews.com/feed",
             "https://rss.app/feeds/Bm1Bif5VM1GNfYgf.xml"
 
         ]
@@ -733,9 +859,978 @@ DEFAULT_SOURCE_IMAGES = {
     "default": "https://www.shutterstock.com/image-vector/live-breaking-news-template-business-600w-1897043905.jpg"
 }
 
-# News cache store
-NEWS_CACHE = {}
+# News result cache
 CACHE_EXPIRY = 1800  # 30 minutes in seconds
+NEWS_CACHE_MAX_BYTES = int(os.environ.get("NEWS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32 MB
+NEWS_CACHE_SWEEP_INTERVAL = 60  # Seconds between background sweeps of expired entries
+CACHE_STALE_GRACE = int(os.environ.get("CACHE_STALE_GRACE", "600"))  # Seconds past expiry an entry is still served while it refreshes
+CACHE_MAX_STALENESS = int(os.environ.get("CACHE_MAX_STALENESS", str(CACHE_EXPIRY + CACHE_STALE_GRACE)))  # Hard limit on the age of served data
+
+class LRUTTLCache:
+    """
+    In-process result cache with LRU order, a TTL, a stale grace window and a byte budget
+    
+    get and set are O(1) on an OrderedDict kept in recency order. An entry is fresh for ttl
+    seconds; after that lookup() still returns it, flagged stale, until the grace window or
+    the max staleness ends, so the caller can serve it and refresh in the background. Entries
+    past that are dropped on read and by sweep(), which a background task calls periodically.
+    Entry sizes are estimated by the caller; the least recently used entries are evicted once
+    the total goes over the budget. Any backend with get, lookup, set, delete, sweep and stats
+    can stand in; blocking says whether its calls should be moved off the event loop.
+    """
+
+    blocking = False
+
+    def __init__(self, ttl=CACHE_EXPIRY, max_bytes=NEWS_CACHE_MAX_BYTES, grace=CACHE_STALE_GRACE,
+                 max_staleness=CACHE_MAX_STALENESS):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.grace = grace
+        # Nothing older than this is served, fresh or stale
+        self.max_age = min(ttl + grace, max_staleness)
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, key):
+        """Return (value, age in seconds, stale) for a servable entry, or (None, None, False)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None, False
+            age = time.time() - entry[2]
+            if age >= self.max_age:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, None, False
+            self._entries.move_to_end(key)
+            stale = age >= self.ttl
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry[0], age, stale
+
+    def get(self, key):
+        """Return a fresh value, or None"""
+        value, _, stale = self.lookup(key)
+        return None if stale else value
+
+    def set(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size, time.time())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def sweep(self):
+        """Free every entry too old to serve even stale, returning how many were dropped"""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            expired = [key for key, (_, _, stored_at) in self._entries.items() if stored_at <= cutoff]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "grace": self.grace,
+                "max_age": self.max_age,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+# Result cache backends: "memory" is per process; "sqlite" and "redis" are shared by every worker
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_NAMESPACE = os.environ.get("CACHE_NAMESPACE", "news:results:v1")  # Prefix for keys in shared backends
+CACHE_SQLITE_PATH = os.environ.get("CACHE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "news_results.sqlite3"))
+REDIS_URL = os.environ.get("REDIS_URL", "")  # Required by the redis backend
+REDIS_TIMEOUT = float(os.environ.get("REDIS_TIMEOUT", "0.5"))
+
+class RedisError(Exception):
+    """Error reply from a Redis server"""
+
+def redact_url(url):
+    """A URL safe to report: any password in its userinfo is masked"""
+    if not url:
+        return url
+    parsed = urlparse(url)
+    if parsed.password is None:
+        return url
+    host = parsed.netloc.rsplit("@", 1)[1]
+    return parsed._replace(netloc=f"{parsed.username or ''}:***@{host}").geturl()
+
+class RedisClient:
+    """Minimal blocking Redis client speaking RESP2, enough for GET, SET with expiry, DEL and PING"""
+
+    def __init__(self, url, timeout=REDIS_TIMEOUT):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def execute(self, *args):
+        """Send one command and return its reply, reconnecting once if the connection dropped"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._command(*args)
+                except OSError:
+                    self._close()
+                    if attempt:
+                        raise
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _command(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(parts))
+        return read_resp_reply(self._reader)
+
+def read_resp_reply(reader):
+    """Read one RESP2 reply from a binary file object"""
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Redis closed the connection")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        raise RedisError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        return None if length < 0 else reader.read(length + 2)[:-2]
+    if kind == b"*":
+        count = int(rest)
+        return None if count < 0 else [read_resp_reply(reader) for _ in range(count)]
+    raise ConnectionError(f"Unexpected Redis reply {line[:40]!r}")
+
+class SharedCacheBackend:
+    """
+    Result cache stored outside the process, so every worker shares hits and fills
+    
+    Pool IDs only mean something inside one process, so entries are written as
+    encode_cache_entry() blobs carrying the full article records and decoded back into
+    the local pool on read. The last few decoded entries are kept in memory so repeated
+    hits on a key do not decode again until another worker replaces it. Subclasses provide
+    _load, _store, _delete and _sweep. Storage errors count as misses, never as failed requests.
+    """
+
+    name = "shared"
+    blocking = True  # Reads and writes do I/O, so callers on the event loop go through run_blocking
+
+    def __init__(self, namespace=CACHE_NAMESPACE, ttl=CACHE_EXPIRY, grace=CACHE_STALE_GRACE,
+                 max_staleness=CACHE_MAX_STALENESS, decoded_items=64):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.grace = grace
+        self.max_age = min(ttl + grace, max_staleness)
+        self.decoded_items = decoded_items
+        self._decoded = OrderedDict()  # key -> (stored_at, entry)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.errors = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def lookup(self, key):
+        """Return (value, age in seconds, stale) for a servable entry, or (None, None, False)"""
+        try:
+            record = self._load(self._key(key))
+        except (OSError, RedisError, sqlite3.Error) as e:
+            print(f"{self.name} cache read failed: {e}")
+            self.errors += 1
+            record = None
+        if record is None:
+            self.misses += 1
+            return None, None, False
+        blob, stored_at = record
+        age = time.time() - stored_at
+        if age >= self.max_age:
+            self.delete(key)
+            self.expirations += 1
+            self.misses += 1
+            return None, None, False
+        
+        with self._lock:
+            decoded = self._decoded.get(key)
+        if decoded is not None and decoded[0] == stored_at:
+            value = decoded[1]
+        else:
+            try:
+                value = decode_cache_entry(blob)
+            except (ValueError, KeyError, struct.error, zlib.error) as e:
+                print(f"Dropping undecodable {self.name} cache entry: {e}")
+                self.delete(key)
+                self.misses += 1
+                return None, None, False
+            with self._lock:
+                self._decoded[key] = (stored_at, value)
+                self._decoded.move_to_end(key)
+                while len(self._decoded) > self.decoded_items:
+                    self._decoded.popitem(last=False)
+        stale = age >= self.ttl
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return value, age, stale
+
+    def get(self, key):
+        """Return a fresh value, or None"""
+        value, _, stale = self.lookup(key)
+        return None if stale else value
+
+    def set(self, key, value, size=None):
+        """Store an entry; size is ignored since the encoded blob length is known exactly"""
+        blob = encode_cache_entry(value)
+        try:
+            self._store(self._key(key), blob, time.time())
+            return True
+        except (OSError, RedisError, sqlite3.Error) as e:
+            print(f"{self.name} cache write failed: {e}")
+            self.errors += 1
+            return False
+
+    def delete(self, key):
+        with self._lock:
+            self._decoded.pop(key, None)
+        try:
+            self._delete(self._key(key))
+        except (OSError, RedisError, sqlite3.Error) as e:
+            print(f"{self.name} cache delete failed: {e}")
+            self.errors += 1
+
+    def sweep(self):
+        """Free entries too old to serve even stale, returning how many were dropped"""
+        try:
+            removed = self._sweep(time.time() - self.max_age)
+        except (OSError, RedisError, sqlite3.Error) as e:
+            print(f"{self.name} cache sweep failed: {e}")
+            self.errors += 1
+            return 0
+        self.expirations += removed
+        return removed
+
+    def stats(self):
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.name,
+            "namespace": self.namespace,
+            "ttl": self.ttl,
+            "grace": self.grace,
+            "max_age": self.max_age,
+            # Counters are for this worker only; the stored entries are shared
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+            "expirations": self.expirations,
+            "errors": self.errors,
+            **self._backend_stats()
+        }
+
+    def _backend_stats(self):
+        return {}
+
+class SQLiteCacheBackend(SharedCacheBackend):
+    """Result cache in a SQLite database in WAL mode, shared by worker processes on one host"""
+
+    name = "sqlite"
+
+    def __init__(self, path=CACHE_SQLITE_PATH, max_bytes=NEWS_CACHE_MAX_BYTES, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        # Result and snapshot caches share the table, so sizes, eviction and stats stay within a namespace
+        self._key_pattern = f"{self.namespace}:%"
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+        self._db.commit()
+
+    def _load(self, key):
+        with self._db_lock:
+            row = self._db.execute("SELECT value, stored_at, last_used FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] > 10:  # Keep LRU order without a write on every hit
+                self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+                self._db.commit()
+            return row[0], row[1]
+
+    def _store(self, key, blob, stored_at):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, stored_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), stored_at, stored_at)
+            )
+            self._db.commit()
+            stored_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results WHERE key LIKE ?", (self._key_pattern,)
+            ).fetchone()[0]
+            if stored_bytes > self.max_bytes:
+                self._evict(stored_bytes)
+
+    def _evict(self, stored_bytes):
+        """Drop this namespace's least recently used rows until it is back under 90% of its byte budget"""
+        target = int(self.max_bytes * 0.9)
+        evicted = []
+        rows = self._db.execute(
+            "SELECT key, size FROM results WHERE key LIKE ? ORDER BY last_used", (self._key_pattern,)
+        ).fetchall()
+        for key, size in rows:
+            if stored_bytes <= target:
+                break
+            evicted.append((key,))
+            stored_bytes -= size
+        self._db.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self._db.commit()
+        self.evictions += len(evicted)
+
+    def _delete(self, key):
+        with self._db_lock:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _sweep(self, before):
+        with self._db_lock:
+            removed = self._db.execute(
+                "DELETE FROM results WHERE key LIKE ? AND stored_at < ?", (self._key_pattern, before)
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    def _backend_stats(self):
+        with self._db_lock:
+            entries, stored_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results WHERE key LIKE ?", (self._key_pattern,)
+            ).fetchone()
+        return {"path": self.path, "entries": entries, "bytes": stored_bytes, "max_bytes": self.max_bytes,
+                "evictions": self.evictions}
+
+class RedisCacheBackend(SharedCacheBackend):
+    """
+    Result cache in Redis (or anything speaking its protocol), shared by workers on any host
+    
+    Values are the stored-at time followed by the encoded entry, written with a PX expiry of
+    the max staleness so Redis drops them itself; LRU and memory limits are left to Redis.
+    """
+
+    name = "redis"
+
+    def __init__(self, url=REDIS_URL, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.client = RedisClient(url) if url else None
+
+    def _load(self, key):
+        if self.client is None:
+            raise ConnectionError("Redis cache backend has no server yet")
+        value = self.client.execute("GET", key)
+        if value is None:
+            return None
+        return value[8:], struct.unpack("<d", value[:8])[0]
+
+    def _store(self, key, blob, stored_at):
+        if self.client is None:
+            raise ConnectionError("Redis cache backend has no server yet")
+        self.client.execute("SET", key, struct.pack("<d", stored_at) + blob, "PX", str(int(self.max_age * 1000)))
+
+    def _delete(self, key):
+        if self.client is not None:
+            self.client.execute("DEL", key)
+
+    def _sweep(self, before):
+        return 0  # Redis expires keys on its own
+
+    def _backend_stats(self):
+        return {"url": redact_url(self.url)}
+
+def create_cache_backend(name=CACHE_BACKEND, namespace=CACHE_NAMESPACE, ttl=CACHE_EXPIRY, grace=CACHE_STALE_GRACE,
+                         max_staleness=CACHE_MAX_STALENESS):
+    """Build the result cache backend selected by CACHE_BACKEND"""
+    expiry = {"ttl": ttl, "grace": grace, "max_staleness": max_staleness}
+    if name == "sqlite":
+        return SQLiteCacheBackend(namespace=namespace, **expiry)
+    if name == "redis":
+        if REDIS_URL:
+            return RedisCacheBackend(namespace=namespace, **expiry)
+        print("CACHE_BACKEND=redis needs REDIS_URL, using the in-process cache")
+    return LRUTTLCache(**expiry)
+
+# Query cache key -> latest result entry
+NEWS_CACHE = create_cache_backend()
+
+# Snapshot ID -> the same entry, kept past cache expiry so cursors over it stay valid
+SNAPSHOT_TTL = int(os.environ.get("SNAPSHOT_TTL", "3600"))
+SNAPSHOT_STORE = create_cache_backend(namespace=os.environ.get("SNAPSHOT_NAMESPACE", "news:snapshots:v1"),
+                                      ttl=SNAPSHOT_TTL, grace=0, max_staleness=SNAPSHOT_TTL)
+
+async def cache_lookup(cache, key):
+    """lookup() on a cache backend, off the event loop when the backend does I/O"""
+    if cache.blocking:
+        return await run_blocking(cache.lookup, key)
+    return cache.lookup(key)
+
+async def cache_store(cache, key, entry):
+    """set() a result entry on a cache backend, off the event loop when the backend does I/O"""
+    if cache.blocking:
+        return await run_blocking(cache.set, key, entry, estimate_cache_entry_size(entry))
+    return cache.set(key, entry, estimate_cache_entry_size(entry))
+
+def result_cache_key(language, category, query, preferred_sources, date_range=None):
+    """Cache key over every parameter that changes the ranked result, including the full query"""
+    params = json.dumps([language, category, " ".join(query.split()), sorted(preferred_sources)]
+                        + ([list(date_range)] if date_range else []))
+    return hashlib.sha256(params.encode("utf-8")).hexdigest()[:32]
+
+CURSOR_FORMAT = struct.Struct("<8sIH")  # snapshot ID, offset, page size; NewsRequest bounds keep both in range
+
+def encode_cursor(snapshot_id, offset, page_size):
+    return base64.urlsafe_b64encode(CURSOR_FORMAT.pack(bytes.fromhex(snapshot_id), offset, page_size)).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Return (snapshot_id, offset, page_size), or raise ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        snapshot_id, offset, page_size = CURSOR_FORMAT.unpack(raw)
+    except (ValueError, struct.error) as e:
+        raise ValueError(f"Malformed cursor: {e}")
+    # Cursors are not signed, so a hand-made one must not get past the request's page size limit
+    if not 1 <= page_size <= NEWS_MAX_PAGE_SIZE:
+        raise ValueError(f"Malformed cursor: page size {page_size} outside 1..{NEWS_MAX_PAGE_SIZE}")
+    return snapshot_id.hex(), offset, page_size
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time
+    
+    The first caller for a key starts the work as a task; callers arriving while it runs await
+    the same task and get the same result or exception. The task is shielded, so a caller that
+    is cancelled (a dropped client, a fetch wave that stops early) does not cancel it for the rest.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.started = 0
+        self.shared = 0
+
+    def start(self, key, factory):
+        """Return the running task for a key, starting one from factory() if there is none"""
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self.started += 1
+        else:
+            self.shared += 1
+        return task
+
+    async def do(self, key, factory):
+        return await asyncio.shield(self.start(key, factory))
+
+    def running(self, key):
+        """The task in flight for a key, or None"""
+        return self._flights.get(key)
+
+    def _finish(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Also reached for background refreshes that nobody awaits
+            print(f"Single-flight task for {key!r} failed: {task.exception()}")
+
+    def stats(self):
+        return {"in_flight": len(self._flights), "started": self.started, "shared": self.shared}
+
+# Coalesced work: result pipeline runs per cache key, category detection per query, fetches per feed URL
+RESULT_FLIGHTS = SingleFlight()
+CATEGORY_FLIGHTS = SingleFlight()
+FEED_FLIGHTS = SingleFlight()
+FEED_SET_FLIGHTS = SingleFlight()  # Background completion of feed sets fetched under a request's deadline
+EMBEDDING_INDEX_FLIGHTS = SingleFlight()  # Embedding of completed feed sets, after they reached the store
+
+async def cache_sweep_loop(cache, interval=NEWS_CACHE_SWEEP_INTERVAL):
+    """Periodically free expired cache entries so memory does not wait on reads"""
+    while True:
+        await asyncio.sleep(interval)
+        removed = await run_blocking(cache.sweep) if cache.blocking else cache.sweep()
+        if removed:
+            print(f"Swept {removed} expired entries from the result cache")
+
+def estimate_cache_entry_size(entry):
+    """Approximate memory held by a result cache entry: the ID and score arrays plus source names"""
+    size = 256  # Dict, key and array object overhead
+    size += entry["ids"].itemsize * len(entry["ids"]) + entry["scores"].itemsize * len(entry["scores"])
+    size += sum(64 + len(name) for name in entry["available_sources"])
+    return size
+
+@app.get("/api/admin/cache")
+def get_result_cache_stats():
+    """Report result cache size, hit rate, evictions and expirations, snapshots, and single-flight coalescing"""
+    return {
+        **NEWS_CACHE.stats(),
+        "snapshots": SNAPSHOT_STORE.stats(),
+        "single_flight": {
+            "results": RESULT_FLIGHTS.stats(),
+            "categories": CATEGORY_FLIGHTS.stats(),
+            "feeds": FEED_FLIGHTS.stats()
+        }
+    }
+
+def make_cache_entry(timestamp, ranked, available_sources, fallback=False, query="", category=None, partial=False):
+    """
+    Compact, immutable snapshot of a ranked result: pool IDs and relevance scores (NaN when unscored),
+    whether the query matched nothing so recent articles were ranked instead, whether it was cut
+    short by the request's latency budget, and the query it answers
+    """
+    return {
+        "snapshot_id": uuid.uuid4().hex[:16],
+        "timestamp": timestamp,
+        "fallback": fallback,
+        "partial": partial,
+        "query": query,
+        "category": category,
+        "ids": array('I', (article.pool_id for article, _ in ranked)),
+        "scores": array('f', (math.nan if relevance is None else relevance for _, relevance in ranked)),
+        "available_sources": available_sources
+    }
+
+CACHE_ENTRY_FORMAT = 2
+CACHE_ENTRY_HEADER = struct.Struct("<BdBI")  # format version, timestamp, flags, article count
+CACHE_ENTRY_FALLBACK = 1
+CACHE_ENTRY_PARTIAL = 2
+
+def encode_cache_entry(entry):
+    """
+    Serialize a cache entry for a shared backend: a fixed header, the float32 scores, then the
+    zlib-compressed JSON article records (pool IDs are process-local, so the articles travel too)
+    """
+    articles, scores = [], array('f')
+    for pool_id, relevance in zip(entry["ids"], entry["scores"]):
+        article = ARTICLE_POOL.get(pool_id)
+        if article is not None:
+            articles.append([
+                article.title, article.summary, article.link, article.image_url, article.published_date,
+                article.source_name, article.source_url, article.category,
+                [[SOURCES.value(source_id)[0], SOURCES.value(source_id)[1], link]
+                 for source_id, link in (article.alternates or ())]
+            ])
+            scores.append(relevance)
+    body = json.dumps({
+        "snapshot": entry["snapshot_id"], "query": entry["query"], "category": entry["category"],
+        "sources": entry["available_sources"], "articles": articles
+    }, separators=(",", ":"))
+    flags = (CACHE_ENTRY_FALLBACK if entry["fallback"] else 0) | (CACHE_ENTRY_PARTIAL if entry["partial"] else 0)
+    header = CACHE_ENTRY_HEADER.pack(CACHE_ENTRY_FORMAT, entry["timestamp"], flags, len(articles))
+    return header + scores.tobytes() + zlib.compress(body.encode("utf-8"))
+
+def decode_cache_entry(blob):
+    """Rebuild a cache entry from encode_cache_entry() output, pooling its articles in this process"""
+    version, timestamp, flags, count = CACHE_ENTRY_HEADER.unpack_from(blob)
+    if version != CACHE_ENTRY_FORMAT:
+        raise ValueError(f"Unknown cache entry format {version}")
+    offset = CACHE_ENTRY_HEADER.size
+    scores = array('f')
+    scores.frombytes(blob[offset:offset + 4 * count])
+    body = json.loads(zlib.decompress(blob[offset + 4 * count:]))
+    ids = array('I')
+    for title, summary, link, image_url, published_date, source_name, source_url, category, alternates in body["articles"]:
+        article = make_article(title, summary, link, image_url, published_date, source_name, source_url, category)
+        if alternates and not article.alternates:
+            article.alternates = [
+                (SOURCES.intern((name, url)), alt_link) for name, url, alt_link in alternates[:MAX_ALTERNATES]
+            ]
+        ids.append(article.pool_id)
+    return {
+        "snapshot_id": body["snapshot"],
+        "timestamp": timestamp,
+        "fallback": bool(flags & CACHE_ENTRY_FALLBACK),
+        "partial": bool(flags & CACHE_ENTRY_PARTIAL),
+        "query": body["query"],
+        "category": body["category"],
+        "ids": ids,
+        "scores": scores,
+        "available_sources": body["sources"]
+    }
+
+def cached_page(entry, start_idx, end_idx):
+    """Resolve one page of a cache entry into response models, skipping articles that expired from the pool"""
+    page = []
+    for pool_id, relevance in zip(entry["ids"][start_idx:end_idx], entry["scores"][start_idx:end_idx]):
+        article = ARTICLE_POOL.get(pool_id)
+        if article is not None:
+            page.append(article.to_response(None if math.isnan(relevance) else relevance))
+    return page
+
+class ArticleStore:
+    """Shared in-process store of ingested articles, one entry per (category, language) feed set"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def put(self, category, language, articles, partial=False):
+        """Replace the articles stored for a feed set; partial while late feeds are still being fetched"""
+        with self._lock:
+            self._entries[(category, language)] = {
+                "articles": articles,
+                "partial": partial,
+                "updated_at": time.time()
+            }
+
+    def get(self, category, language):
+        """Return the stored articles for a feed set, or None if it was never ingested"""
+        with self._lock:
+            entry = self._entries.get((category, language))
+        if entry is None:
+            return None
+        # Articles are shared and never mutated per request, so a new list is enough
+        return list(entry["articles"])
+
+    def is_partial(self, category, language):
+        with self._lock:
+            entry = self._entries.get((category, language))
+        return entry is not None and entry["partial"]
+
+    def pool_ids(self):
+        """Pool IDs of every stored article"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {article.pool_id for entry in entries for article in entry["articles"]}
+
+    def labelled_articles(self):
+        """Every stored article with the category of the feed set it was ingested for"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return [(category, article) for (category, _), entry in entries for article in entry["articles"]]
+
+    def stats(self):
+        """Summarize what the store holds for monitoring"""
+        with self._lock:
+            return {
+                f"{category}/{language}": {
+                    "articles": len(entry["articles"]),
+                    "partial": entry["partial"],
+                    "age_seconds": round(time.time() - entry["updated_at"], 1)
+                }
+                for (category, language), entry in self._entries.items()
+            }
+
+ARTICLE_STORE = ArticleStore()
+
+# Persistent article archive: every ingested article in SQLite with an FTS5 index, for history search
+ARCHIVE_ENABLED = os.environ.get("ARCHIVE_ENABLED", "1") == "1"
+ARCHIVE_PATH = os.environ.get("ARCHIVE_PATH", os.path.join(tempfile.gettempdir(), "news_archive.sqlite3"))
+ARCHIVE_RETENTION_DAYS = float(os.environ.get("ARCHIVE_RETENTION_DAYS", "30"))
+ARCHIVE_MAX_RESULTS = int(os.environ.get("ARCHIVE_MAX_RESULTS", "200"))  # Articles per archive result set
+
+class ArticleArchive:
+    """
+    On-disk history of ingested articles in a SQLite database in WAL mode
+    
+    Articles are keyed by their stable ID and linked to every (category, language) feed set that
+    carried them. An external-content FTS5 table over title and summary is kept in sync by
+    triggers. Without FTS5 in the linked SQLite, text queries fall back to LIKE matching.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH, retention_days=ARCHIVE_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.fts = False
+        self.stats = {"upserts": 0, "upserted_articles": 0, "queries": 0, "pruned": 0}
+        self._lock = threading.Lock()
+        self._db = None
+        if path is None:
+            return
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "row_id INTEGER PRIMARY KEY, article_id TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+                "summary TEXT NOT NULL, link TEXT, image_url TEXT, published_date TEXT, published_at REAL NOT NULL, "
+                "source_name TEXT, source_url TEXT, content_hash TEXT NOT NULL, archived_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS articles_published_at ON articles(published_at)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS article_feed_sets ("
+                "category TEXT NOT NULL, language TEXT NOT NULL, row_id INTEGER NOT NULL, published_at REAL NOT NULL, "
+                "PRIMARY KEY (category, language, row_id)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS article_feed_sets_published ON article_feed_sets(category, language, published_at)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS article_feed_sets_language ON article_feed_sets(language, published_at)")
+            self._create_fts()
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Article archive unavailable ({e})")
+            self._db = None
+
+    def _create_fts(self):
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                "title, summary, content='articles', content_rowid='row_id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 not available ({e}), archive text search uses LIKE")
+            return
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN "
+            "INSERT INTO articles_fts(rowid, title, summary) VALUES (new.row_id, new.title, new.summary); END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.row_id, old.title, old.summary); END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.row_id, old.title, old.summary); "
+            "INSERT INTO articles_fts(rowid, title, summary) VALUES (new.row_id, new.title, new.summary); END"
+        )
+        self.fts = True
+
+    @property
+    def available(self):
+        return self._db is not None
+
+    def upsert(self, category, language, articles, now=None):
+        """Insert or update a feed set's articles in one transaction; unchanged rows are not rewritten"""
+        if self._db is None or not articles:
+            return 0
+        now = time.time() if now is None else now
+        cutoff = now - self.retention_days * 86400
+        rows = [
+            (article.id, article.title, article.summary, article.link, article.image_url, article.published_date,
+             article.timestamp, article.source_name, article.source_url, article.content_hash, now)
+            for article in articles if article.timestamp >= cutoff
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO articles (article_id, title, summary, link, image_url, published_date, published_at, "
+                "source_name, source_url, content_hash, archived_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(article_id) DO UPDATE SET title = excluded.title, summary = excluded.summary, "
+                "image_url = excluded.image_url, published_date = excluded.published_date, "
+                "published_at = excluded.published_at, content_hash = excluded.content_hash "
+                "WHERE articles.content_hash != excluded.content_hash",
+                rows
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO article_feed_sets (category, language, row_id, published_at) "
+                "SELECT ?, ?, row_id, published_at FROM articles WHERE article_id = ?",
+                [(category, language, row[0]) for row in rows]
+            )
+        self.stats["upserts"] += 1
+        self.stats["upserted_articles"] += len(rows)
+        return len(rows)
+
+    def search(self, query="", category=None, language=None, since=None, until=None, limit=ARCHIVE_MAX_RESULTS):
+        """
+        Archived articles published in [since, until) for a feed set (or just a language), as
+        (row, score) pairs: best text matches first when there is a query, otherwise newest first
+        """
+        if self._db is None:
+            return []
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("a.published_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("a.published_at < ?")
+            params.append(until)
+        if category is not None:
+            clauses.append("a.row_id IN (SELECT row_id FROM article_feed_sets WHERE category = ? AND language = ?)")
+            params += [category, language]
+        elif language is not None:
+            clauses.append("a.row_id IN (SELECT row_id FROM article_feed_sets WHERE language = ?)")
+            params.append(language)
+        
+        columns = ("a.article_id, a.title, a.summary, a.link, a.image_url, a.published_date, "
+                   "a.source_name, a.source_url")
+        tokens = list(dict.fromkeys(tokenize(query)))[:16]
+        if tokens and self.fts:
+            # Quoted tokens cannot be read as FTS5 operators; OR lets bm25 rank partial matches lower
+            sql = (f"SELECT {columns}, bm25(articles_fts, 2.0, 1.0) AS score FROM articles_fts "
+                   "JOIN articles a ON a.row_id = articles_fts.rowid WHERE articles_fts MATCH ?")
+            params.insert(0, " OR ".join(f'"{token}"' for token in tokens))
+            order = "score"
+        elif tokens:
+            sql = f"SELECT {columns}, NULL AS score FROM articles a WHERE ({' OR '.join(['a.title LIKE ? OR a.summary LIKE ?'] * len(tokens))})"
+            params = [f"%{token}%" for token in tokens for _ in range(2)] + params
+            order = "a.published_at DESC"
+        else:
+            sql = f"SELECT {columns}, NULL AS score FROM articles a WHERE 1"
+            order = "a.published_at DESC"
+        sql += "".join(f" AND {clause}" for clause in clauses) + f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        self.stats["queries"] += 1
+        return [(row[:-1], row[-1]) for row in rows]
+
+    def prune(self, now=None):
+        """Delete articles published before the retention window"""
+        if self._db is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM article_feed_sets WHERE published_at < ?", (cutoff,))
+            removed = self._db.execute("DELETE FROM articles WHERE published_at < ?", (cutoff,)).rowcount
+        self.stats["pruned"] += removed
+        return removed
+
+    def summary(self):
+        if self._db is None:
+            return {"enabled": False}
+        with self._lock:
+            articles, oldest, newest = self._db.execute(
+                "SELECT COUNT(*), MIN(published_at), MAX(published_at) FROM articles"
+            ).fetchone()
+            page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "enabled": True,
+            "path": self.path,
+            "fts5": self.fts,
+            "retention_days": self.retention_days,
+            "articles": articles,
+            "oldest": datetime.fromtimestamp(oldest).isoformat() if oldest else None,
+            "newest": datetime.fromtimestamp(newest).isoformat() if newest else None,
+            "bytes": page_count * page_size,
+            **self.stats
+        }
+
+ARTICLE_ARCHIVE = ArticleArchive(ARCHIVE_PATH if ARCHIVE_ENABLED else None)
+
+def parse_date_range(from_date, to_date):
+    """
+    (since, until) epoch bounds for a request's ISO date range, or None without one; a bare
+    to_date includes that whole day. Raises ValueError for unparseable dates.
+    """
+    if not from_date and not to_date:
+        return None
+    
+    def bound(value, end):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError(f"Invalid date {value!r}, expected ISO 8601 such as 2026-10-01")
+        if end and len(value) == 10:
+            parsed += timedelta(days=1)
+        return parsed.timestamp()
+    
+    since = bound(from_date, False) if from_date else None
+    until = bound(to_date, True) if to_date else None
+    if since is not None and until is not None and since >= until:
+        raise ValueError("from_date must be before to_date")
+    return since, until
+
+def archive_search(query, category, language, since, until):
+    """Search the archive and pool the matching articles, as (article, relevance) pairs"""
+    rows = ARTICLE_ARCHIVE.search(query, category, language, since, until)
+    # bm25 is negative with lower being better; relevance is the share of the best match's score
+    best = min((score for _, score in rows if score is not None), default=None)
+    ranked = []
+    for (article_id, title, summary, link, image_url, published_date, source_name, source_url), score in rows:
+        article = make_article(title, summary, link, image_url, published_date, source_name, source_url, category)
+        ranked.append((article, score / best if score is not None and best else None))
+    return ranked
+
+@app.get("/api/admin/archive")
+def get_archive_stats():
+    """Report the article archive's size, date coverage and activity"""
+    return ARTICLE_ARCHIVE.summary()
+
+def resolve_feed_url(feed_url):
+    """Map a configured feed URL to the URL that is actually fetched"""
+    if MOCK_FEED_URL:
+        return f"{MOCK_FEED_URL}/feed?url={quote(feed_url, safe='')}"
+    return feed_url
 
 @app.get("/api/py/helloFastApi")
 def hello_fast_api():
@@ -795,13 +1890,13 @@ def extract_image_from_entry(entry):
         # Try to find image in content
         if hasattr(entry, 'content') and entry.content:
             content = entry.content[0].value
-            img_match = re.search(r'<img[^>]+src="([^">]+)"', content)
+            img_match = IMG_SRC_RE.search(content)
             if img_match:
                 return img_match.group(1)
                 
         # Try to find image in summary
         if hasattr(entry, 'summary'):
-            img_match = re.search(r'<img[^>]+src="([^">]+)"', entry.summary)
+            img_match = IMG_SRC_RE.search(entry.summary)
             if img_match:
                 return img_match.group(1)
     except:
@@ -809,90 +1904,869 @@ def extract_image_from_entry(entry):
     
     return None
 
-def fetch_rss_feed(feed_url, category=None, max_retries=2):
-    """Fetch articles from a single RSS feed with retry logic"""
-    for retry in range(max_retries):
-        try:
-            # Parse the feed with a short timeout
-            feed = feedparser.parse(feed_url, timeout=3)
-            
-            # Check if feed has entries
-            if not hasattr(feed, 'entries') or len(feed.entries) == 0:
-                print(f"Warning: No entries found in {feed_url}")
-                return []
+# Ingest-time normalization: derived fields computed once per article and read by every later stage
+HTML_TAG_RE = re.compile(r'<.*?>', re.S)
+IMG_SRC_RE = re.compile(r'<img[^>]+src="([^">]+)"')
+WHITESPACE_RE = re.compile(r'\s+')
+TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+def clean_text(text):
+    """Strip HTML tags and entities and collapse whitespace"""
+    return WHITESPACE_RE.sub(' ', html.unescape(HTML_TAG_RE.sub('', text or ''))).strip()
+
+def parse_timestamp(published_date):
+    """Publish date string as epoch seconds (now when it cannot be parsed)"""
+    try:
+        return datetime.fromisoformat(published_date.replace('Z', '+00:00')).timestamp()
+    except Exception:
+        return time.time()
+
+class InternTable:
+    """Assign small integer IDs to values repeated across many articles, such as sources and categories"""
+
+    def __init__(self):
+        self._values = []
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def intern(self, value):
+        value_id = self._ids.get(value)
+        if value_id is None:
+            with self._lock:
+                value_id = self._ids.get(value)
+                if value_id is None:
+                    value_id = len(self._values)
+                    self._values.append(value)
+                    self._ids[value] = value_id
+        return value_id
+
+    def value(self, value_id):
+        return self._values[value_id]
+
+    def __len__(self):
+        return len(self._values)
+
+# Interned (source name, feed URL) pairs and category names
+SOURCES = InternTable()
+CATEGORIES = InternTable()
+
+class Article:
+    """
+    Compact ingested article with its ingest-time derived fields
+    
+    Source and category are interned IDs, and each article lives once in ARTICLE_POOL.
+    Stores, indexes and cached results refer to it instead of copying it; per-request
+    relevance scores are kept next to the article, never on it.
+    """
+
+    __slots__ = (
+        "pool_id", "id", "title", "summary", "link", "image_url", "published_date", "timestamp",
+        "source_id", "category_id", "title_lower", "summary_lower", "title_tokens", "summary_tokens",
+        "alternates", "content_hash", "pooled_at"
+    )
+
+    @property
+    def source_name(self):
+        return SOURCES.value(self.source_id)[0]
+
+    @property
+    def source_url(self):
+        return SOURCES.value(self.source_id)[1]
+
+    @property
+    def category(self):
+        return CATEGORIES.value(self.category_id)
+
+    def alternate_sources(self):
+        """Other outlets carrying the same story, merged in by the near-duplicate index"""
+        return [
+            AlternateSource(name=SOURCES.value(source_id)[0], url=SOURCES.value(source_id)[1], link=link)
+            for source_id, link in (self.alternates or ())
+        ]
+
+    def to_response(self, relevance=None):
+        """Build the API model for this article (only done for the page being returned)"""
+        return NewsArticle(
+            id=self.id,
+            title=self.title,
+            summary=self.summary,
+            source=NewsSource(name=self.source_name, url=self.source_url),
+            published_date=self.published_date,
+            link=self.link,
+            relevance=relevance if relevance is not None else 0.5,
+            image_url=self.image_url,
+            alternate_sources=self.alternate_sources()
+        )
+
+class ArticlePool:
+    """Every live article exactly once, addressed by a small integer pool ID"""
+
+    # Fields derived from the feed entry's text, replaced when a pooled article comes back edited
+    CONTENT_FIELDS = (
+        "title", "summary", "image_url", "published_date", "title_lower", "summary_lower",
+        "title_tokens", "summary_tokens", "timestamp", "content_hash"
+    )
+
+    def __init__(self):
+        self._articles = {}
+        self._by_id = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, article):
+        """
+        Pool an article, returning the already pooled copy if its stable ID is known; a copy
+        whose content changed since takes the new text and is re-indexed
+        """
+        with self._lock:
+            existing = self._by_id.get(article.id)
+            if existing is None:
+                # Pool IDs are never reused, so stale references resolve to None rather than another article
+                article.pool_id = self._next_id
+                self._next_id += 1
+                self._articles[article.pool_id] = article
+                self._by_id[article.id] = article
+                return article
+            existing.pooled_at = article.pooled_at
+            edited = existing.content_hash != article.content_hash
+            if edited:
+                for field in self.CONTENT_FIELDS:
+                    setattr(existing, field, getattr(article, field))
+        if edited:
+            reindex_edited_article(existing)
+        return existing
+
+    def get(self, pool_id):
+        return self._articles.get(pool_id)
+
+    def touch(self, articles):
+        """Mark pooled articles as handed out again without re-parsing them, as when a feed is unchanged"""
+        now = time.time()
+        for article in articles:
+            article.pooled_at = now
+
+    def expire(self, before_timestamp, keep_after=0.0, referenced=frozenset()):
+        """
+        Drop articles published before the given epoch time, unless pooled again after keep_after
+        or their pool ID is still referenced by a stored feed set or feed
+        """
+        with self._lock:
+            expired = [article for article in self._articles.values()
+                       if article.timestamp < before_timestamp and article.pooled_at < keep_after
+                       and article.pool_id not in referenced]
+            for article in expired:
+                del self._articles[article.pool_id]
+                del self._by_id[article.id]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._articles)
+
+ARTICLE_POOL = ArticlePool()
+
+def make_article(title, summary, link, image_url, published_date, source_name, source_url, category):
+    """
+    Create a pooled Article, computing its derived fields once: cleaned text, lowercased
+    text and tokens, epoch timestamp, content hash and a stable ID
+    """
+    article = Article()
+    article.title = clean_text(title)
+    article.summary = clean_text(summary)
+    article.link = link
+    article.image_url = image_url
+    article.published_date = published_date
+    article.source_id = SOURCES.intern((source_name, source_url))
+    article.category_id = CATEGORIES.intern(category)
+    article.title_lower = article.title.lower()
+    article.summary_lower = article.summary.lower()
+    article.title_tokens = tuple(TOKEN_RE.findall(article.title_lower))
+    article.summary_tokens = tuple(TOKEN_RE.findall(article.summary_lower))
+    article.timestamp = parse_timestamp(published_date)
+    article.alternates = None
+    article.pooled_at = time.time()
+    article.content_hash = hashlib.sha256(article_embedding_text(article).encode("utf-8")).hexdigest()
+    # Stable across processes and restarts, unlike hash()
+    identity = link or f"{source_name}\0{article.title}"
+    article.id = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+    return ARTICLE_POOL.add(article)
+
+# Near-duplicate detection: MinHash signatures over word shingles, bucketed with LSH banding
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", "0.6"))  # Estimated Jaccard similarity that merges two articles
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4  # Bands x rows = signature length; (1/bands)^(1/rows) is roughly where candidates start to collide
+MAX_ALTERNATES = int(os.environ.get("MAX_ALTERNATES", "5"))  # Alternate outlets kept per story
+
+class NearDuplicateIndex:
+    """
+    Cluster syndicated copies of a story under one canonical article
+    
+    Each article gets a MinHash signature over word bigrams of its title and summary. The
+    signature is split into bands, and a band table maps every band value to the canonical
+    articles that produced it, so a lookup only compares against articles sharing a band
+    rather than against everything ingested. The index persists across ingestion cycles.
+    """
+
+    def __init__(self, bands=MINHASH_BANDS, rows=MINHASH_ROWS, threshold=NEAR_DUPLICATE_THRESHOLD, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a * x + b) mod 2^64, keeping the high 32 bits, with a odd
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, bands * rows, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, bands * rows, dtype=np.uint64, endpoint=True)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}  # canonical pool ID -> signature
+        self._canonical = {}   # pool ID of every indexed article -> canonical article
+        self._lock = threading.Lock()
+        self.merged = 0
+
+    def signature(self, article):
+        tokens = article.title_tokens + article.summary_tokens
+        shingles = {" ".join(tokens[i:i + 2]) for i in range(max(1, len(tokens) - 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def resolve(self, article):
+        """
+        Return the canonical article for this one, indexing it as a new story if nothing
+        similar is known; a merged duplicate is attached to the canonical as an alternate source
+        """
+        with self._lock:
+            canonical = self._canonical.get(article.pool_id)
+        if canonical is not None:
+            return canonical
+        if not article.title_tokens and not article.summary_tokens:
+            return article
+        
+        signature = self.signature(article)
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, band_keys):
+                candidates.update(bucket.get(band_key, ()))
             
-            # Get source name from feed or fallback to URL
-            domain = feed_url.split('/')[2]
-            source_name = NEWS_SOURCE_NAMES.get(domain, feed.feed.title if hasattr(feed.feed, 'title') else domain)
-            source_image = DEFAULT_SOURCE_IMAGES.get(source_name, DEFAULT_SOURCE_IMAGES["default"])
+            best, best_similarity = None, self.threshold
+            for candidate in candidates:
+                similarity = float(np.mean(self._signatures[candidate.pool_id] == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
             
-            # Process each entry - increased from 10 to 20 entries per feed
-            articles = []
-            for entry in feed.entries[:20]:  # Process up to 20 articles per feed
-                try:
-                    # Extract and clean data - only basics for speed
-                    title = entry.title if hasattr(entry, 'title') else ""
-                    title = re.sub(r'<.*?>', '', title)  # Remove HTML tags
-                    
-                    summary = entry.summary if hasattr(entry, 'summary') else ""
-                    summary = re.sub(r'<.*?>', '', summary)  # Remove HTML tags
-                    
-                    # Extract publication date if available
-                    pub_date = datetime.now().isoformat()
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            pub_date = datetime(*entry.published_parsed[:6]).isoformat()
-                        except:
-                            pass
-                    
-                    # Simple image extraction (skip complex extraction for performance)
-                    image_url = None
-                    if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-                        image_url = entry.media_thumbnail[0]['url']
-                    image_url = image_url or source_image
-                    
-                    # Create article object
-                    article = {
-                        "id": str(hash(title + source_name)),
-                        "title": title,
-                        "summary": summary,
-                        "source": {"name": source_name, "url": feed_url},
-                        "published_date": pub_date,
-                        "link": entry.link if hasattr(entry, 'link') else "",
-                        "image_url": image_url,
-                        "category": category
-                    }
-                    articles.append(article)
-                except Exception as e:
-                    print(f"Error processing entry from {feed_url}: {e}")
-                    continue
+            if best is None:
+                self._signatures[article.pool_id] = signature
+                self._canonical[article.pool_id] = article
+                for bucket, band_key in zip(self._buckets, band_keys):
+                    bucket.setdefault(band_key, []).append(article)
+                return article
             
-            return articles
-        
-        except Exception as e:
-            if retry == max_retries - 1:
-                print(f"Error fetching {feed_url} after {max_retries} retries: {e}")
-                return []
-            else:
-                print(f"Retrying {feed_url} ({retry+2}/{max_retries})...")
-                time.sleep(0.5)  # Reduced wait time between retries
+            self._canonical[article.pool_id] = best
+            alternates = best.alternates or []
+            # One alternate per outlet: an outlet's many feeds are different source IDs under the same name
+            outlets = {SOURCES.value(source_id)[0] for source_id, _ in alternates}
+            outlet = SOURCES.value(article.source_id)[0]
+            if len(alternates) < MAX_ALTERNATES and outlet != SOURCES.value(best.source_id)[0] and outlet not in outlets:
+                # Copy on write so readers building a response never see a list mid-append
+                best.alternates = alternates + [(article.source_id, article.link)]
+            self.merged += 1
+            return best
 
-async def fetch_news_api(query, language, category=None, fallback=True):
-    """Fetch news from NewsAPI as a fallback"""
-    if not NEWS_API_KEY or not fallback:
-        return []
-    
-    try:
-        # Map our language codes to NewsAPI codes
-        lang_map = {
-            "en": "en",
-            "hi": "hi",
-            "ta": "ta", 
-            "te": "te",
-            "gu": "gu",
-            "mr": "mr"
-        }
-        lang = lang_map.get(language, "en")
+    def expire(self, before_timestamp):
+        """Forget stories whose canonical article was published before the given epoch time"""
+        with self._lock:
+            expired = [pool_id for pool_id, canonical in self._canonical.items()
+                       if canonical.timestamp < before_timestamp]
+            for pool_id in expired:
+                del self._canonical[pool_id]
+                self._signatures.pop(pool_id, None)
+            if expired:
+                for bucket in self._buckets:
+                    for band_key in list(bucket):
+                        live = [a for a in bucket[band_key] if a.timestamp >= before_timestamp]
+                        if live:
+                            bucket[band_key] = live
+                        else:
+                            del bucket[band_key]
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "stories": len(self._signatures),
+                "articles": len(self._canonical),
+                "merged": self.merged,
+                "threshold": self.threshold,
+                "bands": self.bands,
+                "rows": self.rows
+            }
+
+DUPLICATE_INDEX = NearDuplicateIndex()
+
+# Shared HTTP client for feed fetching
+HTTP_CLIENT = None
+HOST_SEMAPHORES = {}
+
+def get_http_client():
+    """Return the long-lived pooled HTTP client, creating it on first use"""
+    global HTTP_CLIENT
+    if HTTP_CLIENT is None:
+        HTTP_CLIENT = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(FEED_TIMEOUT, connect=min(FEED_TIMEOUT, 3.0)),
+            limits=httpx.Limits(
+                max_connections=FEED_MAX_CONNECTIONS,
+                max_keepalive_connections=FEED_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            ),
+            headers={
+                "User-Agent": FEED_USER_AGENT,
+                "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.8"
+            },
+            follow_redirects=True
+        )
+    return HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections"""
+    global HTTP_CLIENT
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
+
+def get_host_semaphore(url):
+    """Limit how many requests run against one host at the same time"""
+    host = urlparse(url).netloc
+    if host not in HOST_SEMAPHORES:
+        HOST_SEMAPHORES[host] = asyncio.Semaphore(FEED_MAX_CONNECTIONS_PER_HOST)
+    return HOST_SEMAPHORES[host]
+
+class FeedHealth:
+    """Latency, error and circuit breaker state for one feed URL"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latencies = deque(maxlen=FEED_HEALTH_WINDOW)
+        self.outcomes = deque(maxlen=FEED_HEALTH_WINDOW)  # True for success, False for failure
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = None
+        self.state = "closed"
+        self.opened_at = None
+        self.cooldown = FEED_CIRCUIT_COOLDOWN
+        self.probe_in_flight = False
+
+    def allow_request(self):
+        """Decide whether a request may go out, moving an open circuit to half-open after its cooldown"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.time() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True  # Only one probe at a time
+            return True
+        return False
+
+    def record_success(self, latency):
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.last_success = time.time()
+        self.probe_in_flight = False
+        if self.state != "closed":
+            print(f"Circuit closed for {self.url}")
+        self.state = "closed"
+        self.cooldown = FEED_CIRCUIT_COOLDOWN
+
+    def record_failure(self, error):
+        self.outcomes.append(False)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = time.time()
+        self.last_error = str(error)[:200]
+        self.probe_in_flight = False
+        if self.state == "half_open":
+            # Failed probe: reopen and back off further
+            self.cooldown = min(self.cooldown * 2, FEED_CIRCUIT_MAX_COOLDOWN)
+            self.open()
+        elif self.state == "closed" and self.consecutive_failures >= FEED_FAILURE_THRESHOLD:
+            self.open()
+
+    def open(self):
+        self.state = "open"
+        self.opened_at = time.time()
+        print(f"Circuit opened for {self.url} for {self.cooldown:.0f}s after {self.consecutive_failures} failures")
+
+    def percentile(self, pct):
+        """Latency percentile in seconds over the recent window, or None without data"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def timeout(self):
+        """Request timeout derived from the observed p95 latency"""
+        if len(self.latencies) < 5:
+            return FEED_TIMEOUT
+        return min(max(self.percentile(95) * 2, FEED_MIN_TIMEOUT), FEED_TIMEOUT)
+
+    def hedge_delay(self):
+        """Seconds after which a duplicate request is sent (the p90 latency), or None without enough data"""
+        if not FEED_HEDGING or self.state != "closed" or len(self.latencies) < 5:
+            return None
+        return max(self.percentile(FEED_HEDGE_PERCENTILE), FEED_HEDGE_MIN_DELAY)
+
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def snapshot(self):
+        """JSON-friendly view of this feed's health"""
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            "state": self.state,
+            "p50": rounded(self.percentile(50)),
+            "p95": rounded(self.percentile(95)),
+            "p99": rounded(self.percentile(99)),
+            "timeout": rounded(self.timeout()),
+            "error_rate": rounded(self.error_rate()),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success": datetime.fromtimestamp(self.last_success).isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+            "retry_in": rounded(max(0.0, self.opened_at + self.cooldown - time.time())) if self.state == "open" else None
+        }
+
+# Health registry keyed by configured feed URL
+FEED_HEALTH = {}
+
+def get_feed_health(feed_url):
+    if feed_url not in FEED_HEALTH:
+        FEED_HEALTH[feed_url] = FeedHealth(feed_url)
+    return FEED_HEALTH[feed_url]
+
+FEED_HEDGE_STATS = {"sent": 0, "won": 0}
+
+async def hedged_get(url, headers, health):
+    """
+    GET a feed, sending one duplicate request if the first outlives the feed's p90 latency
+    
+    The first successful response wins and the other request is cancelled, so a slow
+    connection or server replica costs about p90 instead of the full timeout.
+    """
+    async def attempt():
+        async with get_host_semaphore(url):
+            response = await get_http_client().get(url, headers=headers, timeout=health.timeout())
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    primary = asyncio.create_task(attempt())
+    tasks = {primary}
+    try:
+        hedge_after = health.hedge_delay()
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                FEED_HEDGE_STATS["sent"] += 1
+                tasks.add(asyncio.create_task(attempt()))
+        while True:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        FEED_HEDGE_STATS["won"] += 1
+                    return task.result()
+            if not tasks:
+                return done.pop().result()  # Every request failed: raise the last error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def download_feed(feed_url, max_retries=2, headers=None):
+    """Download a feed over the shared client with async retry and exponential backoff
+
+    Returns the final response (200 or 304), or None if every attempt failed.
+    """
+    url = resolve_feed_url(feed_url)
+    health = get_feed_health(feed_url)
+    for retry in range(max_retries):
+        request_start = time.time()
+        try:
+            response = await hedged_get(url, headers, health)
+            health.record_success(time.time() - request_start)
+            return response
+        except asyncio.CancelledError:
+            health.probe_in_flight = False  # A cancelled probe must not block the next one
+            raise
+        except Exception as e:
+            health.record_failure(e)
+            if retry == max_retries - 1 or health.state == "open":
+                print(f"Error fetching {feed_url} after {max_retries} retries: {e}")
+                return None
+            print(f"Retrying {feed_url} ({retry+2}/{max_retries})...")
+            await asyncio.sleep(FEED_RETRY_BACKOFF * (2 ** retry) + random.uniform(0, 0.1))
+    return None
+
+# Incremental feed parsing: a pull parser streams entries and stops early instead of building the whole document
+FEED_MAX_ENTRIES = int(os.environ.get("FEED_MAX_ENTRIES", "20"))  # Entries kept per feed
+FEED_PARSE_CHUNK = 64 * 1024
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+MEDIA_THUMBNAIL = "{http://search.yahoo.com/mrss/}thumbnail"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+FEED_ENTRY_TAGS = {"item", RSS1_NS + "item", ATOM_NS + "entry"}
+FEED_CONTAINER_TAGS = {"channel", RSS1_NS + "channel", ATOM_NS + "feed"}
+FEED_PARSE_STATS = {"streamed": 0, "stopped_at_seen": 0, "stopped_at_limit": 0, "feedparser_fallback": 0}
+
+def parse_feed_date(value):
+    """RFC 822 or ISO 8601 feed date as a naive UTC ISO string, or None when it cannot be parsed"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.replace(microsecond=0).isoformat()
+
+def element_text(parent, tag):
+    child = parent.find(tag)
+    return "".join(child.itertext()).strip() if child is not None else ""
+
+def feed_entry_fields(item):
+    """Title, summary, link, identity key, date and thumbnail of one RSS item or Atom entry"""
+    if item.tag.startswith(ATOM_NS):
+        title = element_text(item, ATOM_NS + "title")
+        summary = element_text(item, ATOM_NS + "summary") or element_text(item, ATOM_NS + "content")
+        link = ""
+        for link_element in item.findall(ATOM_NS + "link"):
+            if link_element.get("rel", "alternate") == "alternate":
+                link = link_element.get("href", "")
+                break
+        guid = element_text(item, ATOM_NS + "id")
+        published = element_text(item, ATOM_NS + "published") or element_text(item, ATOM_NS + "updated")
+    else:
+        ns = RSS1_NS if item.tag.startswith(RSS1_NS) else ""
+        title = element_text(item, ns + "title")
+        summary = element_text(item, ns + "description") or element_text(item, CONTENT_ENCODED)
+        link = element_text(item, ns + "link")
+        guid = element_text(item, "guid") or item.get(RDF_ABOUT, "")
+        published = element_text(item, "pubDate") or element_text(item, DC_DATE)
+    thumbnail = item.find(".//" + MEDIA_THUMBNAIL)
+    return {
+        "key": guid or link or title,
+        "title": title,
+        "summary": summary,
+        "link": link,
+        "published": parse_feed_date(published),
+        "image": thumbnail.get("url") if thumbnail is not None else None
+    }
+
+def stream_feed_entries(content, limit=FEED_MAX_ENTRIES, seen_keys=frozenset()):
+    """
+    Parse RSS 2.0, RSS 1.0 or Atom incrementally, returning (feed title, entries, seen key)
+    
+    The body is fed to a pull parser in chunks and every entry is cleared once read, so
+    only the entries in use are ever materialized. Parsing stops after `limit` entries or
+    at the first entry whose GUID or link is in `seen_keys`: feeds list newest first, so
+    everything from there on was already parsed by the previous fetch. The seen key is the
+    key parsing stopped at, or None. Raises ET.ParseError for malformed XML.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    feed_title = None
+    entries = []
+    for offset in range(0, len(content), FEED_PARSE_CHUNK):
+        parser.feed(content[offset:offset + FEED_PARSE_CHUNK])
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element.tag)
+                continue
+            stack.pop()
+            if element.tag in FEED_ENTRY_TAGS:
+                entry = feed_entry_fields(element)
+                element.clear()
+                if entry["key"] in seen_keys:
+                    FEED_PARSE_STATS["stopped_at_seen"] += 1
+                    return feed_title, entries, entry["key"]
+                entries.append(entry)
+                if len(entries) >= limit:
+                    FEED_PARSE_STATS["stopped_at_limit"] += 1
+                    return feed_title, entries, None
+            elif feed_title is None and stack and stack[-1] in FEED_CONTAINER_TAGS and element.tag.endswith("title"):
+                feed_title = "".join(element.itertext()).strip() or None
+    parser.close()
+    return feed_title, entries, None
+
+def parse_entries_with_feedparser(content, response_headers=None, limit=FEED_MAX_ENTRIES, seen_keys=frozenset()):
+    """Lenient fallback for feeds the XML parser rejects, with the same result shape as stream_feed_entries"""
+    headers = {"content-type": response_headers.get("content-type", "")} if response_headers else None
+    feed = feedparser.parse(content, response_headers=headers)
+    feed_title = feed.feed.get("title") if hasattr(feed, 'feed') else None
+    entries = []
+    for entry in getattr(feed, 'entries', [])[:limit]:
+        link = entry.get("link", "")
+        published = None
+        if entry.get("published_parsed"):
+            try:
+                published = datetime(*entry.published_parsed[:6]).isoformat()
+            except (TypeError, ValueError):
+                pass
+        key = entry.get("id") or link or entry.get("title", "")
+        if key in seen_keys:
+            return feed_title, entries, key
+        entries.append({
+            "key": key,
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": link,
+            "published": published,
+            "image": entry.media_thumbnail[0].get("url") if entry.get("media_thumbnail") else None
+        })
+    return feed_title, entries, None
+
+def parse_feed_articles(content, feed_url, category=None, response_headers=None, seen_keys=frozenset()):
+    """
+    Parse a downloaded feed body into pooled articles
+    
+    Returns (articles, entry keys, seen key); a seen key means parsing stopped at that entry
+    from the previous fetch and the caller should append the articles it has from there on.
+    """
+    try:
+        feed_title, entries, seen_key = stream_feed_entries(content, seen_keys=seen_keys)
+        FEED_PARSE_STATS["streamed"] += 1
+    except ET.ParseError as e:
+        print(f"Falling back to feedparser for {feed_url}: {e}")
+        FEED_PARSE_STATS["feedparser_fallback"] += 1
+        feed_title, entries, seen_key = parse_entries_with_feedparser(content, response_headers, seen_keys=seen_keys)
+    
+    # Check if feed has entries
+    if not entries and seen_key is None:
+        print(f"Warning: No entries found in {feed_url}")
+        return [], [], None
+    
+    # Get source name from feed or fallback to URL
+    domain = feed_url.split('/')[2]
+    source_name = NEWS_SOURCE_NAMES.get(domain, feed_title or domain)
+    source_image = DEFAULT_SOURCE_IMAGES.get(source_name, DEFAULT_SOURCE_IMAGES["default"])
+    
+    articles = []
+    keys = []
+    for entry in entries:
+        try:
+            # Cleaning happens once in make_article
+            articles.append(make_article(
+                title=entry["title"],
+                summary=entry["summary"],
+                link=entry["link"],
+                image_url=entry["image"] or source_image,
+                published_date=entry["published"] or datetime.now().isoformat(),
+                source_name=source_name,
+                source_url=feed_url,
+                category=category
+            ))
+            keys.append(entry["key"])
+        except Exception as e:
+            print(f"Error processing entry from {feed_url}: {e}")
+            continue
+    
+    return articles, keys, seen_key
+
+# Conditional GET validators per feed URL: ETag, Last-Modified, body hash, fetch time and the articles parsed from it
+FEED_VALIDATORS = {}
+FEED_FETCH_STATS = {"shared": 0, "not_modified": 0, "unchanged_body": 0, "parsed": 0, "incremental": 0, "failed": 0, "circuit_open": 0}
+
+def reuse_feed_articles(validator, path):
+    """Return the previously parsed articles of a feed and count which short-circuit was taken"""
+    FEED_FETCH_STATS[path] += 1
+    validator[path] += 1
+    ARTICLE_POOL.touch(validator["articles"])
+    return list(validator["articles"])
+
+async def fetch_rss_feed(feed_url, category=None, max_retries=2):
+    """Fetch articles from a single RSS feed with retry logic, skipping the parse when the feed is unchanged"""
+    validator = FEED_VALIDATORS.get(feed_url)
+    # Fetched moments ago, usually for another category listing the same URL: share that result
+    if validator and time.time() - validator["fetched_at"] < FEED_SHARE_WINDOW:
+        return reuse_feed_articles(validator, "shared")
+    
+    health = get_feed_health(feed_url)
+    if not health.allow_request():
+        FEED_FETCH_STATS["circuit_open"] += 1
+        return []
+    if health.state == "half_open":
+        max_retries = 1  # A single probe decides whether the circuit closes again
+    
+    headers = {}
+    if validator:
+        if validator["etag"]:
+            headers["If-None-Match"] = validator["etag"]
+        if validator["last_modified"]:
+            headers["If-Modified-Since"] = validator["last_modified"]
+    
+    response = await download_feed(feed_url, max_retries=max_retries, headers=headers)
+    if response is None:
+        FEED_FETCH_STATS["failed"] += 1
+        FEED_SCHEDULER.record_failure(feed_url)
+        return []
+    
+    # 304 Not Modified: the server confirmed our copy is current
+    if response.status_code == 304 and validator:
+        validator["fetched_at"] = time.time()
+        FEED_SCHEDULER.record_poll(feed_url, [article.timestamp for article in validator["articles"]], False)
+        return reuse_feed_articles(validator, "not_modified")
+    
+    content = response.content
+    body_hash = hashlib.sha256(content).hexdigest()
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    
+    # Same bytes as last time (server ignores validators): skip the parse
+    if validator and validator["body_hash"] == body_hash:
+        validator["etag"] = etag
+        validator["last_modified"] = last_modified
+        validator["fetched_at"] = time.time()
+        FEED_SCHEDULER.record_poll(feed_url, [article.timestamp for article in validator["articles"]], False)
+        return reuse_feed_articles(validator, "unchanged_body")
+    
+    seen_keys = frozenset(validator["entry_keys"]) if validator else frozenset()
+    try:
+        # Parsing is CPU-bound, keep it off the event loop
+        articles, entry_keys, seen_key = await run_blocking(
+            parse_feed_articles, content, feed_url, category, response.headers, seen_keys
+        )
+    except Exception as e:
+        print(f"Error parsing {feed_url}: {e}")
+        FEED_FETCH_STATS["failed"] += 1
+        FEED_SCHEDULER.record_failure(feed_url)
+        return []
+    
+    if seen_key is not None:
+        # Only the entries above the first one seen last time are new; the previous parse supplies the
+        # rest from that entry on, so entries listed before it last time (since removed) are not kept
+        start = validator["entry_keys"].index(seen_key)
+        end = start + max(0, FEED_MAX_ENTRIES - len(articles))
+        articles = articles + validator["articles"][start:end]
+        entry_keys = entry_keys + validator["entry_keys"][start:end]
+        ARTICLE_POOL.touch(articles)
+        FEED_FETCH_STATS["incremental"] += 1
+    
+    FEED_FETCH_STATS["parsed"] += 1
+    changed = not validator or [article.id for article in articles] != [article.id for article in validator["articles"]]
+    FEED_SCHEDULER.record_poll(feed_url, [article.timestamp for article in articles], changed)
+    FEED_VALIDATORS[feed_url] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "body_hash": body_hash,
+        "articles": articles,
+        "entry_keys": entry_keys,
+        "fetched_at": time.time(),
+        "shared": validator["shared"] if validator else 0,
+        "not_modified": validator["not_modified"] if validator else 0,
+        "unchanged_body": validator["unchanged_body"] if validator else 0,
+        "parsed": (validator["parsed"] if validator else 0) + 1
+    }
+    return articles
+
+@app.get("/api/admin/feeds")
+def get_feed_fetch_stats():
+    """Report feed health, how fetches were answered and parsed, and how often hedges and deadlines kicked in"""
+    return {
+        "fetch_stats": FEED_FETCH_STATS,
+        "parse_stats": FEED_PARSE_STATS,
+        "hedge_stats": FEED_HEDGE_STATS,
+        "deadline_stats": DEADLINE_STATS,
+        "circuits": {
+            state: sum(1 for health in FEED_HEALTH.values() if health.state == state)
+            for state in ("closed", "half_open", "open")
+        },
+        "health": {url: health.snapshot() for url, health in FEED_HEALTH.items()},
+        "feeds": {
+            url: {
+                "etag": validator["etag"],
+                "last_modified": validator["last_modified"],
+                "articles": len(validator["articles"]),
+                "shared": validator["shared"],
+                "not_modified": validator["not_modified"],
+                "unchanged_body": validator["unchanged_body"],
+                "parsed": validator["parsed"],
+                **FEED_SCHEDULER.feed_stats(url)
+            }
+            for url, validator in FEED_VALIDATORS.items()
+        }
+    }
+
+class RequestBudget:
+    """
+    Latency budget of one /api/news request
+    
+    Every stage checks the same deadline: fetching stops early enough to leave the ranking
+    reserve, and whatever is cut short is recorded so the response is flagged as partial.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.deadline = time.time() + seconds
+        self.missed = []
+
+    @classmethod
+    def for_request(cls, budget_ms=None):
+        seconds = budget_ms / 1000 if budget_ms else NEWS_REQUEST_BUDGET
+        return cls(min(max(seconds, 0.1), NEWS_MAX_REQUEST_BUDGET))
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.time())
+
+    def fetch_remaining(self):
+        """Time left for fetching once the ranking reserve (at most a quarter of the budget) is set aside"""
+        return max(0.0, self.remaining() - min(NEWS_RANKING_RESERVE, self.seconds / 4))
+
+    def miss(self, what):
+        self.missed.append(what)
+
+    @property
+    def partial(self):
+        return bool(self.missed)
+
+DEADLINE_STATS = {"partial_results": 0, "late_feeds": 0, "background_completions": 0}
+
+async def fetch_news_api(query, language, category=None, fallback=True):
+    """Fetch news from NewsAPI as a fallback"""
+    if not NEWS_API_KEY or not fallback or MOCK_FEEDS:
+        return []
+    
+    try:
+        # Map our language codes to NewsAPI codes
+        lang_map = {
+            "en": "en",
+            "hi": "hi",
+            "ta": "ta", 
+            "te": "te",
+            "gu": "gu",
+            "mr": "mr"
+        }
+        lang = lang_map.get(language, "en")
         
         # Country code for India
         country = "in"
@@ -936,20 +2810,16 @@ async def fetch_news_api(query, language, category=None, fallback=True):
                 articles = []
                 for item in data["articles"]:
                     # Create article in our standard format
-                    article = {
-                        "id": str(hash(item["title"] + (item["source"]["name"] if item["source"] else "NewsAPI"))),
-                        "title": item["title"] or "",
-                        "summary": item["description"] or "",
-                        "source": {
-                            "name": item["source"]["name"] if item["source"] else "NewsAPI",
-                            "url": "https://newsapi.org"
-                        },
-                        "published_date": item["publishedAt"] or datetime.now().isoformat(),
-                        "link": item["url"] or "",
-                        "image_url": item["urlToImage"] or DEFAULT_SOURCE_IMAGES["default"],
-                        "category": category
-                    }
-                    articles.append(article)
+                    articles.append(make_article(
+                        title=item["title"] or "",
+                        summary=item["description"] or "",
+                        link=item["url"] or "",
+                        image_url=item["urlToImage"] or DEFAULT_SOURCE_IMAGES["default"],
+                        published_date=item["publishedAt"] or datetime.now().isoformat(),
+                        source_name=item["source"]["name"] if item["source"] else "NewsAPI",
+                        source_url="https://newsapi.org",
+                        category=category
+                    ))
                 
                 print(f"Fetched {len(articles)} articles from NewsAPI for {category if category else 'general'}")
                 return articles
@@ -960,65 +2830,80 @@ async def fetch_news_api(query, language, category=None, fallback=True):
         print(f"Error fetching from NewsAPI: {e}")
         return []
 
-def fetch_all_feeds(feed_urls, category=None, max_workers=16):
-    """Fetch articles from multiple RSS feeds concurrently with improved coverage and performance"""
-    all_articles = []
-    successful_feeds = 0
-    start_time = time.time()
-    
-    # Increase the number of feeds to process for better coverage
-    # Process up to 15 feeds (increased from 10) for comprehensive results
-    limited_feeds = feed_urls[:min(15, len(feed_urls))]
+FEED_SET_MAX_FEEDS = 15  # Increased from 10 for comprehensive results
+
+def feed_set_urls(feeds):
+    """The feed URLs fetched for a set: listed duplicates removed, at most FEED_SET_MAX_FEEDS"""
+    return list(dict.fromkeys(feeds))[:FEED_SET_MAX_FEEDS]
+
+async def iter_feed_results(url_categories, budget=None, late=None):
+    """
+    Fetch feeds concurrently and yield (url, articles) as soon as each feed completes
     
-    # Use ThreadPoolExecutor for parallel fetching with increased workers
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all feed fetching tasks
-        future_to_url = {executor.submit(fetch_rss_feed, url, category): url for url in limited_feeds}
-        
+    `url_categories` maps every URL to the category its articles are filed under. With a budget,
+    waiting stops at its fetch deadline. The outstanding fetches are single-flight tasks that
+    keep running and update their feed validators; their URLs are added to `late`.
+    """
+    # Fetch every feed concurrently over the shared connection pool
+    tasks = {
+        asyncio.create_task(FEED_FLIGHTS.do(url, lambda url=url, category=category: fetch_rss_feed(url, category))): url
+        for url, category in url_categories.items()
+    }
+    pending = set(tasks)
+    try:
         # Process results as they complete
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            try:
-                articles = future.result()
+        while pending:
+            timeout = budget.fetch_remaining() if budget is not None else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"Fetch deadline reached with {len(pending)}/{len(tasks)} feeds outstanding")
+                for task in pending:
+                    budget.miss(tasks[task])
+                    if late is not None:
+                        late.append(tasks[task])
+                DEADLINE_STATS["late_feeds"] += len(pending)
+                return
+            for task in done:
+                try:
+                    articles = task.result()
+                except Exception as e:
+                    print(f"Error processing feed results: {e}")
+                    continue
+                yield tasks[task], articles
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def iter_feed_batches(feed_urls, category=None, budget=None, late=None):
+    """Fetch one feed set concurrently and yield each feed's articles as soon as that feed completes"""
+    collected = 0
+    successful_feeds = 0
+    start_time = time.time()
+    urls = feed_set_urls(feed_urls)
+    try:
+        async with aclosing(iter_feed_results(dict.fromkeys(urls, category), budget, late)) as results:
+            async for _, articles in results:
                 if articles:
-                    all_articles.extend(articles)
+                    collected += len(articles)
                     successful_feeds += 1
+                    yield articles
                     # Only break if we have an extremely large number of articles to prevent overload
-                    if len(all_articles) > 200:  # Increased from 100
+                    if collected > 200:  # Increased from 100
                         print(f"Reached article threshold with {successful_feeds} feeds")
-                        break
-            except Exception as e:
-                print(f"Error processing results from {url}: {e}")
-    
-    fetch_time = time.time() - start_time
-    print(f"Successfully fetched from {successful_feeds}/{len(limited_feeds)} feeds in {fetch_time:.2f}s")
-    print(f"Total raw articles collected: {len(all_articles)}")
-    
-    # Improved deduplication with faster title-based matching and source diversity
+                        return
+    finally:
+        print(f"Successfully fetched from {successful_feeds}/{len(urls)} feeds in {time.time() - start_time:.2f}s")
+
+def deduplicate_articles(all_articles):
+    """Collapse near-duplicates into their stories and cap any one source at 20% of the result"""
+    # Near-duplicate deduplication: syndicated copies collapse into their canonical story,
+    # which carries the other outlets as alternate sources
     unique_articles = {}
-    source_counts = {}
     
-    # First pass - identify duplicate titles and track source counts
+    # First pass - resolve every article to its story
     for article in all_articles:
-        # Use normalized title as a deduplication key
-        norm_title = re.sub(r'\W+', ' ', article["title"].lower()).strip()[:60]
-        source_name = article["source"]["name"]
-        
-        # Track source counts for diversity
-        if source_name not in source_counts:
-            source_counts[source_name] = 0
-        source_counts[source_name] += 1
-        
-        # Prefer articles with longer summaries when duplicates are found
-        if norm_title in unique_articles:
-            existing_len = len(unique_articles[norm_title]["summary"])
-            current_len = len(article["summary"])
-            
-            # Replace if current article has a substantially longer summary
-            if current_len > existing_len * 1.5:
-                unique_articles[norm_title] = article
-        else:
-            unique_articles[norm_title] = article
+        canonical = DUPLICATE_INDEX.resolve(article)
+        unique_articles.setdefault(canonical.pool_id, canonical)
     
     # Second pass - ensure source diversity 
     # If any source has more than 20% of articles, reduce its presence
@@ -1026,31 +2911,568 @@ def fetch_all_feeds(feed_urls, category=None, max_workers=16):
     source_limit = max(5, int(len(unique_articles) * 0.2))  # 20% or at least 5
     source_added = {}
     
+    added_ids = set()
+    
     # First add one article from each source to ensure representation
     for article in unique_articles.values():
-        source_name = article["source"]["name"]
+        source_name = article.source_name
         if source_name not in source_added:
             result_articles.append(article)
+            added_ids.add(article.pool_id)
             source_added[source_name] = 1
             
     # Then add remaining articles with source limits
     for article in unique_articles.values():
-        source_name = article["source"]["name"]
-        if article not in result_articles and source_added.get(source_name, 0) < source_limit:
+        source_name = article.source_name
+        if article.pool_id not in added_ids and source_added.get(source_name, 0) < source_limit:
             result_articles.append(article)
+            added_ids.add(article.pool_id)
             source_added[source_name] = source_added.get(source_name, 0) + 1
     
     print(f"Unique articles after deduplication: {len(result_articles)} from {len(source_added)} sources")
-    dedup_time = time.time() - start_time - fetch_time
-    print(f"Deduplication took {dedup_time:.2f}s")
-    
     return result_articles
 
+# Background ingestion state
+INGESTION_STATUS = {"cycles": 0, "last_cycle_started": None, "last_cycle_seconds": None, "polls": 0, "polled_feeds": 0, "rebuilt_sets": 0}
+
+async def ingest_feed_sets(feed_sets, budget=None):
+    """
+    Fetch (category, language, feeds) sets in one concurrent wave and write them to the article store
+    
+    URLs are deduplicated across the sets, so a feed listed by several categories is fetched once
+    and its articles go to every set listing it. With a request's budget, the feeds that arrived
+    in time are stored straight away and complete_feed_set() adds the late feeds and the
+    embeddings in the background. Returns each set's articles, in order.
+    """
+    url_categories = {}
+    for category, _, feeds in feed_sets:
+        for url in feed_set_urls(feeds):
+            url_categories.setdefault(url, category)
+    
+    start_time = time.time()
+    fetched, late = {}, []
+    async for url, articles in iter_feed_results(url_categories, budget, late):
+        fetched[url] = articles
+    successful_feeds = sum(1 for articles in fetched.values() if articles)
+    print(f"Successfully fetched from {successful_feeds}/{len(url_categories)} feeds for {len(feed_sets)} feed sets in {time.time() - start_time:.2f}s")
+    
+    results = []
+    for category, language, feeds in feed_sets:
+        urls = feed_set_urls(feeds)
+        articles = await run_blocking(deduplicate_articles, [article for url in urls for article in fetched.get(url, ())])
+        if budget is None:
+            await store_feed_set(category, language, articles)
+        else:
+            set_late = [url for url in urls if url in late]
+            await store_feed_set(category, language, articles, partial=bool(set_late), index_embeddings=False)
+            FEED_SET_FLIGHTS.start((category, language), lambda: complete_feed_set(category, language, articles, set_late))
+        results.append(articles)
+    return results
+
+async def ingest_feed_set(category, language, feeds, budget=None):
+    """Fetch one (category, language) feed set and write it to the article store"""
+    return (await ingest_feed_sets([(category, language, feeds)], budget))[0]
+
+async def complete_feed_set(category, language, articles, late_urls):
+    """Wait for the feeds a request gave up on, then store the whole feed set with its embeddings"""
+    if late_urls:
+        results = await asyncio.gather(*(
+            FEED_FLIGHTS.do(url, lambda url=url: fetch_rss_feed(url, category)) for url in late_urls
+        ), return_exceptions=True)
+        late_articles = [article for result in results if isinstance(result, list) for article in result]
+        articles = await run_blocking(deduplicate_articles, articles + late_articles)
+        DEADLINE_STATS["background_completions"] += 1
+        print(f"Completed {category}/{language} in the background with {len(late_articles)} articles from {len(late_urls)} late feeds")
+    # Requests waiting on this completion only need the stored articles; embedding continues on its own
+    await store_feed_set(category, language, articles, index_embeddings=False)
+    if VECTOR_STORE_ENABLED:
+        EMBEDDING_INDEX_FLIGHTS.start((category, language), lambda: index_feed_set_embeddings(category, language, articles))
+
+async def store_feed_set(category, language, articles, partial=False, index_embeddings=True):
+    """Write deduplicated articles for a feed set to the article store, the archive and the search indexes"""
+    ARTICLE_STORE.put(category, language, articles, partial)
+    await run_blocking(ARTICLE_ARCHIVE.upsert, category, language, articles)
+    await run_blocking(index_articles_text, articles)
+    if VECTOR_STORE_ENABLED and index_embeddings:
+        await index_feed_set_embeddings(category, language, articles)
+    return articles
+
+async def index_feed_set_embeddings(category, language, articles):
+    try:
+        await index_article_embeddings(articles)
+    except Exception as e:
+        print(f"Error indexing embeddings for {category}/{language}: {e}")
+
+async def run_ingestion_cycle():
+    """Refresh every (category, language) feed set in RSS_FEEDS"""
+    start_time = time.time()
+    INGESTION_STATUS["last_cycle_started"] = datetime.now().isoformat()
+    semaphore = asyncio.Semaphore(INGESTION_CONCURRENCY)
+
+    async def refresh(category, language, feeds):
+        async with semaphore:
+            try:
+                await ingest_feed_set(category, language, feeds)
+            except Exception as e:
+                print(f"Error ingesting {category}/{language}: {e}")
+
+    await asyncio.gather(*(
+        refresh(category, language, feeds)
+        for category, languages in RSS_FEEDS.items()
+        for language, feeds in languages.items()
+    ))
+    await run_blocking(expire_indexed_articles)
+    await run_blocking(ARTICLE_ARCHIVE.prune)
+    await retrain_category_classifier()
+    INGESTION_STATUS["cycles"] += 1
+    INGESTION_STATUS["last_cycle_seconds"] = round(time.time() - start_time, 2)
+    print(f"Ingestion cycle {INGESTION_STATUS['cycles']} completed in {INGESTION_STATUS['last_cycle_seconds']}s")
+
+# Adaptive polling: after the first cycle every feed is refetched on its own schedule
+FEED_POLL_MIN_INTERVAL = float(os.environ.get("FEED_POLL_MIN_INTERVAL", "600"))  # Busy feeds stay as fresh as the old fixed cycle
+FEED_POLL_HOT_INTERVAL = float(os.environ.get("FEED_POLL_HOT_INTERVAL", "120"))  # Floor for heavily queried feed sets, at or above FEED_SHARE_WINDOW
+FEED_POLL_MAX_INTERVAL = float(os.environ.get("FEED_POLL_MAX_INTERVAL", str(6 * 3600)))
+FEED_POLL_GAP_FRACTION = 0.5  # Poll about twice per expected gap between posts
+FEED_POLL_BATCH_WINDOW = 5.0  # Feeds due within this many seconds are polled in the same wave
+FEED_DEMAND_HALF_LIFE = 600.0  # Seconds for a feed set's decayed request count to halve
+FEED_DEMAND_SCALE = 5.0  # Decayed requests for a feed set that halve the poll interval of its feeds
+
+class FeedScheduler:
+    """
+    Per-feed polling schedule kept in a heap of next-due times
+    
+    Each feed's interval is a fraction of its expected gap between posts, estimated from the
+    publish times of its entries and clamped to the configured bounds. Requests for a feed set
+    add to its decayed demand, which shortens the intervals of its feeds (down to the hot
+    floor) and pulls polls that are now overdue forward. Rescheduling pushes a new heap entry; superseded entries are
+    recognised by their version and skipped.
+    """
+
+    def __init__(self, min_interval=FEED_POLL_MIN_INTERVAL, hot_interval=FEED_POLL_HOT_INTERVAL,
+                 max_interval=FEED_POLL_MAX_INTERVAL, default_interval=INGESTION_INTERVAL,
+                 gap_fraction=FEED_POLL_GAP_FRACTION, half_life=FEED_DEMAND_HALF_LIFE, demand_scale=FEED_DEMAND_SCALE):
+        self.min_interval = min_interval
+        self.hot_interval = min(hot_interval, min_interval)
+        self.max_interval = max_interval
+        self.default_interval = min(max(default_interval, min_interval), max_interval)
+        self.gap_fraction = gap_fraction
+        self.half_life = half_life
+        self.demand_scale = demand_scale
+        self._heap = []
+        self._feeds = {}      # url -> schedule state
+        self._set_feeds = {}  # (category, language) -> feed URLs
+        self._demand = {}     # (category, language) -> (decayed request count, updated at)
+        self._wakeup = asyncio.Event()
+        self.polls = 0
+        self.pulled_forward = 0
+
+    def register(self, url, feed_set, now=None):
+        """Add a feed to the schedule as a member of a (category, language) feed set"""
+        now = time.time() if now is None else now
+        state = self._feeds.get(url)
+        if state is None:
+            state = self._feeds[url] = {
+                "sets": [], "base_interval": self.default_interval, "last_polled": now,
+                "next_due": None, "version": 0, "polls": 0, "changes": 0
+            }
+            self._schedule(url, now + self.default_interval)
+        if feed_set not in state["sets"]:
+            state["sets"].append(feed_set)
+            self._set_feeds.setdefault(feed_set, []).append(url)
+
+    def register_feed_sets(self, rss_feeds, now=None):
+        for category, languages in rss_feeds.items():
+            for language, feeds in languages.items():
+                for url in feed_set_urls(feeds):
+                    self.register(url, (category, language), now)
+
+    def feed_sets(self, url):
+        state = self._feeds.get(url)
+        return list(state["sets"]) if state else []
+
+    def _schedule(self, url, due):
+        state = self._feeds[url]
+        state["version"] += 1
+        state["next_due"] = due
+        heapq.heappush(self._heap, (due, state["version"], url))
+
+    def estimate_interval(self, timestamps, now):
+        """A fraction of the mean gap between recent posts, stretched while the feed has been quiet for longer"""
+        recent = sorted(timestamps, reverse=True)[:FEED_MAX_ENTRIES]
+        if len(recent) < 2 or recent[0] - recent[-1] < 1:
+            return self.default_interval  # Too few entries, or undated ones that all got the fetch time
+        gap = (recent[0] - recent[-1]) / (len(recent) - 1)
+        gap = max(gap, (now - recent[0]) / 2)
+        return min(max(gap * self.gap_fraction, self.min_interval), self.max_interval)
+
+    def demand(self, feed_set, now):
+        score, updated_at = self._demand.get(feed_set, (0.0, now))
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+    def interval(self, url, now):
+        """A feed's learned interval, shortened by the demand for its busiest feed set"""
+        state = self._feeds[url]
+        demand = max((self.demand(feed_set, now) for feed_set in state["sets"]), default=0.0)
+        return max(self.hot_interval, state["base_interval"] / (1 + demand / self.demand_scale))
+
+    def note_demand(self, feed_set, now=None):
+        """Count a request for a feed set and pull forward the polls of its feeds that are now overdue"""
+        now = time.time() if now is None else now
+        self._demand[feed_set] = (self.demand(feed_set, now) + 1, now)
+        for url in self._set_feeds.get(feed_set, ()):
+            state = self._feeds[url]
+            if state["next_due"] is None:
+                continue  # Being polled right now
+            interval = self.interval(url, now)
+            due = max(state["last_polled"] + interval, now)
+            # Only move by a meaningful step, so a stream of requests does not flood the heap
+            if due < state["next_due"] - max(1.0, 0.1 * interval):
+                self._schedule(url, due)
+                self.pulled_forward += 1
+                self._wakeup.set()
+
+    def record_poll(self, url, timestamps, changed, now=None):
+        """Learn from a completed fetch of a feed and schedule its next poll"""
+        state = self._feeds.get(url)
+        if state is None:
+            return
+        now = time.time() if now is None else now
+        if timestamps:
+            state["base_interval"] = self.estimate_interval(timestamps, now)
+        state["last_polled"] = now
+        state["polls"] += 1
+        state["changes"] += bool(changed)
+        self.polls += 1
+        self._schedule(url, now + self.interval(url, now))
+
+    def record_failure(self, url, now=None):
+        """Retry a failed feed after its current interval (the circuit breaker decides whether it is actually fetched)"""
+        state = self._feeds.get(url)
+        if state is None:
+            return
+        now = time.time() if now is None else now
+        state["last_polled"] = now
+        self._schedule(url, now + self.interval(url, now))
+
+    def ensure_scheduled(self, url, now=None):
+        """Reschedule a popped feed whose fetch was answered without reaching record_poll (shared or circuit open)"""
+        state = self._feeds.get(url)
+        if state is not None and state["next_due"] is None:
+            now = time.time() if now is None else now
+            self._schedule(url, now + self.interval(url, now))
+
+    def pop_due(self, now=None):
+        """Remove and return every feed due by now (plus the batch window)"""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now + FEED_POLL_BATCH_WINDOW:
+            _, version, url = heapq.heappop(self._heap)
+            state = self._feeds[url]
+            if version == state["version"] and state["next_due"] is not None:
+                state["next_due"] = None
+                due.append(url)
+        return due
+
+    def next_due(self):
+        while self._heap:
+            due, version, url = self._heap[0]
+            if version == self._feeds[url]["version"] and self._feeds[url]["next_due"] is not None:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    async def wait(self, timeout):
+        """Sleep until the timeout or until demand pulls a poll forward"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def feed_stats(self, url, now=None):
+        state = self._feeds.get(url)
+        if state is None:
+            return {}
+        now = time.time() if now is None else now
+        return {
+            "poll_interval": round(self.interval(url, now), 1),
+            "next_poll_in": round(state["next_due"] - now, 1) if state["next_due"] is not None else 0.0,
+            "polls": state["polls"],
+            "changes": state["changes"]
+        }
+
+    def stats(self, now=None):
+        now = time.time() if now is None else now
+        intervals = sorted(self.interval(url, now) for url in self._feeds)
+        return {
+            "feeds": len(intervals),
+            "polls": self.polls,
+            "pulled_forward": self.pulled_forward,
+            "min_interval": round(intervals[0], 1) if intervals else None,
+            "median_interval": round(intervals[len(intervals) // 2], 1) if intervals else None,
+            "max_interval": round(intervals[-1], 1) if intervals else None,
+            "requests_per_hour": round(sum(3600 / interval for interval in intervals), 1),
+            "hot_feed_sets": {
+                f"{category}/{language}": round(score, 2)
+                for (category, language), score in sorted(
+                    ((feed_set, self.demand(feed_set, now)) for feed_set in self._demand),
+                    key=lambda item: item[1], reverse=True
+                )[:5]
+                if score >= 0.5
+            }
+        }
+
+FEED_SCHEDULER = FeedScheduler()
+FEED_SCHEDULER.register_feed_sets(RSS_FEEDS)
+
+async def poll_feeds(urls):
+    """Fetch due feeds in one wave and rebuild the feed sets whose feeds returned new articles"""
+    before = {url: [article.id for article in FEED_VALIDATORS[url]["articles"]] if url in FEED_VALIDATORS else None for url in urls}
+    url_categories = {url: FEED_SCHEDULER.feed_sets(url)[0][0] for url in urls}
+    changed_sets = set()
+    try:
+        async for url, articles in iter_feed_results(url_categories):
+            validator = FEED_VALIDATORS.get(url)
+            if validator is not None and [article.id for article in validator["articles"]] != before[url]:
+                changed_sets.update(FEED_SCHEDULER.feed_sets(url))
+    finally:
+        for url in urls:
+            FEED_SCHEDULER.ensure_scheduled(url)
+    for category, language in changed_sets:
+        await rebuild_feed_set(category, language)
+    INGESTION_STATUS["polls"] += 1
+    INGESTION_STATUS["polled_feeds"] += len(urls)
+    INGESTION_STATUS["rebuilt_sets"] += len(changed_sets)
+    print(f"Polled {len(urls)} due feeds, rebuilt {len(changed_sets)} feed sets")
+
+async def rebuild_feed_set(category, language):
+    """Store a feed set again from the latest articles of each of its feeds, without fetching"""
+    raw_articles = [
+        article
+        for url in feed_set_urls(RSS_FEEDS[category][language])
+        for article in (FEED_VALIDATORS[url]["articles"] if url in FEED_VALIDATORS else ())
+    ]
+    articles = await run_blocking(deduplicate_articles, raw_articles)
+    return await store_feed_set(category, language, articles)
+
+async def ingestion_loop():
+    """Keep the article store fresh: one full cycle, then every feed polled on its own schedule"""
+    while True:
+        try:
+            await run_ingestion_cycle()
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in ingestion cycle: {e}")
+        await asyncio.sleep(INGESTION_INTERVAL)
+    
+    last_maintenance = time.time()
+    while True:
+        try:
+            due = FEED_SCHEDULER.pop_due()
+            if due:
+                await poll_feeds(due)
+            if time.time() - last_maintenance >= INGESTION_INTERVAL:
+                await run_blocking(expire_indexed_articles)
+                await run_blocking(ARTICLE_ARCHIVE.prune)
+                await retrain_category_classifier()
+                last_maintenance = time.time()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error polling feeds: {e}")
+        now = time.time()
+        next_due = FEED_SCHEDULER.next_due()
+        wake_at = last_maintenance + INGESTION_INTERVAL
+        if next_due is not None:
+            wake_at = min(wake_at, next_due)
+        await FEED_SCHEDULER.wait(max(wake_at - now, 0.0))
+
+async def get_feed_sets_articles(feed_sets, budget=None):
+    """Read feed sets from the article store, fetching the ones never ingested live in one wave"""
+    found, missing = {}, []
+    for category, language, feeds in feed_sets:
+        articles = ARTICLE_STORE.get(category, language)
+        if articles is None:
+            missing.append((category, language, feeds))
+            continue
+        if budget is not None and ARTICLE_STORE.is_partial(category, language):
+            # Late feeds of an earlier request with a tighter budget are still arriving: wait for them within this one
+            completion = FEED_SET_FLIGHTS.running((category, language))
+            if completion is not None and budget.fetch_remaining() > 0:
+                try:
+                    await asyncio.wait_for(asyncio.shield(completion), budget.fetch_remaining())
+                except Exception:
+                    pass  # Timed out or failed: the set stays partial and is reported as such
+                articles = ARTICLE_STORE.get(category, language)
+            if ARTICLE_STORE.is_partial(category, language):
+                budget.miss(f"{category}/{language}")
+        found[(category, language)] = articles
+    if missing:
+        print(f"Article store has no {', '.join(f'{c}/{l}' for c, l, _ in missing)} yet, fetching live")
+        for (category, language, _), articles in zip(missing, await ingest_feed_sets(missing, budget)):
+            found[(category, language)] = list(articles)
+    return [found[(category, language)] for category, language, _ in feed_sets]
+
+@app.get("/api/admin/ingestion")
+def get_ingestion_status():
+    """Report background ingestion progress, the polling schedule and article store contents"""
+    return {
+        "enabled": INGESTION_ENABLED,
+        "mock_feeds": MOCK_FEEDS,
+        **INGESTION_STATUS,
+        "pool": {"articles": len(ARTICLE_POOL), "sources": len(SOURCES), "categories": len(CATEGORIES)},
+        "executor": {"workers": BLOCKING_WORKERS, **BLOCKING_STATS},
+        "completions": FEED_SET_FLIGHTS.stats(),
+        "embedding_completions": EMBEDDING_INDEX_FLIGHTS.stats(),
+        "schedule": FEED_SCHEDULER.stats(),
+        "store": ARTICLE_STORE.stats()
+    }
+
+# Local query -> category classifier trained on ingested articles, labelled by their feed set
+CATEGORY_CONFIDENCE = float(os.environ.get("CATEGORY_CONFIDENCE", "0.5"))  # Below this the classifier defers to Gemini
+CATEGORY_RETRAIN_INTERVAL = int(os.environ.get("CATEGORY_RETRAIN_INTERVAL", "3600"))  # Seconds between retrains
+CATEGORY_MEMO_ITEMS = 10000
+CATEGORY_MIN_DOCUMENTS = 200  # Too few articles to learn categories from
+
+class CategoryClassifier:
+    """
+    TF-IDF + logistic regression over article titles and summaries, predicting the RSS_FEEDS category
+    
+    Training swaps in a new model atomically, so predictions keep using the previous one while
+    a retrain runs on a worker thread. Decisions are memoized per normalized query, including
+    the ones that fell back to Gemini; the memo is cleared whenever the model changes.
+    """
+
+    def __init__(self, confidence=CATEGORY_CONFIDENCE, memo_items=CATEGORY_MEMO_ITEMS):
+        self.confidence = confidence
+        self.memo_items = memo_items
+        self._model = None  # (vectorizer, classifier)
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.trained_at = None
+        self.stats = {"documents": 0, "classes": 0, "holdout_accuracy": None, "train_seconds": None,
+                      "memo_hits": 0, "local": 0, "fallbacks": 0}
+
+    @staticmethod
+    def normalize(query):
+        return " ".join(tokenize(query))
+
+    def train(self, labelled_articles):
+        """Fit a new model on (category, article) pairs; returns False when there is too little data"""
+        if not SKLEARN_AVAILABLE or len(labelled_articles) < CATEGORY_MIN_DOCUMENTS:
+            return False
+        start = time.time()
+        texts = [f"{article.title_lower} {article.summary_lower}" for _, article in labelled_articles]
+        labels = [category for category, _ in labelled_articles]
+        if len(set(labels)) < 2:
+            return False
+        
+        # Every tenth document is held out to report accuracy, then the final model uses everything
+        holdout_idx = list(range(0, len(texts), 10))
+        holdout = set(holdout_idx)
+        train_idx = [i for i in range(len(texts)) if i not in holdout]
+        vectorizer, classifier = self._fit([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        predicted = classifier.predict(vectorizer.transform([texts[i] for i in holdout_idx]))
+        accuracy = float(np.mean([p == labels[i] for p, i in zip(predicted, holdout_idx)]))
+        model = self._fit(texts, labels)
+        
+        with self._lock:
+            self._model = model
+            self._memo.clear()
+            self.trained_at = time.time()
+            self.stats.update(documents=len(texts), classes=len(model[1].classes_),
+                              holdout_accuracy=round(accuracy, 3), train_seconds=round(time.time() - start, 2))
+        print(f"Trained category classifier on {len(texts)} articles in {self.stats['train_seconds']}s "
+              f"(holdout accuracy {accuracy:.3f})")
+        return True
+
+    @staticmethod
+    def _fit(texts, labels):
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_features=200000, sublinear_tf=True)
+        classifier = LogisticRegression(max_iter=300, C=5.0)
+        classifier.fit(vectorizer.fit_transform(texts), labels)
+        return vectorizer, classifier
+
+    def predict(self, query):
+        """Return (category, confidence) from the local model, or (None, 0.0) before the first training"""
+        model = self._model
+        if model is None:
+            return None, 0.0
+        vectorizer, classifier = model
+        probabilities = classifier.predict_proba(vectorizer.transform([self.normalize(query)]))[0]
+        best = int(np.argmax(probabilities))
+        return classifier.classes_[best], float(probabilities[best])
+
+    def memo_get(self, query):
+        key = self.normalize(query)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.stats["memo_hits"] += 1
+                return True, self._memo[key]
+        return False, None
+
+    def memo_put(self, query, category):
+        with self._lock:
+            self._memo[self.normalize(query)] = category
+            while len(self._memo) > self.memo_items:
+                self._memo.popitem(last=False)
+
+    def summary(self):
+        with self._lock:
+            return {
+                "available": SKLEARN_AVAILABLE,
+                "trained": self._model is not None,
+                "trained_at": datetime.fromtimestamp(self.trained_at).isoformat() if self.trained_at else None,
+                "confidence_threshold": self.confidence,
+                "memo_items": len(self._memo),
+                **self.stats
+            }
+
+CATEGORY_CLASSIFIER = CategoryClassifier()
+
+async def retrain_category_classifier(force=False):
+    """Retrain on the article store off the event loop when the model is missing or older than the interval"""
+    trained_at = CATEGORY_CLASSIFIER.trained_at
+    if not force and trained_at is not None and time.time() - trained_at < CATEGORY_RETRAIN_INTERVAL:
+        return False
+    try:
+        return await run_blocking(CATEGORY_CLASSIFIER.train, ARTICLE_STORE.labelled_articles())
+    except Exception as e:
+        print(f"Error training category classifier: {e}")
+        return False
+
+@app.get("/api/admin/classifier")
+def get_classifier_stats():
+    """Report category classifier training state, accuracy and how queries were decided"""
+    return CATEGORY_CLASSIFIER.summary()
+
 async def determine_category_for_query(query):
-    """Use Gemini to determine the best category for a query"""
+    """Pick the best category for a query: memo, then the local classifier, then Gemini when it is unsure"""
     if not query:
         return None
+    found, category = CATEGORY_CLASSIFIER.memo_get(query)
+    if found:
+        return category
     
+    category, confidence = await run_blocking(CATEGORY_CLASSIFIER.predict, query)
+    if category is not None and confidence >= CATEGORY_CLASSIFIER.confidence:
+        CATEGORY_CLASSIFIER.stats["local"] += 1
+        print(f"Classifier chose category '{category}' ({confidence:.2f}) for query '{query}'")
+    elif MOCK_FEEDS:  # Offline mode never calls Gemini
+        category = None
+    else:
+        CATEGORY_CLASSIFIER.stats["fallbacks"] += 1
+        category = await determine_category_with_gemini(query)
+        if category is None:
+            return None  # Not memoized, so a Gemini error is retried on the next request
+    CATEGORY_CLASSIFIER.memo_put(query, category)
+    return category
+
+async def determine_category_with_gemini(query):
+    """Use Gemini to determine the best category for a query"""
     try:
         prompt = f"""Determine the most relevant category for this search query from the list below:
 Query: "{query}"
@@ -1060,7 +3482,7 @@ Available categories:
 
 Return ONLY the single most relevant category name from the list.
 """
-        response = model.generate_content(prompt)
+        response = await run_blocking(model.generate_content, prompt)
         category = response.text.strip()
         
         # Validate the category
@@ -1074,48 +3496,196 @@ Return ONLY the single most relevant category name from the list.
         print(f"Error determining category with Gemini: {e}")
         return None
 
+class InvertedIndex:
+    """
+    Incremental positional inverted index over article titles and summaries, ranked with BM25F
+    
+    Postings map term -> {doc: (title positions, summary positions)}, so a query only
+    touches the postings of its own terms. Positions answer phrase and proximity checks
+    without rescanning article text.
+    """
+
+    FIELDS = ("title", "summary")
+
+    def __init__(self, weights=(2.5, 1.0), b=(0.5, 0.75), k1=1.2):
+        self.weights = weights
+        self.b = b
+        self.k1 = k1
+        self._postings = {}
+        self._doc_terms = {}
+        self._lengths = {}
+        self._timestamps = {}
+        self._total_lengths = [0, 0]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc):
+        return doc in self._lengths
+
+    def add(self, doc, title_tokens, summary_tokens, timestamp=None):
+        """Index one document from its pre-tokenized fields; re-adding an indexed doc is a no-op"""
+        with self._lock:
+            if doc in self._lengths:
+                return
+            field_tokens = (title_tokens, summary_tokens)
+            positions = {}
+            for field, tokens in enumerate(field_tokens):
+                for position, term in enumerate(tokens):
+                    positions.setdefault(term, ([], []))[field].append(position)
+            for term, (title_positions, summary_positions) in positions.items():
+                self._postings.setdefault(term, {})[doc] = (tuple(title_positions), tuple(summary_positions))
+            self._doc_terms[doc] = tuple(positions)
+            self._lengths[doc] = (len(field_tokens[0]), len(field_tokens[1]))
+            self._timestamps[doc] = timestamp if timestamp is not None else time.time()
+            self._total_lengths[0] += len(field_tokens[0])
+            self._total_lengths[1] += len(field_tokens[1])
+
+    def remove(self, doc):
+        with self._lock:
+            lengths = self._lengths.pop(doc, None)
+            if lengths is None:
+                return
+            for term in self._doc_terms.pop(doc):
+                postings = self._postings[term]
+                del postings[doc]
+                if not postings:
+                    del self._postings[term]
+            del self._timestamps[doc]
+            self._total_lengths[0] -= lengths[0]
+            self._total_lengths[1] -= lengths[1]
+
+    def expire(self, before_timestamp):
+        """Remove every document published before the given epoch time"""
+        with self._lock:
+            expired = [doc for doc, timestamp in self._timestamps.items() if timestamp < before_timestamp]
+        for doc in expired:
+            self.remove(doc)
+        return len(expired)
+
+    def search(self, terms, allowed=None):
+        """
+        Score documents containing any of the query terms
+        
+        Returns {doc: (bm25f score, phrase bonus)}. allowed restricts scoring to a subset
+        of docs; whichever of the postings list or the subset is smaller is iterated.
+        """
+        unique_terms = list(dict.fromkeys(terms))
+        with self._lock:
+            doc_count = len(self._lengths)
+            if not doc_count or not unique_terms:
+                return {}
+            average_lengths = [max(total / doc_count, 1.0) for total in self._total_lengths]
+            scores = {}
+            matched_terms = {}
+            for term in unique_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = np.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                if allowed is not None and len(allowed) < len(postings):
+                    entries = ((doc, postings[doc]) for doc in allowed if doc in postings)
+                else:
+                    entries = postings.items()
+                for doc, field_positions in entries:
+                    if allowed is not None and doc not in allowed:
+                        continue
+                    lengths = self._lengths[doc]
+                    weighted_tf = 0.0
+                    for field in (0, 1):
+                        if field_positions[field]:
+                            normalizer = 1 - self.b[field] + self.b[field] * lengths[field] / average_lengths[field]
+                            weighted_tf += self.weights[field] * len(field_positions[field]) / normalizer
+                    scores[doc] = scores.get(doc, 0.0) + idf * weighted_tf / (self.k1 + weighted_tf)
+                    matched_terms[doc] = matched_terms.get(doc, 0) + 1
+            
+            results = {}
+            for doc, score in scores.items():
+                bonus = 0.0
+                if len(unique_terms) > 1 and matched_terms[doc] == len(unique_terms):
+                    bonus += 0.1  # Every query word appears somewhere
+                    if len(terms) > 1 and self._has_sequence(doc, terms):
+                        bonus += 0.3  # Exact phrase match (strong signal)
+                    else:
+                        # Partial phrase matches: adjacent pairs and triplets
+                        for size, pair_bonus in ((2, 0.1), (3, 0.15)):
+                            for i in range(len(terms) - size + 1):
+                                if self._has_sequence(doc, terms[i:i + size]):
+                                    bonus += pair_bonus
+                results[doc] = (float(score), bonus)
+            return results
+
+    def _has_sequence(self, doc, sequence):
+        """True if the terms occur consecutively in either field of a document"""
+        for field in (0, 1):
+            position_sets = []
+            for term in sequence:
+                field_positions = self._postings.get(term, {}).get(doc)
+                if not field_positions or not field_positions[field]:
+                    break
+                position_sets.append(set(field_positions[field]))
+            else:
+                if any(all(start + offset in position_sets[offset] for offset in range(1, len(sequence)))
+                       for start in position_sets[0]):
+                    return True
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {"documents": len(self._lengths), "terms": len(self._postings)}
+
+# Text index over every ingested article, keyed by article ID
+TEXT_INDEX = InvertedIndex()
+
+def index_article_text(article):
+    """Add an article to the text index if needed and return its document key"""
+    if article.id not in TEXT_INDEX:
+        TEXT_INDEX.add(article.id, article.title_tokens, article.summary_tokens, article.timestamp)
+    return article.id
+
+def index_articles_text(articles):
+    for article in articles:
+        index_article_text(article)
+
+def reindex_edited_article(article):
+    """Bring the search indexes up to date after a pooled article's title or summary was edited"""
+    if article.id in TEXT_INDEX:
+        TEXT_INDEX.remove(article.id)
+        index_article_text(article)
+    # The stale vector leaves the vector store; the next ingestion embeds the new text under its new content hash
+    ARTICLE_INDEX.remove([article.id])
+
 # Gemini 1.5 Flash inspired search enhancement
 def advanced_semantic_search(articles, query, threshold=0.03):  # Lower threshold for more matches
     """
-    Supercharged search function that intelligently balances speed with comprehensive results
+    Rank articles for a query with the BM25F text index, plus phrase, category and recency features
+    
+    Only articles sharing at least one word with the query are scored, so the cost
+    follows the matching postings rather than the number of articles. Returns a list
+    of (article, relevance) pairs, best first, and the match count.
     """
     if not query:
-        return articles, 0
+        return [(article, None) for article in articles], 0
     
     start_time = time.time()
     
     # Normalize the query
     query_lower = query.lower()
-    query_terms = set(query_lower.split())  # Using a set for faster lookups
-    
-    # Fast pre-filtering based on title match
-    fast_matches = []
-    remaining_articles = []
-    
-    for article in articles:
-        title_lower = article["title"].lower()
-        
-        # Quick check if any query term is in the title - fast path
-        if any(term in title_lower for term in query_terms):
-            # Calculate how many query terms match and their position (earlier = better)
-            matched_terms = sum(1 for term in query_terms if term in title_lower)
-            earliest_pos = min((title_lower.find(term) for term in query_terms if term in title_lower), default=999)
-            
-            # Improved relevance scoring based on match quality
-            relevance = 0.7 + (0.2 * (matched_terms / len(query_terms))) - (0.1 * (earliest_pos / 100))
-            article["relevance"] = min(max(relevance, 0.1), 0.99)  # Keep between 0.1 and 0.99
-            fast_matches.append(article)
-        else:
-            remaining_articles.append(article)
+    query_terms = tokenize(query_lower)
+    if not query_terms:
+        return [], 0
     
-    # Check if we have enough fast matches (more than before)
-    if len(fast_matches) >= 25:  # Increased from 20
-        print(f"Fast path search found {len(fast_matches)} matches in {time.time() - start_time:.3f}s")
-        fast_matches.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-        return fast_matches, len(fast_matches)
+    # Ingested articles are already indexed; anything else (e.g. NewsAPI results) is added now
+    positions = {}
+    for position, article in enumerate(articles):
+        positions.setdefault(index_article_text(article), []).append(position)
     
-    # Otherwise proceed with more detailed matching
-    scored_articles = []
+    matches = TEXT_INDEX.search(query_terms, allowed=positions)
+    if not matches:
+        print(f"Full semantic search found 0 matches in {time.time() - start_time:.3f}s")
+        return [], 0
+    top_score = max(score for score, _ in matches.values())
     
     # Smart category detection for contextual search
     query_categories = {
@@ -1135,104 +3705,363 @@ def advanced_semantic_search(articles, query, threshold=0.03):  # Lower threshol
                   "patient", "medicine", "cure", "symptom"]
     }
     
-    # Find which categories the query might belong to
-    detected_categories = []
+    # Map detected query categories to article categories
+    category_mapping = {
+        "sports": ["sports", "cricket", "football"],
+        "tech": ["tech", "programming", "android", "apple", "ios development"],
+        "politics": ["news", "world"],
+        "finance": ["business & economy", "personal finance"],
+        "entertainment": ["movies", "television", "music"],
+        "science": ["science", "space"],
+        "health": ["health"]
+    }
+    
+    # Find which article categories the query might belong to
+    boosted_categories = set()
     for category, terms in query_categories.items():
         if any(term in query_lower for term in terms):
-            detected_categories.append(category)
+            boosted_categories.update(category_mapping.get(category, []))
     
-    # Process each article with the enhanced algorithm
-    for article in remaining_articles:
-        title_lower = article["title"].lower()
-        summary_lower = article["summary"].lower() if article.get("summary") else ""
-        article_text = title_lower + " " + summary_lower
-        
-        # Quick scoring system
-        score = 0.0
-        
-        # Title matches are important
-        title_matches = sum(1 for term in query_terms if term in title_lower)
-        if title_matches > 0:
-            score += 0.4 * (title_matches / len(query_terms))
-        
-        # Content match
-        summary_matches = sum(1 for term in query_terms if term in summary_lower)
-        if summary_matches > 0:
-            score += 0.3 * (summary_matches / len(query_terms))
+    # Improved threshold calculation - adaptive based on query length
+    adaptive_threshold = threshold * (0.8 if len(query_terms) > 3 else 1.0)
+    now = time.time()
+    ranked = []
+    
+    for key, (text_score, phrase_bonus) in matches.items():
+        for position in positions[key]:
+            article = articles[position]
             
-        # Exact phrase match in either title or summary (strong signal)
-        if query_lower in article_text:
-            score += 0.5
+            # Text relevance relative to the best match, plus phrase and proximity signals
+            score = 0.6 * text_score / top_score + phrase_bonus
             
-        # Check for all words appearing in any order
-        if all(term in article_text for term in query_terms):
-            score += 0.3
+            # Category match bonus
+            article_category = (article.category or "").lower()
+            if article_category and any(mapped in article_category for mapped in boosted_categories):
+                score += 0.25
             
-        # Partial phrase matches (more comprehensive)
-        words_in_query = query_lower.split()
-        if len(words_in_query) > 1:
-            # Check for adjacent word pairs
-            for i in range(len(words_in_query) - 1):
-                partial_phrase = " ".join(words_in_query[i:i+2])
-                if partial_phrase in article_text:
-                    score += 0.15
+            # Recency bonus (newer articles score slightly higher)
+            age_in_days = int((now - article.timestamp) // 86400)
+            if 0 <= age_in_days <= 7:  # Articles less than a week old
+                score += max(0.1 - (age_in_days * 0.01), 0)
             
-            # Check for triplets in longer queries
-            if len(words_in_query) > 2:
-                for i in range(len(words_in_query) - 2):
-                    partial_phrase = " ".join(words_in_query[i:i+3])
-                    if partial_phrase in article_text:
-                        score += 0.2
-        
-        # Category match bonus - more sophisticated matching
-        article_category = article.get("category", "").lower()
-        
-        # Map detected query categories to article categories
-        category_mapping = {
-            "sports": ["sports", "cricket", "football"],
-            "tech": ["tech", "programming", "android", "apple", "ios development"],
-            "politics": ["news", "world"],
-            "finance": ["business & economy", "personal finance"],
-            "entertainment": ["movies", "television", "music"],
-            "science": ["science", "space"],
-            "health": ["health"]
-        }
-        
-        for detected in detected_categories:
-            mapped_categories = category_mapping.get(detected, [])
-            if article_category and any(mapped_cat.lower() in article_category for mapped_cat in mapped_categories):
-                score += 0.25  # Increased from 0.2
-        
-        # Recency bonus (newer articles score slightly higher)
+            # Keep article if it meets threshold
+            if score > adaptive_threshold:
+                ranked.append((article, score))
+    
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    
+    print(f"Full semantic search found {len(ranked)} matches in {time.time() - start_time:.3f}s")
+    
+    return ranked, len(ranked)
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: an in-memory LRU in front of a SQLite table that survives restarts"""
+
+    def __init__(self, path, memory_items, disk_bytes):
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._db = None
         try:
-            pub_date = article.get("published_date", "")
-            if pub_date:
-                # Parse the date, assuming ISO format
-                pub_datetime = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-                age_in_days = (datetime.now() - pub_datetime).days
-                # Small bonus for recent articles (up to 0.1)
-                if age_in_days <= 7:  # Articles less than a week old
-                    score += max(0.1 - (age_in_days * 0.01), 0)
-        except Exception:
-            pass  # Skip if date parsing fails
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            self._db.commit()
+            self._stored_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Embedding disk cache unavailable ({e}), using memory only")
+            self._db = None
+            self._stored_bytes = 0
+
+    @staticmethod
+    def key(content_hash, model_name):
+        """Cache key for a content hash embedded by a given model"""
+        return hashlib.sha256(f"{model_name}\0{content_hash}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Look up embeddings for many keys, returning {key: vector} for the ones that are cached"""
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.stats["memory_hits"] += 1
+                else:
+                    missing.append(key)
             
-        # Improved threshold calculation - adaptive based on query length
-        adaptive_threshold = threshold * (0.8 if len(query_terms) > 3 else 1.0)
+            if missing and self._db is not None:
+                now = time.time()
+                for start in range(0, len(missing), 500):  # Stay under SQLite's bound-parameter limit
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+                    if rows:
+                        self._db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key, _ in rows])
+                self._db.commit()
+                self.stats["disk_hits"] += sum(1 for key in missing if key in found)
             
-        # Keep article if it meets threshold
-        if score > adaptive_threshold:
-            article["relevance"] = score
-            scored_articles.append(article)
-    
-    # Combine results and sort
-    combined_results = fast_matches + scored_articles
-    combined_results.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+            self.stats["misses"] += sum(1 for key in missing if key not in found)
+        return found
+
+    def put_many(self, vectors):
+        """Store {key: vector} in both tiers"""
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            rows = []
+            for key, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes(), vector.nbytes, now))
+            
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)", rows
+                )
+                self._db.commit()
+                self._stored_bytes += sum(row[2] for row in rows)
+                if self._stored_bytes > self.disk_bytes:
+                    self._evict_disk()
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Drop least recently used rows until the table is back under 90% of its byte budget"""
+        target = int(self.disk_bytes * 0.9)
+        self._stored_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        while self._stored_bytes > target:
+            rows = self._db.execute("SELECT key, size FROM embeddings ORDER BY last_used LIMIT 1000").fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append((key,))
+                self._stored_bytes -= size
+                if self._stored_bytes <= target:
+                    break
+            self._db.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+            self.stats["evictions"] += len(evicted)
+        self._db.commit()
+
+    def summary(self):
+        with self._lock:
+            return {
+                **self.stats,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._stored_bytes,
+                "disk_budget_bytes": self.disk_bytes
+            }
+
+EMBEDDING_CACHE = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MEMORY_ITEMS, EMBEDDING_CACHE_DISK_BYTES)
+
+@app.get("/api/admin/embeddings")
+def get_embedding_cache_stats():
+    """Report embedding cache hit rates and disk usage"""
+    return {
+        "model": EMBEDDING_SCHEDULER.model_name,
+        "cache": EMBEDDING_CACHE.summary(),
+        "scheduler": EMBEDDING_SCHEDULER.stats
+    }
+
+def article_embedding_text(article):
+    """Text that represents an article for semantic matching"""
+    return article.title + ". " + article.summary
+
+# Embedding scheduler settings
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "fake" if MOCK_FEEDS else "gemini")
+EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", "100"))  # Gemini accepts up to 100 texts per batch call
+EMBEDDING_MAX_CONCURRENT_BATCHES = int(os.environ.get("EMBEDDING_MAX_CONCURRENT_BATCHES", "4"))
+EMBEDDING_REQUESTS_PER_MINUTE = float(os.environ.get("EMBEDDING_REQUESTS_PER_MINUTE", "300"))
+EMBEDDING_BATCH_LINGER = 0.01  # Seconds to wait for texts from concurrent requests to join a batch
+SEMANTIC_TOP_K = int(os.environ.get("SEMANTIC_TOP_K", "200"))  # Articles kept from a semantic ranking
+
+class GeminiEmbeddingBackend:
+    """Batch embedding calls against the Gemini API"""
+
+    def __init__(self, model_name=EMBEDDING_MODEL):
+        self.name = model_name
+
+    def embed_batch(self, texts):
+        result = genai.embed_content(model=self.name, content=list(texts))
+        return np.asarray(result["embedding"], dtype=np.float32)
+
+class FakeEmbeddingBackend:
+    """Deterministic offline embeddings with a simulated per-call latency, for tests and benchmarks"""
+
+    def __init__(self, dims=768, latency=0.05):
+        self.name = f"fake-{dims}"
+        self.dims = dims
+        self.latency = latency
+
+    def embed_batch(self, texts):
+        time.sleep(self.latency)
+        vectors = np.zeros((len(texts), self.dims), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # Hash words into buckets so texts that share words get similar vectors
+            for word in tokenize(text):
+                bucket = int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16)
+                vectors[row, bucket % self.dims] += 1.0 if bucket & (1 << 31) else -1.0
+        return vectors
+
+class TokenBucket:
+    """Async token bucket that paces calls to a requests-per-minute budget"""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, min(per_minute / 60.0 * 5, per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class EmbeddingScheduler:
+    """Merge embedding requests into multi-text batch calls, run a bounded number concurrently, respect the RPM budget
+
+    Texts requested by concurrent searches are queued together, identical pending
+    texts share one result, and a dispatcher cuts the queue into batches.
+    """
+
+    def __init__(self, backend, batch_size=EMBEDDING_BATCH_SIZE, max_concurrent=EMBEDDING_MAX_CONCURRENT_BATCHES,
+                 requests_per_minute=EMBEDDING_REQUESTS_PER_MINUTE, linger=EMBEDDING_BATCH_LINGER):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.linger = linger
+        self.stats = {"texts": 0, "merged": 0, "batches": 0, "errors": 0}
+        self._loop = None
+
+    @property
+    def model_name(self):
+        return self.backend.name
+
+    def _bind_loop(self):
+        """Create the asyncio primitives on the running loop (the app and benchmarks may use different loops)"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queue = []
+            self._pending = {}
+            self._dispatcher = None
+            self._batches = set()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._bucket = TokenBucket(self.requests_per_minute)
+
+    async def embed(self, texts):
+        """Embed many texts, returning one float32 vector per text in order"""
+        if not texts:
+            return []
+        self._bind_loop()
+        futures = []
+        for text in texts:
+            future = self._pending.get(text)
+            if future is None:
+                future = self._loop.create_future()
+                self._pending[text] = future
+                self._queue.append(text)
+            else:
+                self.stats["merged"] += 1
+            futures.append(future)
+        self.stats["texts"] += len(texts)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        # Shielded: a caller that gives up at its deadline must not cancel texts other callers share
+        return list(await asyncio.gather(*(asyncio.shield(future) for future in futures)))
+
+    async def _dispatch(self):
+        # The dispatcher exits as soon as it sees an empty queue, with no await in between,
+        # so texts queued later always find it done and start a new one
+        while self._queue:
+            # Give concurrent requests a moment to add their texts to this batch
+            await asyncio.sleep(self.linger)
+            batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            await self._bucket.acquire()
+            vectors = await run_blocking(self.backend.embed_batch, batch)
+            self.stats["batches"] += 1
+            for text, vector in zip(batch, vectors):
+                future = self._pending.pop(text, None)
+                if future is not None and not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            self.stats["errors"] += 1
+            for text in batch:
+                future = self._pending.pop(text, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+        finally:
+            self._semaphore.release()
+
+def create_embedding_backend(name=EMBEDDING_BACKEND):
+    if name == "fake":
+        return FakeEmbeddingBackend()
+    return GeminiEmbeddingBackend()
+
+EMBEDDING_SCHEDULER = EmbeddingScheduler(create_embedding_backend())
+
+async def get_article_embeddings(articles, extra_texts=()):
+    """
+    Return (matrix, extra_vectors) for a list of normalized articles
     
-    print(f"Full semantic search found {len(combined_results)} matches in {time.time() - start_time:.3f}s")
+    matrix holds one normalized float32 embedding row per article. Cached vectors are
+    reused, the rest are embedded in shared batches together with extra_texts (e.g. the
+    search query).
+    """
+    model_name = EMBEDDING_SCHEDULER.model_name
+    keys = [EMBEDDING_CACHE.key(article.content_hash, model_name) for article in articles]
+    vectors = await run_blocking(EMBEDDING_CACHE.get_many, keys)
+    missing = {}
+    for article, key in zip(articles, keys):
+        if key not in vectors:
+            missing[key] = article_embedding_text(article)
     
-    return combined_results, len(combined_results)
+    extra_vectors, missing_vectors = await asyncio.gather(
+        EMBEDDING_SCHEDULER.embed(list(extra_texts)),
+        EMBEDDING_SCHEDULER.embed(list(missing.values()))
+    )
+    if missing_vectors:
+        # Cache vectors pre-normalized so similarity is a plain dot product
+        new_embeddings = dict(zip(missing.keys(), normalize_rows(np.vstack(missing_vectors))))
+        await run_blocking(EMBEDDING_CACHE.put_many, new_embeddings)
+        vectors.update(new_embeddings)
+    matrix = np.vstack([vectors[key] for key in keys]) if keys else None
+    return matrix, extra_vectors
 
-def gemini_enhanced_search(articles, query):
+async def gemini_enhanced_search(articles, query):
     """
     Harness the power of Gemini 1.5 Flash for intelligent semantic understanding
     This function uses Gemini's embeddings for enhanced semantic search with real NLP capabilities
@@ -1240,81 +4069,417 @@ def gemini_enhanced_search(articles, query):
     start_time = time.time()
     
     if not query:
-        return articles, 0
+        return [(article, None) for article in articles], 0
         
     try:
-        # Generate embedding for query using Gemini's text embedding capability
-        query_embedding = model.embed_content(query).embedding
+        # Articles already in the vector store have their embeddings, only the rest need embedding
+        positions = {}
+        for position, article in enumerate(articles):
+            positions.setdefault(article.id, []).append(position)
+        indexed_ids = {article_id for article_id in positions if article_id in ARTICLE_INDEX}
+        unindexed = [articles[group[0]] for article_id, group in positions.items() if article_id not in indexed_ids]
         
-        # Process each article with semantic similarity
-        scored_articles = []
+        print(f"Computing semantic similarity for {len(articles)} articles ({len(indexed_ids)} indexed)...")
         
-        print(f"Computing semantic similarity for {len(articles)} articles...")
+        # The query and every uncached article go out together in shared batch calls
+        embedding_matrix, query_vectors = await get_article_embeddings(unindexed, extra_texts=[query])
+        query_embedding = normalize_rows(query_vectors[0])
         
-        # First try processing in small batches for efficiency (avoids rate limits)
-        batch_size = 20  # Process in batches to balance speed and API usage
-        
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i+batch_size]
-            
-            # Process each article in the batch
-            for article in batch:
-                try:
-                    # Combine title and summary for better semantic matching
-                    content = article["title"] + ". " + article["summary"]
-                    
-                    # Generate embedding for the article content
-                    article_embedding = model.embed_content(content).embedding
-                    
-                    # Calculate cosine similarity between query and article
-                    similarity = calculate_cosine_similarity(query_embedding, article_embedding)
-                    
-                    # Add semantic relevance score
-                    article["relevance"] = float(similarity)  # Convert to float to ensure JSON serialization
-                    scored_articles.append(article)
-                    
-                except Exception as e:
-                    print(f"Error embedding article: {e}")
-                    # Fall back to adding the article with a default score
-                    article["relevance"] = 0.5
-                    scored_articles.append(article)
+        candidates = await run_blocking(
+            semantic_candidates, query_embedding, indexed_ids, unindexed, embedding_matrix
+        )
         
-        # Sort articles by relevance score (highest first)
-        scored_articles.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+        ranked = []
+        for article_id, similarity in candidates:
+            for position in positions[article_id]:
+                if len(ranked) >= SEMANTIC_TOP_K:
+                    break
+                ranked.append((articles[position], float(similarity)))  # Convert to float to ensure JSON serialization
         
-        print(f"Gemini semantic search completed for {len(scored_articles)} articles in {time.time() - start_time:.3f}s")
+        print(f"Gemini semantic search completed for {len(ranked)} articles in {time.time() - start_time:.3f}s")
         
-        return scored_articles, len(scored_articles)
+        return ranked, len(ranked)
         
     except Exception as e:
         print(f"Error using Gemini for semantic search: {e}")
         # Fall back to advanced text-based search
         print("Falling back to traditional search algorithm...")
-        return advanced_semantic_search(articles, query)
+        return await run_blocking(advanced_semantic_search, articles, query)
         
-def calculate_cosine_similarity(vec1, vec2):
+def semantic_candidates(query_embedding, indexed_ids, unindexed, embedding_matrix):
+    """
+    (article id, similarity) pairs, best first, scoring exactly every article of the request
+    
+    The request's candidate set is a few hundred articles, so one matrix-vector product over
+    their stored and freshly computed vectors is all the search there is.
+    """
+    keys, matrix = ARTICLE_INDEX.vectors(indexed_ids) if indexed_ids else ([], None)
+    keys += [article.id for article in unindexed]
+    blocks = [block for block in (matrix, embedding_matrix) if block is not None and len(block)]
+    if not blocks:
+        return []
+    rows, scores = rank_by_similarity(np.vstack(blocks), query_embedding, SEMANTIC_TOP_K)
+    return [(keys[row], float(score)) for row, score in zip(rows, scores)]
+
+def normalize_rows(matrix):
+    """Scale each row to unit length as contiguous float32 (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+def rank_by_similarity(matrix, query_vector, k=None):
+    """
+    Rank the rows of a pre-normalized embedding matrix by cosine similarity to a query
+    
+    Returns (indices, scores) of the best k rows, highest first. Scoring is one BLAS
+    matrix-vector product and argpartition keeps top-k selection linear in the row count.
+    """
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    scores = matrix @ normalize_rows(query_vector)
+    if k is None or k >= len(scores):
+        order = np.argsort(-scores, kind="stable")
+    else:
+        top = np.argpartition(-scores, k - 1)[:k]
+        order = top[np.argsort(-scores[top], kind="stable")]
+    return order, scores[order]
+
+class VectorStore:
+    """
+    Normalized embeddings by key, so a request scores its candidates without embedding them again
+    
+    Vectors live in one growable float32 matrix and deletes free their slot for reuse, so adds
+    and removals never copy the whole store. There is no search structure to train: every
+    request ranks only its own candidates (see semantic_candidates).
     """
-    Calculate the cosine similarity between two vectors
+
+    def __init__(self):
+        self._vectors = None
+        self._keys = []          # slot -> key (None for a free slot)
+        self._timestamps = []    # slot -> publish time used for expiry
+        self._slots = {}         # key -> slot
+        self._free = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def add(self, keys, vectors, timestamps=None):
+        """Insert or replace normalized vectors under their keys"""
+        if not len(keys):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        timestamps = timestamps if timestamps is not None else [time.time()] * len(keys)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((max(1024, len(keys)), vectors.shape[1]), dtype=np.float32)
+            slots = []
+            for key, timestamp in zip(keys, timestamps):
+                slot = self._slots.get(key)
+                if slot is None:
+                    slot = self._free.pop() if self._free else self._new_slot()
+                    self._slots[key] = slot
+                    self._keys[slot] = key
+                self._timestamps[slot] = timestamp
+                slots.append(slot)
+            self._vectors[np.asarray(slots)] = vectors
+
+    def remove(self, keys):
+        """Delete vectors by key, freeing their slots for reuse"""
+        with self._lock:
+            for key in keys:
+                slot = self._slots.pop(key, None)
+                if slot is not None:
+                    self._keys[slot] = None
+                    self._free.append(slot)
+
+    def expire(self, before_timestamp):
+        """Delete every vector published before the given epoch time, returning how many were removed"""
+        with self._lock:
+            expired = [key for key, slot in self._slots.items() if self._timestamps[slot] < before_timestamp]
+        self.remove(expired)
+        return len(expired)
+
+    def vectors(self, keys):
+        """(found keys, matrix) holding a copy of the stored vector of every key present in the store"""
+        with self._lock:
+            found = [key for key in keys if key in self._slots]
+            if not found:
+                return [], None
+            return found, self._vectors[[self._slots[key] for key in found]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "vectors": len(self._slots),
+                "capacity": 0 if self._vectors is None else len(self._vectors),
+                "free_slots": len(self._free)
+            }
+
+    def _new_slot(self):
+        slot = len(self._keys)
+        if slot >= len(self._vectors):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.zeros((len(self._vectors) * 2, self._vectors.shape[1]), dtype=np.float32)
+            grown[:len(self._vectors)] = self._vectors
+            self._vectors = grown
+        self._keys.append(None)
+        self._timestamps.append(0.0)
+        return slot
+
+# Embeddings of every ingested article, embedded once at ingest instead of on every search
+VECTOR_STORE_ENABLED = os.environ.get("VECTOR_STORE_ENABLED", "1") == "1"
+INDEX_RETENTION_HOURS = float(os.environ.get("INDEX_RETENTION_HOURS", "72"))  # Articles older than this leave the search indexes
+ARTICLE_INDEX = VectorStore()
+
+async def index_article_embeddings(articles):
+    """Embed newly ingested articles and add them to the vector store"""
+    new_articles = {}
+    for article in articles:
+        if article.id not in ARTICLE_INDEX:
+            new_articles[article.id] = article
+    if not new_articles:
+        return 0
+    matrix, _ = await get_article_embeddings(list(new_articles.values()))
+    await run_blocking(ARTICLE_INDEX.add, list(new_articles), matrix, [article.timestamp for article in new_articles.values()])
+    return len(new_articles)
+
+def expire_indexed_articles():
+    """Drop articles past the retention window from the text index and vector store"""
+    cutoff = time.time() - INDEX_RETENTION_HOURS * 3600
+    removed_text = TEXT_INDEX.expire(cutoff)
+    removed_vectors = ARTICLE_INDEX.expire(cutoff) if VECTOR_STORE_ENABLED else 0
+    DUPLICATE_INDEX.expire(cutoff)
+    # Articles a stored feed set or unchanged feed still serves stay pooled however old they are, and
+    # older ones pooled for an archive result stay while a snapshot may still refer to them
+    referenced = ARTICLE_STORE.pool_ids()
+    for validator in list(FEED_VALIDATORS.values()):
+        referenced.update(article.pool_id for article in validator["articles"])
+    ARTICLE_POOL.expire(cutoff, keep_after=time.time() - SNAPSHOT_TTL, referenced=referenced)
+    if removed_text or removed_vectors:
+        print(f"Removed {removed_text} expired articles from the text index and {removed_vectors} from the vector store")
+    return removed_text + removed_vectors
+
+@app.get("/api/admin/indexes")
+def get_index_stats():
+    """Report the size of the text index and vector store, and near-duplicate clustering"""
+    return {
+        "retention_hours": INDEX_RETENTION_HOURS,
+        "text": TEXT_INDEX.stats(),
+        "vectors": {"enabled": VECTOR_STORE_ENABLED, **ARTICLE_INDEX.stats()},
+        "duplicates": DUPLICATE_INDEX.stats()
+    }
+
+def select_feed_set(category, language):
+    """
+    Primary (category, language, feeds) for a request: the category's feeds in the language or
+    English, or general news without a category; None when the category has neither language
+    """
+    if category and category in RSS_FEEDS:
+        if language not in RSS_FEEDS[category]:
+            # Try to fall back to English
+            if "en" not in RSS_FEEDS[category]:
+                return None
+            language = "en"
+        return category, language, RSS_FEEDS[category][language]
+    news_language = language if language in RSS_FEEDS["News"] else "en"
+    return "News", news_language, RSS_FEEDS["News"][news_language]
+
+# Related categories merged into a category's results when it has too few articles of its own
+RELATED_CATEGORIES = {
+    "Sports": ["Cricket", "Football"],
+    "News": ["Business & Economy"],
+    "Programming": ["Web Development", "Tech"],
+    "Movies": ["Television"],
+    "Tech": ["Android", "Apple"]
+}
+RELATED_MIN_ARTICLES = 50
+
+def plan_feed_sets(category, language):
+    """
+    Feed sets a request reads: the primary set from select_feed_set() and, for an explicit
+    category, its related categories in the same language; an empty list when there is none
+    """
+    feed_set = select_feed_set(category, language)
+    if feed_set is None:
+        return []
+    feed_sets = [feed_set]
+    if category and category in RSS_FEEDS:
+        set_category, set_language, _ = feed_set
+        for related_cat in RELATED_CATEGORIES.get(set_category, ()):
+            if related_cat in RSS_FEEDS and set_language in RSS_FEEDS[related_cat]:
+                feed_sets.append((related_cat, set_language, RSS_FEEDS[related_cat][set_language]))
+    # Stored primary set with enough articles: the related sets would not be used
+    stored = ARTICLE_STORE.get(*feed_set[:2])
+    if stored is not None and len(stored) >= RELATED_MIN_ARTICLES:
+        return feed_sets[:1]
+    return feed_sets
+
+def filter_preferred_sources(articles, preferred_sources):
+    """Articles whose source name contains one of the preferred sources"""
+    preferred_lower = [ps.lower() for ps in preferred_sources]
+    return [a for a in articles if any(ps in a.source_name.lower() for ps in preferred_lower)]
+
+async def build_news_results(cache_key, query, language, category, preferred_sources, budget=None):
+    """
+    Fetch, filter and rank articles for one cache key and store the result in NEWS_CACHE
     
-    This measures the cosine of the angle between two vectors, providing a similarity score
-    that's 1.0 for identical vectors and 0.0 for orthogonal vectors
+    Work that does not fit the budget is skipped or cut off and the entry is marked partial;
+    partial entries are only kept as snapshots, so the next request ranks the completed feeds.
+    Returns the cache entry, or None when the category has no feeds in the language or English.
     """
-    # Calculate dot product
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
+    budget = budget or RequestBudget(NEWS_MAX_REQUEST_BUDGET)
+    current_time = time.time()
+    fetch_start = time.time()
     
-    # Calculate magnitudes
-    magnitude1 = sum(a * a for a in vec1) ** 0.5
-    magnitude2 = sum(b * b for b in vec2) ** 0.5
+    feed_sets = plan_feed_sets(category, language)
+    if not feed_sets:
+        return None
     
-    # Avoid division by zero
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
+    # Primary and related sets come from the store; any not ingested yet are fetched together in one wave
+    set_articles = await get_feed_sets_articles(feed_sets, budget)
+    articles = set_articles[0]
+    if len(articles) < RELATED_MIN_ARTICLES and len(feed_sets) > 1:
+        # Broader coverage from related categories; sets sharing a feed hold the same pooled articles
+        seen_ids = {article.pool_id for article in articles}
+        for (related_cat, _, _), related_articles in zip(feed_sets[1:], set_articles[1:]):
+            print(f"Adding articles from related category: {related_cat}")
+            for article in related_articles:
+                if article.pool_id not in seen_ids:
+                    seen_ids.add(article.pool_id)
+                    articles.append(article)
+    
+    # Always try NewsAPI for search queries to get more comprehensive results
+    # Extended to also fetch when we have too few articles
+    news_api_articles = []
+    if query or len(articles) < 30:
+        try:
+            news_api_articles = await asyncio.wait_for(
+                fetch_news_api(query, language, category=category), timeout=max(budget.fetch_remaining(), 0.01)
+            )
+        except asyncio.TimeoutError:
+            budget.miss("newsapi")
+        if news_api_articles:
+            print(f"Added {len(news_api_articles)} articles from NewsAPI")
+            articles.extend(news_api_articles)
+    
+    print(f"Fetched {len(articles)} total articles in {time.time() - fetch_start:.3f}s")
+    
+    # Extract available sources for filtering
+    available_sources = list(dict.fromkeys(article.source_name for article in articles))
+    
+    # Apply source filtering if specified
+    if preferred_sources:
+        filtered_by_source = filter_preferred_sources(articles, preferred_sources)
+        if filtered_by_source:
+            print(f"Filtered by source: {len(filtered_by_source)} articles matched preferred sources")
+            articles = filtered_by_source
+    
+    # Apply search filtering only if there's a query; ranking yields (article, relevance) pairs
+    search_start = time.time()
+    fallback = False
+    if query:
+        try:
+            # Try Gemini enhanced search first (with error handling), within what is left of the budget
+            ranked, total_matches = await asyncio.wait_for(
+                gemini_enhanced_search(articles, query), timeout=max(budget.remaining(), 0.01)
+            )
+            print(f"Gemini search found {total_matches} matches")
+        except asyncio.TimeoutError:
+            print("Gemini search ran out of budget, falling back to advanced search")
+            budget.miss("semantic ranking")
+            ranked, total_matches = await run_blocking(advanced_semantic_search, articles, query)
+        except Exception as e:
+            print(f"Gemini search failed: {e}, falling back to advanced search")
+            # Fall back to our optimized search algorithm
+            ranked, total_matches = await run_blocking(advanced_semantic_search, articles, query)
+            print(f"Advanced search found {total_matches} matches")
         
-    # Calculate cosine similarity
-    return dot_product / (magnitude1 * magnitude2)
+        if not ranked:
+            # No matches: show recent articles instead
+            ranked = [(article, None) for article in sorted(articles, key=lambda x: x.timestamp, reverse=True)]
+            fallback = True
+        else:
+            # Enhanced relevance - boost certain items based on recency and quality
+            quality_sources = {"BBC News", "The Guardian", "The Hindu", "Times of India", "NDTV News"}
+            now = time.time()
+            boosted = []
+            for article, relevance in ranked:
+                relevance = relevance if relevance is not None else 0.5
+                # Boost high-quality sources slightly
+                if article.source_name in quality_sources:
+                    relevance = min(relevance * 1.1, 0.99)
+                
+                # Boost recent articles
+                if now - article.timestamp < 24 * 3600:  # Less than a day old
+                    relevance = min(relevance * 1.1, 0.99)
+                boosted.append((article, relevance))
+            ranked = boosted
+    else:
+        # No query, just sort by date
+        ranked = [(article, None) for article in sorted(articles, key=lambda x: x.timestamp, reverse=True)]
+    
+    print(f"Search completed in {time.time() - search_start:.3f}s")
+    
+    # Store in cache for future requests: pool IDs and scores only, plus available_sources
+    cached_data = make_cache_entry(current_time, ranked, available_sources, fallback, query, category, budget.partial)
+    await cache_store(SNAPSHOT_STORE, cached_data["snapshot_id"], cached_data)
+    if budget.partial:
+        DEADLINE_STATS["partial_results"] += 1
+        print(f"Partial result after missing the deadline for: {', '.join(budget.missed[:5])}")
+    else:
+        await cache_store(NEWS_CACHE, cache_key, cached_data)
+    return cached_data
+
+async def build_archive_results(cache_key, query, language, category, preferred_sources, date_range):
+    """
+    Rank archived articles published in the date range and store the result like build_news_results()
+    
+    Returns the cache entry, or None when the category has no feeds in the language or English.
+    """
+    current_time = time.time()
+    set_language = language
+    if category and category in RSS_FEEDS:
+        feed_set = select_feed_set(category, language)
+        if feed_set is None:
+            return None
+        category, set_language, _ = feed_set
+    else:
+        category = None  # No feed set of its own: search the whole language
+    since, until = date_range
+    
+    ranked = await run_blocking(archive_search, query, category, set_language, since, until)
+    fallback = False
+    if query and not ranked:
+        # No matches: show the newest archived articles of the range instead
+        ranked = await run_blocking(archive_search, "", category, set_language, since, until)
+        fallback = True
+    available_sources = list(dict.fromkeys(article.source_name for article, _ in ranked))
+    
+    if preferred_sources:
+        preferred_lower = [ps.lower() for ps in preferred_sources]
+        filtered_by_source = [(article, relevance) for article, relevance in ranked if any(
+            ps in article.source_name.lower() for ps in preferred_lower
+        )]
+        if filtered_by_source:
+            ranked = filtered_by_source
+    
+    print(f"Archive returned {len(ranked)} articles for '{query}' in {time.time() - current_time:.3f}s")
+    cached_data = make_cache_entry(current_time, ranked, available_sources, fallback, query, category)
+    await cache_store(SNAPSHOT_STORE, cached_data["snapshot_id"], cached_data)
+    await cache_store(NEWS_CACHE, cache_key, cached_data)
+    return cached_data
 
 @app.post("/api/news", response_model=NewsResponse)
-async def get_news(request: NewsRequest):
+async def get_news(request: NewsRequest, response: Response):
+    return await answer_news_request(request, response, RequestBudget.for_request(request.budget_ms))
+
+async def answer_news_request(request, response, budget):
+    """/api/news for one request, with every stage bounded by the request's latency budget"""
     try:
         start_time = time.time()
         language = request.language
@@ -1324,60 +4489,54 @@ async def get_news(request: NewsRequest):
         preferred_sources = request.preferred_sources
         category = request.category
         
-        print(f"Processing news request: lang={language}, query='{query}', category={category}, page={page}")
-        
-        # Skip category detection for empty queries to save time
-        if not category and query and len(query) > 2:
-            # Only use category detection for substantial queries
-            category = await determine_category_for_query(query)
-        
-        # Check cache first - with a sophisticated cache key that includes more parameters
-        cache_key = f"{language}-{category or 'all'}-{query[:30]}-{'-'.join(sorted(preferred_sources))}"
-        current_time = time.time()
-        
-        # Fast path: Return cached results if available and not expired
-        if cache_key in NEWS_CACHE and (current_time - NEWS_CACHE[cache_key]["timestamp"] < CACHE_EXPIRY):
-            cached_data = NEWS_CACHE[cache_key]
+        if request.cursor:
+            # Later pages read the snapshot the cursor points at: no re-ranking, no re-fetching
+            try:
+                snapshot_id, start_idx, page_size = decode_cursor(request.cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            cached_data, data_age, _ = await cache_lookup(SNAPSHOT_STORE, snapshot_id)
+            if cached_data is None:
+                raise HTTPException(status_code=410, detail="Result snapshot expired; request the first page again")
+            query, category = cached_data["query"], cached_data["category"]
+            cache_hit, stale = True, False
+            page = start_idx // max(page_size, 1) + 1
+        else:
+            print(f"Processing news request: lang={language}, query='{query}', category={category}, page={page}")
             
-            # Calculate pagination directly from cache
-            total_matches = len(cached_data["articles"])
-            total_pages = max(1, (total_matches + page_size - 1) // page_size)
-            start_idx = (page - 1) * page_size
-            end_idx = min(start_idx + page_size, total_matches)
+            # Skip category detection for empty queries to save time
+            if not category and query and len(query) > 2:
+                # Only use category detection for substantial queries
+                category = await CATEGORY_FLIGHTS.do(query, lambda: determine_category_for_query(query))
             
-            # Get requested page of articles
-            paged_articles = cached_data["articles"][start_idx:end_idx]
+            # Busy feed sets are polled more often
+            feed_set = select_feed_set(category, language)
+            if feed_set is not None:
+                FEED_SCHEDULER.note_demand(feed_set[:2])
             
-            category_msg = f" in {category}" if category else ""
-            message = f"Found {total_matches} articles matching '{query}'{category_msg}." if query else f"Showing {min(page_size, total_matches)} recent news articles{category_msg}."
+            # A date range is answered from the article archive instead of the live feed sets
+            try:
+                date_range = parse_date_range(request.from_date, request.to_date)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            cache_key = result_cache_key(language, category, query, preferred_sources, date_range)
             
-            print(f"Returned cached results for '{query}' in {time.time() - start_time:.3f}s")
+            def build_results(budget=None):
+                if date_range:
+                    return build_archive_results(cache_key, query, language, category, preferred_sources, date_range)
+                return build_news_results(cache_key, query, language, category, preferred_sources, budget)
             
-            return NewsResponse(
-                articles=paged_articles,
-                message=message,
-                total_found=total_matches,
-                total_pages=total_pages,
-                current_page=page,
-                available_sources=cached_data.get("available_sources", []),
-                available_categories=list(RSS_FEEDS.keys())
-            )
-        
-        # Not in cache, need to fetch new data
-        articles = []
-        fetch_start = time.time()
-        
-        # Parallel fetch strategy - fetch from multiple sources concurrently
-        fetch_tasks = []
-        
-        # 1. Fetch category-specific articles if a category is specified
-        if category and category in RSS_FEEDS:
-            # Check if the language is supported for this category
-            if language not in RSS_FEEDS[category]:
-                # Try to fall back to English
-                if "en" in RSS_FEEDS[category]:
-                    language = "en"
-                else:
+            # Fast path: Return cached results if available, serving expired ones within the grace window
+            cached_data, data_age, stale = await cache_lookup(NEWS_CACHE, cache_key)
+            cache_hit = cached_data is not None
+            if stale:
+                # Stale-while-revalidate: answer now and refresh once in the background
+                RESULT_FLIGHTS.start((cache_key, None), build_results)
+            if not cache_hit:
+                # Concurrent misses for the same key and budget wait on one pipeline run instead of each starting
+                # their own; a run under another budget could end later than this deadline or be cut short before it
+                cached_data = await RESULT_FLIGHTS.do((cache_key, budget.seconds), lambda: build_results(budget))
+                if cached_data is None:
                     return NewsResponse(
                         articles=[],
                         message=f"Language {request.language} not available for category '{category}'.",
@@ -1387,146 +4546,32 @@ async def get_news(request: NewsRequest):
                         available_sources=[],
                         available_categories=list(RSS_FEEDS.keys())
                     )
-            
-            # Get feeds for the specified category and language
-            feeds = RSS_FEEDS[category][language]
-            articles = fetch_all_feeds(feeds, category=category)
-            
-            # Check if we should also fetch from related categories for better coverage
-            # Map of related categories to check
-            related_categories = {
-                "Sports": ["Cricket", "Football"],
-                "News": ["Business & Economy"],
-                "Programming": ["Web Development", "Tech"],
-                "Movies": ["Television"],
-                "Tech": ["Android", "Apple"]
-            }
-            
-            # Fetch from related categories for broader coverage when relevant
-            if category in related_categories and len(articles) < 50:
-                for related_cat in related_categories[category]:
-                    if related_cat in RSS_FEEDS and language in RSS_FEEDS[related_cat]:
-                        related_feeds = RSS_FEEDS[related_cat][language]
-                        print(f"Fetching additional articles from related category: {related_cat}")
-                        related_articles = fetch_all_feeds(related_feeds, category=related_cat)
-                        articles.extend(related_articles)
-            
-        else:
-            # Get general news feeds for this language or fall back to English
-            if language in RSS_FEEDS["News"]:
-                feeds = RSS_FEEDS["News"][language]
-            else:
-                feeds = RSS_FEEDS["News"]["en"]
-            
-            articles = fetch_all_feeds(feeds, category="News")
-        
-        # Always try NewsAPI for search queries to get more comprehensive results
-        # Extended to also fetch when we have too few articles
-        news_api_articles = []
-        if query or len(articles) < 30:
-            news_api_articles = await fetch_news_api(query, language, category=category)
-            if news_api_articles:
-                print(f"Added {len(news_api_articles)} articles from NewsAPI")
-                articles.extend(news_api_articles)
-        
-        print(f"Fetched {len(articles)} total articles in {time.time() - fetch_start:.3f}s")
-        
-        # Extract available sources for filtering
-        available_sources = []
-        source_set = set()
-        for article in articles:
-            source_name = article["source"]["name"]
-            if source_name not in source_set:
-                source_set.add(source_name)
-                available_sources.append(source_name)
-        
-        # Apply source filtering if specified
-        if preferred_sources and len(preferred_sources) > 0:
-            filtered_by_source = [a for a in articles if any(
-                ps.lower() in a["source"]["name"].lower() for ps in preferred_sources
-            )]
-            if filtered_by_source:
-                print(f"Filtered by source: {len(filtered_by_source)} articles matched preferred sources")
-                articles = filtered_by_source
-        
-        # Apply search filtering only if there's a query
-        search_start = time.time()
-        if query:
-            try:
-                # Try Gemini enhanced search first (with error handling)
-                filtered_articles, total_matches = gemini_enhanced_search(articles, query)
-                print(f"Gemini search found {total_matches} matches")
-            except Exception as e:
-                print(f"Gemini search failed: {e}, falling back to advanced search")
-                # Fall back to our optimized search algorithm
-                filtered_articles, total_matches = advanced_semantic_search(articles, query)
-                print(f"Advanced search found {total_matches} matches")
-            
-            if not filtered_articles:
-                filtered_articles = sorted(articles, key=lambda x: x.get("published_date", ""), reverse=True)
-                total_matches = len(filtered_articles)
-                category_msg = f" in {category}" if category else ""
-                message = f"No exact matches for '{query}'{category_msg}. Showing recent articles instead."
-            else:
-                category_msg = f" in {category}" if category else ""
-                message = f"Found {total_matches} articles matching '{query}'{category_msg}."
-                
-                # Enhanced relevance - boost certain items based on recency and quality
-                for article in filtered_articles:
-                    try:
-                        # Boost high-quality sources slightly
-                        quality_sources = ["BBC News", "The Guardian", "The Hindu", "Times of India", "NDTV News"]
-                        if article["source"]["name"] in quality_sources:
-                            article["relevance"] = min(article.get("relevance", 0.5) * 1.1, 0.99)
-                        
-                        # Boost recent articles
-                        pub_date = article.get("published_date", "")
-                        if pub_date:
-                            # Parse the date
-                            pub_datetime = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-                            hours_old = (datetime.now() - pub_datetime).total_seconds() / 3600
-                            if hours_old < 24:  # Less than a day old
-                                article["relevance"] = min(article.get("relevance", 0.5) * 1.1, 0.99)
-                    except Exception:
-                        pass  # Ignore errors in relevance enhancement
-        else:
-            # No query, just sort by date
-            filtered_articles = sorted(articles, key=lambda x: x.get("published_date", ""), reverse=True)
-            total_matches = len(filtered_articles)
-            category_msg = f" in {category}" if category else ""
-            message = f"Showing {min(page_size, total_matches)} recent news articles{category_msg}."
-        
-        print(f"Search completed in {time.time() - search_start:.3f}s")
-        
-        # Store in cache for future requests - include available_sources
-        NEWS_CACHE[cache_key] = {
-            "timestamp": current_time,
-            "articles": filtered_articles,
-            "available_sources": available_sources
-        }
-        
-        # Clean cache if it's getting too large (over 50 entries)
-        if len(NEWS_CACHE) > 50:
-            oldest_keys = sorted(NEWS_CACHE.keys(), key=lambda k: NEWS_CACHE[k]["timestamp"])[:10]
-            for old_key in oldest_keys:
-                del NEWS_CACHE[old_key]
-            print(f"Cleaned {len(oldest_keys)} old entries from cache")
+            start_idx = (page - 1) * page_size
         
-        # Final pagination
+        # Pages are O(page_size) slices of the snapshot's ID and score arrays
+        total_matches = len(cached_data["ids"])
         total_pages = max(1, (total_matches + page_size - 1) // page_size)
-        start_idx = (page - 1) * page_size
         end_idx = min(start_idx + page_size, total_matches)
+        paged_articles = cached_page(cached_data, start_idx, end_idx)
+        next_cursor = encode_cursor(cached_data["snapshot_id"], end_idx, page_size) if end_idx < total_matches else None
+        
+        category_msg = f" in {category}" if category else ""
+        if not query:
+            message = f"Showing {min(page_size, total_matches)} recent news articles{category_msg}."
+        elif cached_data["fallback"]:
+            message = f"No exact matches for '{query}'{category_msg}. Showing recent articles instead."
+        else:
+            message = f"Found {total_matches} articles matching '{query}'{category_msg}."
         
-        # Get requested page of articles
-        paged_articles = filtered_articles[start_idx:end_idx]
+        if not cache_hit:
+            data_age = time.time() - cached_data["timestamp"]
+        response.headers["Age"] = str(int(data_age))
         
-        # Ensure all articles have a relevance score for UI
-        for article in paged_articles:
-            if "relevance" not in article:
-                article["relevance"] = 0.5
-                
         total_time = time.time() - start_time
-        print(f"Request completed in {total_time:.3f}s, returning {len(paged_articles)} articles")
+        if cache_hit:
+            print(f"Returned {'stale' if stale else 'cached'} results for '{query}' in {total_time:.3f}s")
+        else:
+            print(f"Request completed in {total_time:.3f}s, returning {len(paged_articles)} articles")
         
         return NewsResponse(
             articles=paged_articles,
@@ -1534,12 +4579,116 @@ async def get_news(request: NewsRequest):
             total_found=total_matches,
             total_pages=total_pages,
             current_page=page,
-            available_sources=available_sources,
-            available_categories=list(RSS_FEEDS.keys())
+            available_sources=cached_data["available_sources"],
+            available_categories=list(RSS_FEEDS.keys()),
+            data_age=round(data_age, 1),
+            stale=stale,
+            snapshot_id=cached_data["snapshot_id"],
+            next_cursor=next_cursor,
+            partial=cached_data["partial"]
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_news: {str(e)}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error processing news: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing news: {str(e)}")
+
+def rank_preview(articles, query, limit, preferred_sources=()):
+    """Quick text-only ranking of the articles seen so far, for streamed batches ahead of the semantic pass"""
+    if preferred_sources:
+        # Until a preferred source's feed arrives there is nothing to preview; only the final
+        # ranking falls back to every source when none of them matched
+        articles = filter_preferred_sources(articles, preferred_sources)
+    if query:
+        ranked, _ = advanced_semantic_search(articles, query)
+    else:
+        ranked = [(article, None) for article in sorted(articles, key=lambda a: a.timestamp, reverse=True)]
+    return ranked[:limit]
+
+def resolve_duplicates(articles):
+    return [DUPLICATE_INDEX.resolve(article) for article in articles]
+
+async def news_stream_events(request):
+    """
+    NDJSON lines for /api/news/stream
+    
+    A "batch" line is sent whenever the articles seen so far change the top page: the articles
+    that entered it (with text-only relevance) and the page's current order of IDs. Stored feed
+    sets give one batch straight away; a feed set that was never ingested is fetched live and
+    gives one batch per completed feed. The last line is "final": the /api/news response for the
+    page after full ranking, with its snapshot ID and cursor. Cache hits and cursors send only it.
+    """
+    def line(event, payload):
+        return json.dumps({"event": event, **jsonable_encoder(payload)}, separators=(",", ":")) + "\n"
+    
+    try:
+        budget = RequestBudget.for_request(request.budget_ms)
+        query, language, category = request.query, request.language, request.category
+        # Date-ranged requests read the archive, which answers at once, so only the final line is sent
+        if not request.cursor and not (request.from_date or request.to_date):
+            if not category and query and len(query) > 2:
+                category = await CATEGORY_FLIGHTS.do(query, lambda: determine_category_for_query(query))
+            cache_key = result_cache_key(language, category, query, request.preferred_sources)
+            cached_data, _, _ = await cache_lookup(NEWS_CACHE, cache_key)
+            feed_set = select_feed_set(category, language) if cached_data is None else None
+            
+            if feed_set is not None:
+                set_category, set_language, feeds = feed_set
+                seen, sent, order = {}, set(), []
+                feeds_completed = 0
+                
+                async def preview(articles):
+                    nonlocal order
+                    for article in await run_blocking(resolve_duplicates, articles):
+                        seen.setdefault(article.pool_id, article)
+                    top = await run_blocking(
+                        rank_preview, list(seen.values()), query, request.page_size, request.preferred_sources
+                    )
+                    entered = [(article, score) for article, score in top if article.pool_id not in sent]
+                    new_order = [article.id for article, _ in top]
+                    if not entered and new_order == order:
+                        return None
+                    sent.update(article.pool_id for article, _ in entered)
+                    order = new_order
+                    return line("batch", {
+                        "articles": [article.to_response(score) for article, score in entered],
+                        "order": order,
+                        "feeds_completed": feeds_completed
+                    })
+                
+                stored = ARTICLE_STORE.get(set_category, set_language)
+                if stored is not None:
+                    batch = await preview(stored)
+                    if batch:
+                        yield batch
+                else:
+                    raw_articles, late = [], []
+                    async for articles in iter_feed_batches(feeds, set_category, budget, late):
+                        raw_articles.extend(articles)
+                        feeds_completed += 1
+                        batch = await preview(articles)
+                        if batch:
+                            yield batch
+                    # The live fetch doubles as ingestion, so the final ranking below reads the store
+                    articles = await run_blocking(deduplicate_articles, raw_articles)
+                    await store_feed_set(set_category, set_language, articles, partial=bool(late), index_embeddings=False)
+                    FEED_SET_FLIGHTS.start(
+                        (set_category, set_language),
+                        lambda: complete_feed_set(set_category, set_language, articles, late)
+                    )
+        
+        final = await answer_news_request(request, Response(), budget)
+        yield line("final", final)
+    except HTTPException as e:
+        yield line("error", {"status": e.status_code, "detail": e.detail})
+    except Exception as e:
+        print(f"Error in news stream: {e}")
+        yield line("error", {"status": 500, "detail": f"Error processing news: {str(e)}"})
+
+@app.post("/api/news/stream")
+async def stream_news(request: NewsRequest):
+    """Streaming /api/news: NDJSON batches of ranked articles as feeds complete, then the final page"""
+    return StreamingResponse(news_stream_events(request), media_type="application/x-ndjson")
@@ -0,0 +1,279 @@
+"""
+Benchmarks for the news API's embedding, search, feed parsing, polling and archive code
+
+    python scripts/benchmarks.py {embeddings,vectors,parser,polling,archive} [options]
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import feedparser
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+os.environ.setdefault("MOCK_FEEDS", "1")
+os.environ.setdefault("ARCHIVE_ENABLED", "0")
+
+from index import (  # noqa: E402
+    FEED_MAX_ENTRIES, FEED_SET_MAX_FEEDS, INGESTION_INTERVAL, RSS_FEEDS, ArticleArchive, EmbeddingScheduler,
+    FakeEmbeddingBackend, FeedScheduler, VectorStore, make_article, normalize_rows, rank_by_similarity,
+    run_blocking, stream_feed_entries
+)
+from mock_services import MOCK_FEED_WORDS, build_mock_feed  # noqa: E402
+
+async def benchmark_embeddings(texts=2000, concurrent_requests=8, latency=0.05):
+    """Compare one-call-per-text embedding with the batching scheduler on the fake backend"""
+    corpus = [f"benchmark article {i} about {MOCK_FEED_WORDS[i % len(MOCK_FEED_WORDS)]}" for i in range(texts)]
+    backend = FakeEmbeddingBackend(latency=latency)
+    
+    sequential_sample = corpus[:50]
+    start = time.perf_counter()
+    for text in sequential_sample:
+        await run_blocking(backend.embed_batch, [text])
+    sequential_rate = len(sequential_sample) / (time.perf_counter() - start)
+    
+    scheduler = EmbeddingScheduler(backend, requests_per_minute=60000)
+    chunk = (texts + concurrent_requests - 1) // concurrent_requests
+    start = time.perf_counter()
+    await asyncio.gather(*(scheduler.embed(corpus[i:i + chunk]) for i in range(0, texts, chunk)))
+    scheduled_rate = texts / (time.perf_counter() - start)
+    
+    print(f"Sequential per-text calls: {sequential_rate:.0f} texts/s")
+    print(f"Batched scheduler: {scheduled_rate:.0f} texts/s in {scheduler.stats['batches']} batches "
+          f"({scheduled_rate / sequential_rate:.1f}x)")
+    return {"sequential": sequential_rate, "scheduled": scheduled_rate, "stats": scheduler.stats}
+
+def benchmark_vectors(vectors=20000, dims=256, queries=200, candidates=200):
+    """
+    Time ranking a news request's candidates with their stored vectors, the way semantic_candidates does,
+    against embedding the candidates again on every request
+    """
+    rng = np.random.default_rng(42)
+    data = normalize_rows(rng.standard_normal((vectors, dims)))
+    query_set = normalize_rows(rng.standard_normal((queries, dims)))
+    
+    store = VectorStore()
+    start = time.perf_counter()
+    for offset in range(0, vectors, 500):  # Ingest arrives a feed set at a time
+        store.add(list(range(offset, min(offset + 500, vectors))), data[offset:offset + 500])
+    print(f"Stored {vectors} vectors in {time.perf_counter() - start:.2f}s ({store.stats()['capacity']} slots)")
+    
+    candidate_sets = [rng.choice(vectors, size=candidates, replace=False).tolist() for _ in range(queries)]
+    start = time.perf_counter()
+    for query, keys in zip(query_set, candidate_sets):
+        found, matrix = store.vectors(keys)
+        rank_by_similarity(matrix, query, candidates)
+    stored_ms = (time.perf_counter() - start) / queries * 1000
+    
+    backend = FakeEmbeddingBackend(dims=dims)
+    start = time.perf_counter()
+    for query, keys in zip(query_set[:20], candidate_sets[:20]):
+        matrix = normalize_rows(backend.embed_batch([f"article {key}" for key in keys]))
+        rank_by_similarity(matrix, query, candidates)
+    embedded_ms = (time.perf_counter() - start) / 20 * 1000
+    print(f"{candidates} candidates: {stored_ms:.3f} ms/query from the store, "
+          f"{embedded_ms:.3f} ms/query embedding them again (fake backend, {backend.latency * 1000:.0f} ms per call)")
+    return {"stored_ms": stored_ms, "embedded_ms": embedded_ms}
+
+def benchmark_feed_parser(items=5000, rounds=5):
+    """Compare parse time and peak memory of feedparser and the streaming parser on a podcast-sized feed"""
+    feed_url = "https://podcasts.example.com/feed.xml"
+    content = build_mock_feed(feed_url, items=items).encode("utf-8")
+    # The next fetch of the same feed after two new episodes were published
+    new_items = "".join(f"<item><title>New episode {n}</title><guid>new-{n}</guid></item>" for n in (1, 2))
+    with_new_items = content.replace(b"<item>", new_items.encode("utf-8") + b"<item>", 1)
+    _, first_entries, _ = stream_feed_entries(content)
+    seen_keys = frozenset(entry["key"] for entry in first_entries)
+    print(f"Feed of {items} items, {len(content) / 1e6:.1f} MB")
+    
+    cases = [
+        ("feedparser", lambda: feedparser.parse(content).entries[:FEED_MAX_ENTRIES]),
+        ("streaming", lambda: stream_feed_entries(content)),
+        ("incremental", lambda: stream_feed_entries(with_new_items, seen_keys=seen_keys))
+    ]
+    results = {}
+    for name, parse in cases:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            parse()
+        elapsed_ms = (time.perf_counter() - start) / rounds * 1000
+        tracemalloc.start()
+        parse()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {"ms": elapsed_ms, "peak_bytes": peak}
+        print(f"{name:<12} {elapsed_ms:9.2f} ms/parse  peak {peak / 1e6:7.2f} MB")
+    return results
+
+def benchmark_polling(hours=24, seed=7):
+    """
+    Simulate a day of polling synthetic feeds with fixed INGESTION_INTERVAL polls and with the
+    adaptive schedule, comparing upstream requests and the delay before new posts are seen
+    """
+    rng = random.Random(seed)
+    start = 1_000_000_000.0
+    end = start + hours * 3600
+    # (profile, mean seconds between posts, feeds); the last profile's feed set is queried every 30 s
+    profiles = [
+        ("every minute", 60, 5), ("every 10 minutes", 600, 15), ("every 30 minutes", 1800, 25),
+        ("hourly", 3600, 20), ("daily", 86400, 20), ("monthly", 30 * 86400, 10), ("hourly, queried", 3600, 5)
+    ]
+    feeds = {}
+    for profile, gap, count in profiles:
+        for n in range(count):
+            posted, t = [], start - 40 * gap
+            while t < end:
+                t += rng.expovariate(1 / gap)
+                posted.append(t)
+            feeds[f"https://{profile.replace(' ', '-').replace(',', '')}-{n}.example.com/feed"] = (profile, posted)
+    
+    def visible(posted, now):
+        newest = bisect.bisect_right(posted, now)
+        return posted[max(0, newest - FEED_MAX_ENTRIES):newest]
+    
+    def delays(posted, polls):
+        result = []
+        for t in posted[bisect.bisect_left(posted, start):]:
+            if t >= end:
+                break
+            seen = bisect.bisect_left(polls, t)
+            result.append((polls[seen] if seen < len(polls) else end) - t)
+        return result
+    
+    scheduler = FeedScheduler()
+    poll_times = {url: [] for url in feeds}
+    for url, (profile, posted) in feeds.items():
+        scheduler.register(url, (profile, "en"), now=start)
+        scheduler.record_poll(url, visible(posted, start), True, now=start)
+    hot_set = (profiles[-1][0], "en")
+    next_request = start
+    while True:
+        next_due = scheduler.next_due()
+        now = min(next_due if next_due is not None else end, next_request)
+        if now >= end:
+            break
+        if now == next_request:
+            scheduler.note_demand(hot_set, now=now)
+            next_request += 30
+            continue
+        for url in scheduler.pop_due(now):
+            posted = feeds[url][1]
+            poll_times[url].append(now)
+            scheduler.record_poll(url, visible(posted, now), True, now=now)
+    
+    print(f"{'profile':<18}{'fixed req':>10}{'adaptive req':>14}{'fixed delay':>13}{'adaptive delay':>16}")
+    totals = {"fixed": 0, "adaptive": 0}
+    for profile, _, _ in profiles:
+        urls = [url for url, (p, _) in feeds.items() if p == profile]
+        fixed_requests = adaptive_requests = 0
+        fixed_delays, adaptive_delays = [], []
+        for url in urls:
+            phase = rng.uniform(0, INGESTION_INTERVAL)
+            fixed_polls = [start + phase + i * INGESTION_INTERVAL for i in range(int((end - start) // INGESTION_INTERVAL))]
+            fixed_requests += len(fixed_polls)
+            adaptive_requests += len(poll_times[url])
+            fixed_delays += delays(feeds[url][1], fixed_polls)
+            adaptive_delays += delays(feeds[url][1], poll_times[url])
+        totals["fixed"] += fixed_requests
+        totals["adaptive"] += adaptive_requests
+        fixed_mean = sum(fixed_delays) / len(fixed_delays) if fixed_delays else 0.0
+        adaptive_mean = sum(adaptive_delays) / len(adaptive_delays) if adaptive_delays else 0.0
+        print(f"{profile:<18}{fixed_requests:>10}{adaptive_requests:>14}{fixed_mean:>12.0f}s{adaptive_mean:>15.0f}s")
+    print(f"Upstream requests: {totals['fixed']} fixed, {totals['adaptive']} adaptive "
+          f"({1 - totals['adaptive'] / totals['fixed']:.0%} fewer)")
+    return totals
+
+def benchmark_archive(articles=50000, queries=200, days=30, seed=11):
+    """
+    Bulk-load synthetic articles spread over the last days into a temporary archive, then time
+    date-ranged text queries and newest-first listings like those /api/news sends with from_date
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    categories = list(RSS_FEEDS) or ["general"]
+    # Zipf-weighted vocabulary, so query terms match a realistic share of articles rather than all of them
+    vocabulary = MOCK_FEED_WORDS + [
+        "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+        for _ in range(5000)
+    ]
+    cum_weights = list(itertools.accumulate(1 / (rank + 10) for rank in range(len(vocabulary))))
+
+    def words(count):
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=count))
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = ArticleArchive(os.path.join(directory, "archive.sqlite3"), retention_days=days)
+        load_start = time.perf_counter()
+        for batch_start in range(0, articles, FEED_SET_MAX_FEEDS * FEED_MAX_ENTRIES):
+            batch = []
+            for n in range(batch_start, min(articles, batch_start + FEED_SET_MAX_FEEDS * FEED_MAX_ENTRIES)):
+                published = now - rng.uniform(0, days * 86400)
+                article = make_article(
+                    words(8).capitalize(), words(40),
+                    f"https://archive.example.com/{n}", None, datetime.fromtimestamp(published).isoformat(), f"Source {n % 40}",
+                    "https://archive.example.com", None
+                )
+                batch.append(article)
+            archive.upsert(rng.choice(categories), "en", batch, now=now)
+        load_seconds = time.perf_counter() - load_start
+        
+        latencies = {"text": [], "newest": []}
+        for n in range(queries):
+            since = now - rng.uniform(1, days) * 86400
+            until = since + rng.uniform(1, 7) * 86400
+            category = rng.choice(categories + [None])
+            for kind, query in (("text", words(2)), ("newest", "")):
+                query_start = time.perf_counter()
+                archive.search(query, category, "en", since, until)
+                latencies[kind].append(time.perf_counter() - query_start)
+        summary = archive.summary()
+    
+    print(f"Archived {summary['articles']} articles in {load_seconds:.2f}s "
+          f"({summary['articles'] / load_seconds:.0f}/s, {summary['bytes'] / 1e6:.1f} MB, fts5={summary['fts5']})")
+    for kind, values in latencies.items():
+        values.sort()
+        print(f"{kind:<7} queries: p50 {values[len(values) // 2] * 1000:.2f} ms, "
+              f"p95 {values[int(len(values) * 0.95)] * 1000:.2f} ms")
+    return latencies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="News API benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench_embeddings = commands.add_parser("embeddings", help="Benchmark the embedding scheduler on the fake backend")
+    bench_embeddings.add_argument("--texts", type=int, default=2000)
+    bench_embeddings.add_argument("--concurrent-requests", type=int, default=8)
+    bench_embeddings.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per backend call")
+    bench_vectors = commands.add_parser("vectors", help="Time ranking request candidates from the vector store")
+    bench_vectors.add_argument("--vectors", type=int, default=20000)
+    bench_vectors.add_argument("--dims", type=int, default=256)
+    bench_vectors.add_argument("--queries", type=int, default=200)
+    bench_vectors.add_argument("--candidates", type=int, default=200, help="Candidate articles per query, as in a news request")
+    bench_parser = commands.add_parser("parser", help="Compare feedparser with the streaming feed parser on a large feed")
+    bench_parser.add_argument("--items", type=int, default=5000)
+    bench_parser.add_argument("--rounds", type=int, default=5)
+    bench_polling = commands.add_parser("polling", help="Simulate fixed and adaptive feed polling over synthetic feeds")
+    bench_polling.add_argument("--hours", type=float, default=24)
+    bench_archive = commands.add_parser("archive", help="Time date-ranged queries against a synthetic article archive")
+    bench_archive.add_argument("--articles", type=int, default=50000)
+    bench_archive.add_argument("--queries", type=int, default=200)
+    bench_archive.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    
+    if args.command == "embeddings":
+        asyncio.run(benchmark_embeddings(args.texts, args.concurrent_requests, args.latency))
+    elif args.command == "vectors":
+        benchmark_vectors(args.vectors, args.dims, args.queries, args.candidates)
+    elif args.command == "parser":
+        benchmark_feed_parser(args.items, args.rounds)
+    elif args.command == "polling":
+        benchmark_polling(args.hours)
+    elif args.command == "archive":
+        benchmark_archive(args.articles, args.queries, args.days)
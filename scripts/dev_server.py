@@ -0,0 +1,28 @@
+"""
+Run the news API offline: feeds come from the mock feed server, and CACHE_BACKEND=redis without
+REDIS_URL gets the in-process Redis stand-in
+
+    python scripts/dev_server.py [--port 8000]
+"""
+import argparse
+import os
+import sys
+
+import uvicorn
+
+import mock_services
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the news API against local mock services")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    # index reads its configuration at import, so the servers start first
+    os.environ["MOCK_FEEDS"] = "1"
+    os.environ["MOCK_FEED_URL"] = mock_services.start_mock_feed_server()
+    if os.environ.get("CACHE_BACKEND") == "redis" and not os.environ.get("REDIS_URL"):
+        os.environ["REDIS_URL"] = mock_services.start_local_redis_server()
+    sys.path.insert(0, API_DIR)
+    uvicorn.run("index:app", host="127.0.0.1", port=args.port)
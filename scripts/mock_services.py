@@ -0,0 +1,179 @@
+"""
+Local stand-ins for the news API's upstream services, for development, tests and benchmarks
+
+Nothing here is deployed: api/index.py reaches these servers only through MOCK_FEED_URL and
+REDIS_URL, which scripts/dev_server.py and the tests set.
+"""
+import hashlib
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape as xml_escape
+
+# Mock feed server: every configured feed URL, served offline as a deterministic RSS document
+MOCK_FEED_SERVER = None
+MOCK_FEED_PERIOD = 300  # A new mock article appears in every feed each 5 minutes
+MOCK_FEED_WORDS = [
+    "india", "cricket", "election", "market", "startup", "android", "apple", "football", "space",
+    "science", "movie", "music", "budget", "policy", "minister", "ai", "software", "launch",
+    "match", "team", "economy", "stock", "travel", "food", "design", "review", "update", "world"
+]
+
+def build_mock_feed(feed_url, items=20):
+    """Build a deterministic RSS document for a feed URL that gains a new item every period"""
+    domain = feed_url.split('/')[2] if feed_url.count('/') >= 2 else "mock"
+    newest = int(time.time() // MOCK_FEED_PERIOD)
+    entries = []
+    for n in range(newest, newest - items, -1):
+        # Every fourth item is a syndicated story that other feeds carry too, under a slightly different headline
+        syndicated = n % 4 == 0
+        rng = random.Random(f"story-{n}" if syndicated else f"{feed_url}-{n}")
+        headline = " ".join(rng.sample(MOCK_FEED_WORDS, 5))
+        summary = " ".join(rng.choice(MOCK_FEED_WORDS) for _ in range(30))
+        link = f"https://{domain}/mock/{n}"
+        entries.append(
+            "<item>"
+            f"<title>{xml_escape(headline.capitalize())} ({domain} #{n})</title>"
+            f"<link>{xml_escape(link)}</link>"
+            f"<guid>{xml_escape(link)}</guid>"
+            f"<description>{xml_escape(summary)}</description>"
+            f"<pubDate>{formatdate(n * MOCK_FEED_PERIOD)}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{xml_escape(domain)}</title><link>{xml_escape(feed_url)}</link>"
+        + "".join(entries)
+        + "</channel></rss>"
+    )
+
+class MockFeedHandler(BaseHTTPRequestHandler):
+    """Serve a mock RSS document for the feed URL passed as ?url="""
+
+    def do_GET(self):
+        feed_url = parse_qs(urlparse(self.path).query).get("url", [""])[0]
+        body = build_mock_feed(feed_url).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The fetcher cancelled the request
+
+    def log_message(self, format, *args):
+        pass  # Keep the server quiet
+
+def start_mock_feed_server(port=0):
+    """Start the mock feed server on a background thread and return its base URL, for MOCK_FEED_URL"""
+    global MOCK_FEED_SERVER
+    if MOCK_FEED_SERVER is None:
+        MOCK_FEED_SERVER = ThreadingHTTPServer(("127.0.0.1", port), MockFeedHandler)
+        threading.Thread(target=MOCK_FEED_SERVER.serve_forever, daemon=True).start()
+        print(f"Mock feed server listening on port {MOCK_FEED_SERVER.server_address[1]}")
+    return f"http://127.0.0.1:{MOCK_FEED_SERVER.server_address[1]}"
+
+def stop_mock_feed_server():
+    """Shut down the mock feed server if it is running"""
+    global MOCK_FEED_SERVER
+    if MOCK_FEED_SERVER is not None:
+        MOCK_FEED_SERVER.shutdown()
+        MOCK_FEED_SERVER.server_close()
+        MOCK_FEED_SERVER = None
+
+# In-process Redis stand-in for running and testing the redis cache backend without a server
+LOCAL_REDIS_SERVER = None
+
+def read_command(reader):
+    """Read one client command, a RESP2 array of bulk strings"""
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Client closed the connection")
+    if line[:1] != b"*":
+        return None
+    command = []
+    for _ in range(int(line[1:-2])):
+        header = reader.readline()
+        if header[:1] != b"$":
+            raise ValueError(f"Unexpected RESP item {header[:40]!r}")
+        command.append(reader.read(int(header[1:-2]) + 2)[:-2])
+    return command
+
+class LocalRedisHandler(StreamRequestHandler):
+    """Serve the handful of Redis commands the cache backend uses: PING, GET, SET [PX|EX], DEL, SELECT, DBSIZE"""
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            try:
+                command = read_command(self.rfile)
+            except (ConnectionError, OSError, ValueError):
+                return
+            if not isinstance(command, list) or not command:
+                self.wfile.write(b"-ERR protocol error\r\n")
+                continue
+            name = command[0].upper()
+            now = time.time()
+            with self.server.lock:
+                if name == b"PING":
+                    reply = b"+PONG\r\n"
+                elif name == b"GET":
+                    value, expires_at = store.get(command[1], (None, None))
+                    if value is None or (expires_at is not None and expires_at <= now):
+                        store.pop(command[1], None)
+                        reply = b"$-1\r\n"
+                    else:
+                        reply = b"$%d\r\n%s\r\n" % (len(value), value)
+                elif name == b"SET":
+                    expires_at = None
+                    if len(command) >= 5 and command[3].upper() == b"PX":
+                        expires_at = now + int(command[4]) / 1000
+                    elif len(command) >= 5 and command[3].upper() == b"EX":
+                        expires_at = now + int(command[4])
+                    store[command[1]] = (command[2], expires_at)
+                    reply = b"+OK\r\n"
+                elif name == b"DEL":
+                    reply = b":%d\r\n" % sum(store.pop(key, None) is not None for key in command[1:])
+                elif name == b"DBSIZE":
+                    reply = b":%d\r\n" % len(store)
+                elif name in (b"SELECT", b"AUTH"):
+                    reply = b"+OK\r\n"
+                else:
+                    reply = b"-ERR unknown command '%s'\r\n" % name
+            try:
+                self.wfile.write(reply)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+def start_local_redis_server(port=0):
+    """Start the Redis stand-in on a background thread and return its URL"""
+    global LOCAL_REDIS_SERVER
+    if LOCAL_REDIS_SERVER is None:
+        ThreadingTCPServer.allow_reuse_address = True
+        LOCAL_REDIS_SERVER = ThreadingTCPServer(("127.0.0.1", port), LocalRedisHandler)
+        LOCAL_REDIS_SERVER.daemon_threads = True
+        LOCAL_REDIS_SERVER.store = {}
+        LOCAL_REDIS_SERVER.lock = threading.Lock()
+        threading.Thread(target=LOCAL_REDIS_SERVER.serve_forever, daemon=True).start()
+        print(f"Local Redis stand-in listening on port {LOCAL_REDIS_SERVER.server_address[1]}")
+    return f"redis://127.0.0.1:{LOCAL_REDIS_SERVER.server_address[1]}/0"
+
+def stop_local_redis_server():
+    """Shut down the Redis stand-in if it is running"""
+    global LOCAL_REDIS_SERVER
+    if LOCAL_REDIS_SERVER is not None:
+        LOCAL_REDIS_SERVER.shutdown()
+        LOCAL_REDIS_SERVER.server_close()
+        LOCAL_REDIS_SERVER = None
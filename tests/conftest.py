@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+# index reads its configuration at import: keep the tests offline and their files temporary
+TEST_DIR = tempfile.mkdtemp(prefix="news-tests-")
+os.environ.update(
+    MOCK_FEEDS="1",
+    INGESTION_ENABLED="0",
+    ARCHIVE_ENABLED="0",
+    CACHE_BACKEND="memory",
+    EMBEDDING_CACHE_PATH=os.path.join(TEST_DIR, "embeddings.sqlite3"),
+)
+
+import pytest  # noqa: E402
+
+import index  # noqa: E402
+import mock_services  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def mock_feed_url():
+    url = mock_services.start_mock_feed_server()
+    yield url
+    mock_services.stop_mock_feed_server()
+
+
+@pytest.fixture(scope="session")
+def redis_url():
+    url = mock_services.start_local_redis_server()
+    yield url
+    mock_services.stop_local_redis_server()
+
+
+@pytest.fixture
+def article_store(monkeypatch):
+    """A fresh article store, so feed sets seeded by one test are not seen by the next"""
+    store = index.ArticleStore()
+    monkeypatch.setattr(index, "ARTICLE_STORE", store)
+    return store
+
+
+@pytest.fixture
+def news_cache(monkeypatch):
+    cache = index.LRUTTLCache()
+    monkeypatch.setattr(index, "NEWS_CACHE", cache)
+    return cache
+
+
+def make_test_article(n, title=None, summary=None, source="Example", published=None, category="News"):
+    return index.make_article(
+        title or f"Test article {n}", summary or f"Summary of test article {n}", f"https://example.com/test/{n}",
+        None, published or index.datetime.now().isoformat(), source, f"https://{source.lower()}.example.com/rss",
+        category
+    )
@@ -0,0 +1,68 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+
+import index
+from conftest import make_test_article
+
+DAY = 86400
+
+
+@pytest.fixture
+def archive(monkeypatch, tmp_path):
+    archive = index.ArticleArchive(str(tmp_path / "archive.sqlite3"), retention_days=30)
+    monkeypatch.setattr(index, "ARTICLE_ARCHIVE", archive)
+    return archive
+
+
+def archived(n, days_ago, title):
+    return make_test_article(3000 + n, title=title, published=index.datetime.fromtimestamp(time.time() - days_ago * DAY).isoformat())
+
+
+def test_search_ranks_text_matches_within_the_date_range(archive):
+    archive.upsert("News", "en", [
+        archived(1, 2, "Budget session opens in parliament"),
+        archived(2, 3, "Parliament debates the budget"),
+        archived(3, 3, "Cricket team announced"),
+        archived(4, 20, "Old budget story"),
+    ])
+    now = time.time()
+    rows = archive.search("budget", "News", "en", now - 7 * DAY, now)
+    assert {row[1] for row, _ in rows} == {"Budget session opens in parliament", "Parliament debates the budget"}
+    newest = archive.search("", "News", "en", now - 7 * DAY, now)
+    assert [row[1] for row, _ in newest][0] == "Budget session opens in parliament"
+    assert archive.search("budget", "Sports", "en", now - 7 * DAY, now) == []
+
+
+def test_upsert_rewrites_only_changed_articles_and_prune_drops_old_ones(archive):
+    article = archived(10, 1, "Launch window opens")
+    archive.upsert("Tech", "en", [article])
+    archive.upsert("Tech", "en", [archived(10, 1, "Launch window moved")])
+    now = time.time()
+    assert [row[1] for row, _ in archive.search("moved", "Tech", "en", now - DAY * 2, now)] == ["Launch window moved"]
+
+    archive.upsert("Tech", "en", [archived(11, 29, "Nearly expired")])
+    assert archive.prune(now=now + 2 * DAY) == 1
+    assert archive.summary()["articles"] == 1
+
+
+def test_date_range_parsing():
+    assert index.parse_date_range(None, None) is None
+    since, until = index.parse_date_range("2026-10-01", "2026-10-01")
+    assert until - since == DAY
+    with pytest.raises(ValueError):
+        index.parse_date_range("2026-10-02", "2026-10-01")
+    with pytest.raises(ValueError):
+        index.parse_date_range("last week", None)
+
+
+def test_date_ranged_request_is_answered_from_the_archive(archive, article_store, news_cache):
+    archive.upsert("News", "en", [archived(20, 5, "Election results declared"), archived(21, 6, "Markets rally")])
+    with TestClient(index.app) as client:
+        response = client.post("/api/news", json={
+            "query": "election", "language": "en", "category": "News",
+            "from_date": index.datetime.fromtimestamp(time.time() - 7 * DAY).date().isoformat()
+        })
+    body = response.json()
+    assert response.status_code == 200
+    assert [article["title"] for article in body["articles"]] == ["Election results declared"]
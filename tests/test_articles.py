@@ -0,0 +1,56 @@
+import time
+
+import index
+from conftest import make_test_article
+
+STORY = "Monsoon session of parliament opens with a debate on the new data protection bill"
+
+
+def test_make_article_returns_the_pooled_copy_for_a_known_link():
+    first = make_test_article(100)
+    again = make_test_article(100)
+    assert again is first
+    assert index.ARTICLE_POOL.get(first.pool_id) is first
+
+
+def test_edited_article_is_refreshed_and_reindexed():
+    article = make_test_article(101, title="Rocket launch delayed by weather")
+    index.index_articles_text([article])
+    assert article.id in index.TEXT_INDEX.search(["rocket"])
+
+    edited = make_test_article(101, title="Satellite launch delayed by weather")
+    assert edited is article
+    assert article.title == "Satellite launch delayed by weather"
+    assert article.id not in index.TEXT_INDEX.search(["rocket"])
+    assert article.id in index.TEXT_INDEX.search(["satellite"])
+
+
+def test_syndicated_copies_merge_with_bounded_alternates():
+    duplicates = index.NearDuplicateIndex()
+    outlets = [f"Outlet {n % 12}" for n in range(40)]  # Several feeds per outlet
+    copies = [make_test_article(200 + n, title=STORY, summary=STORY, source=outlet) for n, outlet in enumerate(outlets)]
+    canonical = {duplicates.resolve(article).pool_id for article in copies}
+    assert len(canonical) == 1
+
+    story = duplicates.resolve(copies[0])
+    names = [source.name for source in story.alternate_sources()]
+    assert len(names) == index.MAX_ALTERNATES
+    assert len(set(names)) == len(names)
+    assert story.source_name not in names
+
+
+def test_expiry_keeps_old_articles_that_stored_or_unchanged_feeds_still_serve(article_store, monkeypatch):
+    old = index.datetime.fromtimestamp(time.time() - (index.INDEX_RETENTION_HOURS + 1) * 3600).isoformat()
+    stored, unchanged, reused, dropped = (make_test_article(300 + n, published=old) for n in range(4))
+    for article in (stored, unchanged, reused, dropped):
+        article.pooled_at = 0.0
+    article_store.put("News", "en", [stored])
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {"https://example.com/rss": {"articles": [unchanged]}})
+    monkeypatch.setattr(index, "FEED_FETCH_STATS", dict(index.FEED_FETCH_STATS))
+    # A 304 hands the previous parse out again, which counts as pooling it again
+    assert index.reuse_feed_articles({"articles": [reused], "not_modified": 0}, "not_modified") == [reused]
+
+    index.expire_indexed_articles()
+    for article in (stored, unchanged, reused):
+        assert index.ARTICLE_POOL.get(article.pool_id) is article
+    assert index.ARTICLE_POOL.get(dropped.pool_id) is None
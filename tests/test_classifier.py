@@ -0,0 +1,68 @@
+import pytest
+
+import index
+from conftest import make_test_article
+
+WORDS = {
+    "Sports": ["match", "goal", "league", "striker", "coach", "stadium", "season", "penalty"],
+    "Business": ["shares", "market", "earnings", "investors", "profit", "merger", "quarter", "bank"],
+}
+
+
+def labelled(count):
+    """Topic blocks of ten, so every held-out document's label differs from its neighbours' in the holdout"""
+    pairs = []
+    for n in range(count):
+        category = "Sports" if n // 10 % 2 == 0 else "Business"
+        words = WORDS[category]
+        title = " ".join(words[(n + k) % len(words)] for k in range(3))
+        pairs.append((category, make_test_article(4000 + n, title=title, summary=f"{title} report", category=category)))
+    return pairs
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    classifier = index.CategoryClassifier(confidence=0.6, memo_items=2)
+    monkeypatch.setattr(index, "CATEGORY_CLASSIFIER", classifier)
+    return classifier
+
+
+def test_training_scores_the_holdout_against_its_own_labels(classifier):
+    assert not classifier.train(labelled(50))  # Below CATEGORY_MIN_DOCUMENTS
+    assert classifier.train(labelled(800))
+    assert classifier.summary()["holdout_accuracy"] == 1.0
+    category, confidence = classifier.predict("Striker scores late goal")
+    assert category == "Sports" and confidence >= classifier.confidence
+
+
+@pytest.mark.anyio
+async def test_unsure_queries_fall_back_to_gemini_and_are_memoized(classifier, monkeypatch):
+    calls = []
+
+    async def gemini(query):
+        calls.append(query)
+        return None if "unknown" in query else "Business"
+
+    monkeypatch.setattr(index, "MOCK_FEEDS", False)
+    monkeypatch.setattr(index, "determine_category_with_gemini", gemini)
+    classifier.train(labelled(400))
+
+    assert await index.determine_category_for_query("Striker  scores late goal") == "Sports"
+    assert await index.determine_category_for_query("weather forecast for the weekend") == "Business"
+    assert await index.determine_category_for_query("Weather forecast for the weekend!") == "Business"
+    assert calls == ["weather forecast for the weekend"]
+    assert classifier.stats["local"] == 1 and classifier.stats["fallbacks"] == 1 and classifier.stats["memo_hits"] == 1
+
+    # Gemini errors are retried rather than memoized
+    assert await index.determine_category_for_query("unknown topic") is None
+    assert await index.determine_category_for_query("unknown topic") is None
+    assert calls[-2:] == ["unknown topic", "unknown topic"]
+
+
+def test_memo_is_bounded_and_cleared_by_retraining(classifier):
+    for query in ("one", "two", "three"):
+        classifier.memo_put(query, "News")
+    assert classifier.memo_get("one") == (False, None)
+    assert classifier.memo_get("Three") == (True, "News")
+    classifier.train(labelled(400))
+    assert classifier.memo_get("three") == (False, None)
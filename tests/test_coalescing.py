@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+import pytest
+
+import index
+from conftest import make_test_article
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_one_run_and_survives_a_cancelled_caller():
+    flights = index.SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("key", work))
+    others = [asyncio.ensure_future(flights.do("key", work)) for _ in range(4)]
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await asyncio.gather(*others) == ["done"] * 4
+    assert runs == [1] and flights.stats() == {"in_flight": 0, "started": 1, "shared": 4}
+
+    async def fail():
+        raise RuntimeError("feed down")
+    results = await asyncio.gather(flights.do("bad", fail), flights.do("bad", fail), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.running("bad") is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_run_the_result_pipeline_once(monkeypatch, article_store, news_cache):
+    article_store.put("News", "en", [make_test_article(5000 + n) for n in range(index.RELATED_MIN_ARTICLES)])
+    monkeypatch.setattr(index, "RESULT_FLIGHTS", index.SingleFlight())
+    build_news_results = index.build_news_results
+    builds = []
+
+    async def counted_build(*args, **kwargs):
+        builds.append(args[0])
+        await asyncio.sleep(0.05)  # Keep the first run in flight while the other requests arrive
+        return await build_news_results(*args, **kwargs)
+    monkeypatch.setattr(index, "build_news_results", counted_build)
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[
+            client.post("/api/news", json={"query": "", "language": "en", "category": "News"}) for _ in range(5)
+        ])
+    bodies = [response.json() for response in responses]
+    assert len(builds) == 1
+    assert len({body["snapshot_id"] for body in bodies}) == 1
+    assert index.RESULT_FLIGHTS.stats()["shared"] == 4
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+import index
+
+
+class RecordingBackend(index.FakeEmbeddingBackend):
+    def __init__(self):
+        super().__init__(dims=16, latency=0.02)
+        self.calls = []
+
+    def embed_batch(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_batch(texts)
+
+
+@pytest.mark.anyio
+async def test_token_bucket_allows_a_burst_then_paces_to_the_rate():
+    bucket = index.TokenBucket(per_minute=1200, capacity=2)  # 20 calls a second
+    start = time.monotonic()
+    for _ in range(2):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.02
+    for _ in range(4):
+        await bucket.acquire()
+    assert 0.18 <= time.monotonic() - start < 0.5
+
+
+@pytest.mark.anyio
+async def test_concurrent_requests_share_batches_and_pending_texts():
+    backend = RecordingBackend()
+    scheduler = index.EmbeddingScheduler(backend, batch_size=4, requests_per_minute=60000)
+    first, second = await asyncio.gather(
+        scheduler.embed(["budget", "cricket", "election"]),
+        scheduler.embed(["election", "monsoon", "budget", "markets"])
+    )
+    # Five distinct texts from two requests go out in two calls of at most four
+    assert sorted(text for call in backend.calls for text in call) == ["budget", "cricket", "election", "markets", "monsoon"]
+    assert [len(call) for call in backend.calls] == [4, 1]
+    assert scheduler.stats["merged"] == 2
+    assert np.array_equal(first[0], second[2]) and np.array_equal(first[2], second[0])
+    assert np.array_equal(first[1], backend.embed_batch(["cricket"])[0])
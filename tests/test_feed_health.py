@@ -0,0 +1,84 @@
+import httpx
+import pytest
+
+import index
+from test_feeds import FakeResponse, rss
+
+FEED = "https://flaky.example.com/rss"
+
+
+def fail(health, times):
+    for _ in range(times):
+        health.record_failure(httpx.ConnectError("connection refused"))
+
+
+def test_circuit_opens_then_lets_one_probe_through_then_closes():
+    health = index.FeedHealth(FEED)
+    fail(health, index.FEED_FAILURE_THRESHOLD - 1)
+    assert health.state == "closed" and health.allow_request()
+    fail(health, 1)
+    assert health.state == "open" and not health.allow_request()
+
+    health.opened_at -= health.cooldown  # The cooldown has passed
+    assert health.allow_request()
+    assert health.state == "half_open"
+    assert not health.allow_request()  # Only one probe at a time
+
+    health.record_success(0.2)
+    assert health.state == "closed" and health.allow_request()
+    assert health.cooldown == index.FEED_CIRCUIT_COOLDOWN
+
+
+def test_failed_probe_reopens_with_a_longer_cooldown():
+    health = index.FeedHealth(FEED)
+    fail(health, index.FEED_FAILURE_THRESHOLD)
+    health.opened_at -= health.cooldown
+    assert health.allow_request()
+    fail(health, 1)
+    assert health.state == "open" and not health.allow_request()
+    assert health.cooldown == min(2 * index.FEED_CIRCUIT_COOLDOWN, index.FEED_CIRCUIT_MAX_COOLDOWN)
+
+
+def test_timeout_follows_the_p95_latency():
+    health = index.FeedHealth(FEED)
+    assert health.timeout() == index.FEED_TIMEOUT  # Too few samples to trust
+    for latency in [0.1] * 18 + [0.9, 1.2]:
+        health.record_success(latency)
+    assert health.percentile(95) == 0.9
+    assert health.timeout() == pytest.approx(1.8)
+
+    fast, slow = index.FeedHealth(FEED), index.FeedHealth(FEED)
+    for _ in range(10):
+        fast.record_success(0.05)
+        slow.record_success(4.0)
+    assert fast.timeout() == index.FEED_MIN_TIMEOUT
+    assert slow.timeout() == index.FEED_TIMEOUT
+
+
+@pytest.mark.anyio
+async def test_open_circuit_skips_the_feed_until_a_probe_succeeds(monkeypatch):
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {})
+    monkeypatch.setattr(index, "FEED_HEALTH", {})
+    monkeypatch.setattr(index, "FEED_SHARE_WINDOW", 0)
+    monkeypatch.setattr(index, "FEED_RETRY_BACKOFF", 0)
+    requests, up = [], False
+
+    async def hedged_get(url, headers, health):
+        requests.append(url)
+        if not up:
+            raise httpx.ConnectError("connection refused")
+        return FakeResponse(rss([2, 1]))
+    monkeypatch.setattr(index, "hedged_get", hedged_get)
+
+    while index.get_feed_health(FEED).state == "closed":
+        assert await index.fetch_rss_feed(FEED) == []
+    assert len(requests) == index.FEED_FAILURE_THRESHOLD
+
+    assert await index.fetch_rss_feed(FEED) == []
+    assert len(requests) == index.FEED_FAILURE_THRESHOLD  # Skipped without a request
+
+    health = index.get_feed_health(FEED)
+    health.opened_at -= health.cooldown
+    up = True
+    assert [article.title for article in await index.fetch_rss_feed(FEED)] == ["Story 2", "Story 1"]
+    assert health.state == "closed"
@@ -0,0 +1,80 @@
+import pytest
+
+import index
+
+
+def rss(ids):
+    items = "".join(
+        f"<item><title>Story {n}</title><guid>guid-{n}</guid><link>https://feed.example.com/{n}</link>"
+        f"<description>Summary {n}</description><pubDate>Sat, 17 Oct 2026 0{n % 10}:00:00 GMT</pubDate></item>"
+        for n in ids
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'.encode()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+
+@pytest.fixture
+def feed_state(monkeypatch):
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {})
+    monkeypatch.setattr(index, "FEED_SHARE_WINDOW", 0)
+
+
+def serve(monkeypatch, bodies):
+    async def download_feed(feed_url, max_retries=2, headers=None):
+        return FakeResponse(bodies.pop(0))
+    monkeypatch.setattr(index, "download_feed", download_feed)
+
+
+def test_stream_parser_reads_entries_and_stops_at_a_seen_entry():
+    title, entries, seen_key = index.stream_feed_entries(rss([3, 2, 1]))
+    assert title == "Feed"
+    assert [entry["key"] for entry in entries] == ["guid-3", "guid-2", "guid-1"]
+    assert seen_key is None
+
+    _, entries, seen_key = index.stream_feed_entries(rss([5, 4, 3, 2, 1]), seen_keys={"guid-3", "guid-2"})
+    assert [entry["key"] for entry in entries] == ["guid-5", "guid-4"]
+    assert seen_key == "guid-3"
+
+
+def test_stream_parser_stops_at_the_entry_limit():
+    _, entries, _ = index.stream_feed_entries(rss(range(9, 0, -1)), limit=4)
+    assert len(entries) == 4
+
+
+@pytest.mark.anyio
+async def test_incremental_fetch_continues_from_the_matched_entry(monkeypatch, feed_state):
+    # Stories 5 and 4 were retracted; 7 and 6 are new and 3..1 were seen before
+    serve(monkeypatch, [rss([5, 4, 3, 2, 1]), rss([7, 6, 3, 2, 1])])
+    first = await index.fetch_rss_feed("https://feed.example.com/rss")
+    assert [article.title for article in first] == ["Story 5", "Story 4", "Story 3", "Story 2", "Story 1"]
+
+    second = await index.fetch_rss_feed("https://feed.example.com/rss")
+    assert [article.title for article in second] == ["Story 7", "Story 6", "Story 3", "Story 2", "Story 1"]
+
+
+@pytest.mark.anyio
+async def test_unchanged_body_skips_the_parse(monkeypatch, feed_state):
+    serve(monkeypatch, [rss([2, 1]), rss([2, 1])])
+    first = await index.fetch_rss_feed("https://feed.example.com/rss")
+    second = await index.fetch_rss_feed("https://feed.example.com/rss")
+    assert [article.id for article in second] == [article.id for article in first]
+    assert index.FEED_VALIDATORS["https://feed.example.com/rss"]["unchanged_body"] == 1
+
+
+@pytest.mark.anyio
+async def test_mock_feed_server_answers_conditional_requests(monkeypatch, feed_state, mock_feed_url):
+    monkeypatch.setattr(index, "MOCK_FEED_URL", mock_feed_url)
+    try:
+        first = await index.fetch_rss_feed("https://mock.example.com/rss")
+        second = await index.fetch_rss_feed("https://mock.example.com/rss")
+    finally:
+        await index.close_http_client()
+    assert len(first) == index.FEED_MAX_ENTRIES
+    assert [article.id for article in second] == [article.id for article in first]
+    assert index.FEED_VALIDATORS["https://mock.example.com/rss"]["not_modified"] == 1
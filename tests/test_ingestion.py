@@ -0,0 +1,59 @@
+from collections import Counter
+
+import httpx
+import pytest
+
+import index
+from test_feeds import FakeResponse, rss
+
+FEEDS = ["https://one.example.com/rss", "https://two.example.com/rss"]
+
+
+@pytest.mark.anyio
+async def test_requests_read_ingested_feed_sets_from_the_store(monkeypatch, article_store, mock_feed_url):
+    monkeypatch.setattr(index, "MOCK_FEED_URL", mock_feed_url)
+    assert article_store.get("News", "en") is None
+    try:
+        ingested = await index.ingest_feed_set("News", "en", FEEDS)
+    finally:
+        await index.close_http_client()
+    assert ingested
+
+    async def download_feed(*args, **kwargs):
+        raise AssertionError("an ingested feed set was fetched again")
+    monkeypatch.setattr(index, "download_feed", download_feed)
+    served, = await index.get_feed_sets_articles([("News", "en", FEEDS)])
+    assert [article.id for article in served] == [article.id for article in ingested]
+
+
+@pytest.mark.anyio
+async def test_related_feed_sets_fetch_a_shared_feed_once(monkeypatch, article_store, news_cache):
+    own, shared, related = (f"https://{name}.example.com/rss" for name in ("own", "shared", "related"))
+    # Feeds named after their host, so the per-source cap of deduplicate_articles drops none of them
+    bodies = {
+        url: rss(ids).replace(b"<title>Feed</title>", f"<title>{name}</title>".encode())
+                     .replace(b"feed.example.com", f"{name}.example.com".encode())
+        for url, name, ids in ((own, "own", [1, 2, 3]), (shared, "shared", [4, 5, 6]), (related, "related", [7, 8, 9]))
+    }
+    monkeypatch.setattr(index, "RSS_FEEDS", {"Alpha": {"en": [own, shared]}, "Beta": {"en": [shared, related]}})
+    monkeypatch.setattr(index, "RELATED_CATEGORIES", {"Alpha": ["Beta"]})
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {})
+    monkeypatch.setattr(index, "FEED_SHARE_WINDOW", 0)
+    monkeypatch.setattr(index, "VECTOR_STORE_ENABLED", False)
+    downloads = Counter()
+
+    async def download_feed(feed_url, max_retries=2, headers=None):
+        downloads[feed_url] += 1
+        return FakeResponse(bodies[feed_url])
+    monkeypatch.setattr(index, "download_feed", download_feed)
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/news", json={"query": "", "language": "en", "category": "Alpha", "page_size": 20})
+    body = response.json()
+    assert downloads == {own: 1, shared: 1, related: 1}
+    links = [article["link"] for article in body["articles"]]
+    assert body["total_found"] == 9 and len(set(links)) == 9
+    # Both sets hold the shared feed's articles as the same pooled objects
+    alpha, beta = article_store.get("Alpha", "en"), article_store.get("Beta", "en")
+    assert {a.pool_id for a in alpha} & {a.pool_id for a in beta} == {a.pool_id for a in alpha if a.source_name == "shared"}
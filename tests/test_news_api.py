@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import index
+from conftest import make_test_article
+from test_feeds import FakeResponse, rss
+
+
+@pytest.fixture
+def client(article_store, news_cache):
+    article_store.put("News", "en", [make_test_article(1000 + n) for n in range(25)])
+    with TestClient(index.app) as client:
+        yield client
+
+
+def test_listing_pages_through_one_snapshot(client):
+    first = client.post("/api/news", json={"query": "", "language": "en", "page_size": 10}).json()
+    assert first["total_found"] == 25 and len(first["articles"]) == 10
+    second = client.post("/api/news", json={"query": "", "language": "en", "cursor": first["next_cursor"]}).json()
+    assert second["current_page"] == 2 and second["snapshot_id"] == first["snapshot_id"]
+    assert not {a["id"] for a in first["articles"]} & {a["id"] for a in second["articles"]}
+
+
+@pytest.mark.parametrize("paging", [{"page_size": 70000}, {"page_size": 0}, {"page": -1}, {"page": 0}])
+def test_out_of_range_paging_is_rejected(client, paging):
+    response = client.post("/api/news", json={"query": "", "language": "en", **paging})
+    assert response.status_code == 422
+
+
+def test_malformed_cursor_is_a_client_error(client):
+    response = client.post("/api/news", json={"query": "", "language": "en", "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("page_size", [0, index.NEWS_MAX_PAGE_SIZE + 1, 65535])
+def test_cursor_page_size_outside_the_limit_is_a_client_error(client, page_size):
+    first = client.post("/api/news", json={"query": "", "language": "en"}).json()
+    cursor = index.encode_cursor(first["snapshot_id"], 0, page_size)
+    response = client.post("/api/news", json={"query": "", "language": "en", "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_invalid_date_range_is_a_client_error(client):
+    response = client.post("/api/news", json={"query": "", "language": "en", "from_date": "yesterday"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_generous_budget_does_not_inherit_a_tight_budgets_partial_result(monkeypatch, article_store, news_cache):
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {})
+    monkeypatch.setattr(index, "FEED_SHARE_WINDOW", 0)
+    monkeypatch.setattr(index, "VECTOR_STORE_ENABLED", False)
+
+    async def slow_download(feed_url, max_retries=2, headers=None):
+        await asyncio.sleep(0.5)
+        return FakeResponse(rss([3, 2, 1]).replace(b"feed.example.com", feed_url.split("/")[2].encode()))
+    monkeypatch.setattr(index, "download_feed", slow_download)
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def post(budget_ms):
+            response = await client.post("/api/news", json={
+                "query": "", "language": "en", "category": "Sports", "budget_ms": budget_ms
+            })
+            return response.json()
+
+        tight = asyncio.create_task(post(150))
+        await asyncio.sleep(0.02)
+        generous = await post(5000)
+        tight = await tight
+
+    assert tight["partial"] and tight["total_found"] == 0
+    assert not generous["partial"] and generous["total_found"] > 0
+
+
+async def stream_then_list(client, request):
+    response = await client.post("/api/news/stream", json=request)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    listed = (await client.post("/api/news", json=request)).json()
+    return lines, listed
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("preferred_sources", [[], ["espn"]])
+async def test_stream_batches_end_with_the_news_response(monkeypatch, article_store, news_cache, mock_feed_url,
+                                                         preferred_sources):
+    monkeypatch.setattr(index, "MOCK_FEED_URL", mock_feed_url)
+    monkeypatch.setattr(index, "FEED_VALIDATORS", {})
+    request = {"query": "", "language": "en", "category": "Sports", "page_size": 10,
+               "preferred_sources": preferred_sources}
+    transport = httpx.ASGITransport(app=index.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            lines, listed = await stream_then_list(client, request)
+    finally:
+        await index.close_http_client()
+
+    *batches, final = lines
+    assert batches and all(line["event"] == "batch" for line in batches)
+    assert batches[-1]["order"] == [article["id"] for article in final["articles"]]
+    if preferred_sources:
+        assert all("espn" in article["source"]["name"] for batch in batches for article in batch["articles"])
+    assert final.pop("event") == "final"
+    final.pop("data_age"), listed.pop("data_age")
+    assert final == listed
+
+
+@pytest.mark.anyio
+async def test_expired_results_are_served_stale_while_one_refresh_runs(monkeypatch, article_store):
+    article_store.put("News", "en", [make_test_article(6000 + n) for n in range(index.RELATED_MIN_ARTICLES)])
+    monkeypatch.setattr(index, "NEWS_CACHE", index.LRUTTLCache(ttl=1, grace=30))
+    monkeypatch.setattr(index, "RESULT_FLIGHTS", index.SingleFlight())
+    request = {"query": "", "language": "en", "category": "News"}
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        fresh = await client.post("/api/news", json=request)
+        assert not fresh.json()["stale"] and fresh.headers["Age"] == "0"
+
+        await asyncio.sleep(1.1)
+        stale = await client.post("/api/news", json=request)
+        again = await client.post("/api/news", json=request)
+        assert stale.json()["stale"] and int(stale.headers["Age"]) >= 1
+        assert stale.json()["snapshot_id"] == fresh.json()["snapshot_id"]
+        assert again.json()["stale"] and index.RESULT_FLIGHTS.stats()["started"] == 2  # One miss, one refresh
+
+        refresh = index.RESULT_FLIGHTS.running((index.result_cache_key("en", "News", "", []), None))
+        if refresh is not None:
+            await refresh
+        refreshed = await client.post("/api/news", json=request)
+    assert not refreshed.json()["stale"] and refreshed.headers["Age"] == "0"
+    assert refreshed.json()["snapshot_id"] != fresh.json()["snapshot_id"]
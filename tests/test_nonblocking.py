@@ -0,0 +1,52 @@
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+import index
+from conftest import TEST_DIR
+from mock_services import MOCK_FEED_WORDS
+
+ARTICLE_COUNT = 4000
+EMBED_LATENCY = 0.3  # Simulated seconds per embedding batch
+HIT_BUDGET = 0.1  # Slowest acceptable cache hit in seconds
+
+
+@pytest.mark.anyio
+async def test_cache_hits_stay_fast_during_a_slow_miss(monkeypatch, article_store, news_cache):
+    """A miss that embeds and ranks thousands of articles must not stall cache hits on the same loop"""
+    monkeypatch.setattr(index, "EMBEDDING_SCHEDULER", index.EmbeddingScheduler(
+        index.FakeEmbeddingBackend(latency=EMBED_LATENCY), requests_per_minute=60000
+    ))
+    monkeypatch.setattr(index, "EMBEDDING_CACHE", index.EmbeddingCache(
+        f"{TEST_DIR}/nonblocking.sqlite3", 1000, 64 * 1024 * 1024
+    ))
+    rng = random.Random(7)
+    published = index.datetime.now().isoformat()
+    article_store.put("News", "en", [
+        index.make_article(" ".join(rng.sample(MOCK_FEED_WORDS, 6)), " ".join(rng.choices(MOCK_FEED_WORDS, k=40)),
+                           f"https://example.com/nonblocking/{n}", None, published, f"Source {n % 20}",
+                           f"https://example.com/{n % 20}/rss", "News")
+        for n in range(ARTICLE_COUNT)
+    ])
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def timed_post(query):
+            start = time.perf_counter()
+            response = await client.post("/api/news", json={"query": query, "language": "en"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        await timed_post("")  # Warm the cache for the no-query listing
+        slow_miss = asyncio.create_task(timed_post("market economy update"))
+        hit_latencies = []
+        while not slow_miss.done():
+            hit_latencies.append(await timed_post(""))
+            await asyncio.sleep(0.01)
+        await slow_miss
+
+    assert len(hit_latencies) >= 5
+    assert max(hit_latencies) < HIT_BUDGET
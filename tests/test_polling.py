@@ -0,0 +1,26 @@
+import index
+
+START = 1_000_000_000.0
+
+
+def test_busy_feeds_are_polled_more_often_than_quiet_ones():
+    scheduler = index.FeedScheduler()
+    scheduler.register("https://busy.example.com/rss", ("News", "en"), now=START)
+    scheduler.register("https://quiet.example.com/rss", ("News", "en"), now=START)
+    scheduler.record_poll("https://busy.example.com/rss", [START - n * 60 for n in range(20)], True, now=START)
+    scheduler.record_poll("https://quiet.example.com/rss", [START - n * 86400 for n in range(20)], True, now=START)
+    busy = scheduler.interval("https://busy.example.com/rss", START)
+    quiet = scheduler.interval("https://quiet.example.com/rss", START)
+    assert busy == scheduler.min_interval
+    assert quiet == scheduler.max_interval
+
+
+def test_demand_pulls_polls_forward():
+    scheduler = index.FeedScheduler()
+    scheduler.register("https://hourly.example.com/rss", ("Sports", "en"), now=START)
+    scheduler.record_poll("https://hourly.example.com/rss", [START - n * 3600 for n in range(20)], True, now=START)
+    before = scheduler.interval("https://hourly.example.com/rss", START)
+    for n in range(50):
+        scheduler.note_demand(("Sports", "en"), now=START + n)
+    assert scheduler.interval("https://hourly.example.com/rss", START + 50) < before
+    assert scheduler.pop_due(START + before - 1) == ["https://hourly.example.com/rss"]
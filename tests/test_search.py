@@ -0,0 +1,39 @@
+import numpy as np
+
+import index
+
+
+def clustered_vectors(count, dims=32, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = index.normalize_rows(rng.standard_normal((20, dims)))
+    return index.normalize_rows(centers[rng.integers(0, 20, count)] + 0.1 * rng.standard_normal((count, dims)))
+
+
+def test_vectors_returns_copies_of_present_keys():
+    data = clustered_vectors(10)
+    store = index.VectorStore()
+    store.add(list("abcdefghij"), data)
+    keys, matrix = store.vectors(["b", "missing", "e"])
+    assert keys == ["b", "e"]
+    assert np.allclose(matrix, data[[1, 4]])
+
+
+def test_removed_slots_are_reused_and_expiry_uses_publish_time():
+    data = clustered_vectors(3)
+    store = index.VectorStore()
+    store.add(["old", "new"], data[:2], timestamps=[100.0, 200.0])
+    store.remove(["new"])
+    store.add(["newer"], data[2:], timestamps=[300.0])
+    assert store.stats()["free_slots"] == 0
+    assert store.expire(150.0) == 1
+    assert "old" not in store and "newer" in store
+    keys, matrix = store.vectors(["newer"])
+    assert np.allclose(matrix, data[2:])
+
+
+def test_bm25_prefers_title_matches():
+    text = index.InvertedIndex()
+    text.add("title", ("budget", "session"), ("parliament", "opens"))
+    text.add("summary", ("parliament", "opens"), ("budget", "session"))
+    scores = text.search(["budget"])
+    assert scores["title"][0] > scores["summary"][0]